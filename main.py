@@ -2,6 +2,7 @@
 Punto de entrada principal para la organización de archivos de Transferencias Económicas.
 """
 
+import argparse
 import logging
 import os
 import sys
@@ -11,6 +12,11 @@ from typing import Dict
 
 from src.utils.config_loader import ConfigLoader
 from src.utils.zip_handler import ZipHandler
+from src.utils.io_engine import IOPolicy
+from src.utils.extraction_metrics import MetricsWriter
+from src.utils.member_filter import MemberFilter
+from src.utils.zstd_store import ZstdStore
+from src.utils.zip_watcher import ZipWatcher
 from src.utils.period_handler import PeriodHandler
 from src.etl.file_organizer import FileOrganizer
 from src.validators.validate_balance_valorizado import ValidateBalanceValorizado
@@ -126,6 +132,107 @@ def organize_files(config: Dict, periodo: str) -> bool:
         return False
 
 
+def build_zip_handler(config_data: Dict, periodo: str) -> ZipHandler:
+    """
+    Crea el manejador de ZIPs según la sección extraction de la configuración.
+
+    Args:
+        config_data: Configuración del sistema
+        periodo: Periodo a procesar
+
+    Returns:
+        ZipHandler: Manejador configurado
+    """
+    extraction_config = config_data.get("extraction", {})
+    organizer = FileOrganizer(config_data, periodo)
+    member_filter = None
+    if extraction_config.get("selective", False):
+        # Se incluyen los archivos que el organizador ubica aunque el registro
+        # no los defina (por ejemplo, los diarios CMg_Real y Programa_Operacion)
+        member_filter = MemberFilter.from_registry_config(
+            config_data,
+            periodo,
+            match_paths=extraction_config.get("selective_match_paths", False),
+            extra_patterns=organizer.member_patterns(),
+        )
+
+    zstd_store = None
+    compress_config = extraction_config.get("compress_at_rest", {})
+    if compress_config.get("enabled", False):
+        zstd_store = ZstdStore(
+            level=compress_config.get("level", 3),
+            min_size=compress_config.get("min_size_mb", 64) * 1024**2,
+            extensions=compress_config.get("extensions", [".csv", ".tsv"]),
+        )
+
+    io_config = extraction_config.get("io", {})
+    io_policy = IOPolicy(
+        buffer_size=io_config.get("buffer_mb", 4) * 1024**2,
+        preallocate=io_config.get("preallocate", True),
+        preallocate_min_size=io_config.get("preallocate_min_mb", 1) * 1024**2,
+        fsync=io_config.get("fsync", "none"),
+        min_free_space=io_config.get("min_free_mb", 512) * 1024**2,
+    )
+
+    return ZipHandler(
+        raw_path=config_data["paths"]["raw"],
+        unzipped_path=config_data["paths"]["unzipped"],
+        archive_path=config_data["paths"]["archive"],
+        max_workers=extraction_config.get("workers", 1),
+        member_workers=extraction_config.get("member_workers", 1),
+        member_filter=member_filter,
+        nested_depth=extraction_config.get("nested_depth", 0),
+        nested_spool_size=extraction_config.get("nested_spool_mb", 64) * 1024**2,
+        use_manifest=extraction_config.get("manifest", False),
+        fallback_buffer_size=extraction_config.get("fallback_buffer_mb", 4) * 1024**2,
+        catalog_path=(
+            config_data["catalog"]["path"]
+            if config_data.get("catalog", {}).get("enabled", False)
+            else None
+        ),
+        zstd_store=zstd_store,
+        io_policy=io_policy,
+        verify_workers=(
+            extraction_config.get("verify_workers", 4)
+            if extraction_config.get("verify", False)
+            else 0
+        ),
+        metrics_path=(
+            MetricsWriter.run_path(config_data["paths"]["logs"])
+            if extraction_config.get("metrics", False)
+            else None
+        ),
+        # Extracción directa: los miembros se escriben en processed según la
+        # tabla de patrones del organizador
+        router=(
+            organizer.route
+            if config_data.get("organize", {}).get("direct", False)
+            else None
+        ),
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Lee los argumentos de línea de comandos.
+
+    Returns:
+        argparse.Namespace: Argumentos (periodo y modo de vigilancia)
+    """
+    parser = argparse.ArgumentParser(
+        description="Organización de archivos de Transferencias Económicas"
+    )
+    parser.add_argument(
+        "--periodo", help="Periodo a procesar (YYYYMM); si se omite, se pregunta"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Vigilar raw/<periodo> y extraer cada ZIP en cuanto se descarga",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
     """
     Función principal que coordina todo el proceso de organización de archivos.
@@ -133,10 +240,11 @@ def main() -> None:
     Esta función implementa el flujo de trabajo completo:
     1. Configuración inicial y logging
     2. Validación de directorios
-    3. Procesamiento de archivos ZIP
+    3. Procesamiento de archivos ZIP (o vigilancia de raw/<periodo> con --watch)
     4. Organización final de archivos
     """
     start_time = datetime.now()
+    args = parse_args()
 
     try:
         # Configuración inicial
@@ -154,20 +262,37 @@ def main() -> None:
             sys.exit(1)
 
         # Obtener periodo a procesar
-        periodo = PeriodHandler.get_period_input(config_data["paths"]["raw"])
+        if args.periodo:
+            periodo = (
+                args.periodo
+                if PeriodHandler.validate_period_format(args.periodo)
+                else None
+            )
+        else:
+            periodo = PeriodHandler.get_period_input(config_data["paths"]["raw"])
         if not periodo:
             logger.error("No se pudo obtener un periodo válido para procesar")
             sys.exit(1)
         logger.info(f"Procesando periodo: {periodo}")
 
         # Procesar archivos ZIP
-        zip_handler = ZipHandler(
-            raw_path=config_data["paths"]["raw"],
-            unzipped_path=config_data["paths"]["unzipped"],
-            archive_path=config_data["paths"]["archive"],
-        )
-
-        if not process_zip_files(zip_handler, periodo):
+        zip_handler = build_zip_handler(config_data, periodo)
+
+        if args.watch:
+            # Extraer cada ZIP a medida que termina de descargarse y organizar
+            # los archivos cada vez que no quedan ZIP pendientes
+            watch_config = config_data.get("extraction", {}).get("watch", {})
+            watcher = ZipWatcher(
+                zip_handler,
+                periodo,
+                stable_seconds=watch_config.get("stable_seconds", 10),
+                poll_interval=watch_config.get("poll_interval_s", 2),
+                idle_timeout=watch_config.get("idle_timeout_s"),
+                on_idle=lambda: organize_files(config_data, periodo),
+            )
+            if not watcher.run():
+                logger.warning("Algunos ZIP no se pudieron procesar correctamente")
+        elif not process_zip_files(zip_handler, periodo):
             sys.exit(1)
 
         # Organizar archivos
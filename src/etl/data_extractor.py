@@ -3,15 +3,60 @@ Módulo para la extracción y validación inicial de datos.
 """
 
 import logging
-from typing import Dict, Optional
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
 import pandas as pd
 import openpyxl
 
 from src.utils.config_loader import ConfigLoader
+from src.utils.zstd_store import is_compressed, open_file
 from .file_registry import FileRegistry, FileRegistryError, FileNotFoundError
 
 logger = logging.getLogger(__name__)
 
+EXCEL_FORMATS = ["xlsx", "xlsb", "xls", "xlsm"]
+
+
+def read_frame(source, file_format: str, encoding: str = "utf-8") -> pd.DataFrame:
+    """
+    Lee un archivo según su formato.
+
+    Args:
+        source: Ruta o objeto de archivo con seek
+        file_format: Formato del archivo (xlsx, xlsb, xls, xlsm, csv, tsv)
+        encoding: Codificación de los archivos de texto
+
+    Returns:
+        pd.DataFrame: Datos leídos
+    """
+    if file_format in EXCEL_FORMATS:
+        # Lectura simple de Excel sin validación de hojas
+        return pd.read_excel(source)
+    else:
+        # Lectura simple de archivos CSV/TSV
+        return pd.read_csv(source, encoding=encoding)
+
+
+def read_path(path: Path, file_format: str, encoding: str = "utf-8") -> pd.DataFrame:
+    """
+    Lee un archivo en disco, descomprimiendo en flujo los archivos zstd.
+
+    Se define a nivel de módulo para poder ejecutarse en otro proceso.
+
+    Args:
+        path: Ruta al archivo
+        file_format: Formato del archivo
+        encoding: Codificación de los archivos de texto
+
+    Returns:
+        pd.DataFrame: Datos leídos
+    """
+    if is_compressed(path):
+        with open_file(path) as source:
+            return read_frame(source, file_format, encoding)
+    return read_frame(path, file_format, encoding)
+
 
 class DataExtractor:
 
@@ -26,6 +71,8 @@ class DataExtractor:
         self.config = ConfigLoader()
         self.file_registry = FileRegistry(self.config.get_config())
         self.extracted_data: Dict[str, pd.DataFrame] = {}
+        registry_config = self.config.get_config().get("file_registry", {})
+        self.read_workers = max(1, int(registry_config.get("read_workers", 4)))
 
     def validate_required_files(self) -> bool:
         """
@@ -39,6 +86,11 @@ class DataExtractor:
             all_valid = True
 
             for file_type, location in locations.items():
+                if location is None:
+                    location = self.file_registry.locate_archive_member(
+                        file_type, self.periodo
+                    )
+
                 if location is None:
                     logger.error(f"Archivo requerido no encontrado: {file_type}")
                     all_valid = False
@@ -53,25 +105,83 @@ class DataExtractor:
 
     def extract_data(self, file_type: str) -> Optional[pd.DataFrame]:
         try:
+            if self.file_registry.definitions[file_type].cardinality == "many":
+                return self._extract_file_set(file_type)
+
             location = self.file_registry.locate_file(file_type, self.periodo)
             if not location:
+                # Sin copia en disco: leer directamente desde el ZIP archivado
+                member = self.file_registry.locate_archive_member(
+                    file_type, self.periodo
+                )
+                if member:
+                    logger.info(f"Leyendo desde archivo ZIP: {member}")
+                    with self.file_registry.open_archive_member(member) as source:
+                        return self._read_file(file_type, source)
+
                 logger.error(f"No se encontró la ubicación para {file_type}")
                 return None
 
-            definition = self.file_registry.definitions[file_type]
             logger.info(f"Leyendo archivo: {location}")
-
-            if definition.format in ["xlsx", "xlsb", "xls", "xlsm"]:
-                # Lectura simple de Excel sin validación de hojas
-                return pd.read_excel(location)
-            else:
-                # Lectura simple de archivos CSV/TSV
-                return pd.read_csv(location, encoding=definition.encoding)
+            # Los archivos guardados con zstd se descomprimen en flujo
+            definition = self.file_registry.definitions[file_type]
+            return read_path(location, definition.format, definition.encoding)
 
         except Exception as e:
             logger.error(f"Error extrayendo {file_type}: {str(e)}")
             return None
 
+    def _extract_file_set(self, file_type: str) -> Optional[pd.DataFrame]:
+        """
+        Lee todos los archivos de una definición con cardinalidad many y los
+        concatena en un único DataFrame.
+
+        Los archivos se leen en paralelo (read_workers procesos) y se
+        concatenan en orden cronológico; cada fila incluye la columna
+        fecha_archivo con la fecha del nombre de su archivo.
+
+        Args:
+            file_type: Tipo de archivo
+
+        Returns:
+            Optional[pd.DataFrame]: Datos de todos los archivos o None si no hay
+        """
+        files = self.file_registry.locate_files(file_type, self.periodo)
+        if not files:
+            logger.error(f"No se encontraron archivos para {file_type}")
+            return None
+
+        definition = self.file_registry.definitions[file_type]
+        paths: List[Path] = [file.path for file in files]
+        formats = [definition.format] * len(paths)
+        encodings = [definition.encoding] * len(paths)
+        logger.info(f"Leyendo {len(paths)} archivos de {file_type}")
+
+        workers = min(self.read_workers, len(paths))
+        if workers <= 1:
+            frames = list(map(read_path, paths, formats, encodings))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                frames = list(executor.map(read_path, paths, formats, encodings))
+
+        for file, frame in zip(files, frames):
+            frame["fecha_archivo"] = file.fecha
+        return pd.concat(frames, ignore_index=True)
+
+    def _read_file(self, file_type: str, source) -> pd.DataFrame:
+        """
+        Lee un archivo según el formato definido en el registro.
+
+        Args:
+            file_type: Tipo de archivo
+            source: Ruta o objeto de archivo con seek
+
+        Returns:
+            pd.DataFrame: Datos leídos
+        """
+        definition = self.file_registry.definitions[file_type]
+        return read_frame(source, definition.format, definition.encoding)
+
     def extract_all(self) -> bool:
         """
         Extrae todos los archivos configurados.
@@ -96,6 +206,13 @@ class DataExtractor:
 
         return success
 
+    def close(self) -> None:
+        """
+        Libera los recursos del extractor. Debe llamarse al terminar de
+        extraer: guarda los datos pendientes del índice de archivos.
+        """
+        self.file_registry.close()
+
     def get_extracted_data(self) -> Dict[str, pd.DataFrame]:
         """
         Obtiene los datos extraídos.
@@ -4,16 +4,82 @@ Implementa la lógica específica para copiar archivos desde unzipped a processe
 siguiendo una estructura predefinida.
 """
 
+import hashlib
+import json
 import os
-import shutil
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Pattern, Tuple
 import re
 from datetime import datetime
 
+from src.utils.io_engine import member_target_path
+from src.utils.file_placement import place_file
+from src.utils.period_handler import PeriodHandler
+from src.utils.zstd_store import plain_name
+
 logger = logging.getLogger(__name__)
 
+PLAN_NAME = ".organize_plan.json"
+
+# Formato de las carpetas de partición diaria ({fecha})
+DATE_PARTITION_FORMAT = "%Y%m%d"
+
+# Diferencia máxima (segundos) entre fechas de modificación para considerar
+# iguales origen y destino (cubre la resolución de FAT y recursos compartidos)
+MTIME_TOLERANCE = 2.0
+
+PLACEMENT_VERBS = {
+    "copy": "copiado",
+    "hardlink": "enlazado",
+    "reflink": "clonado",
+    "move": "movido",
+}
+
+
+@dataclass
+class OrganizePlan:
+    """
+    Plan de una organización incremental.
+
+    Clasifica los destinos en agregados (no existen), modificados (difieren
+    del origen) y sin cambios, con sus totales en bytes, y lista los tipos de
+    archivo sin ningún archivo de origen.
+    """
+
+    added: List[Path] = field(default_factory=list)
+    changed: List[Path] = field(default_factory=list)
+    unchanged: List[Path] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    added_bytes: int = 0
+    changed_bytes: int = 0
+    unchanged_bytes: int = 0
+
+    def summary(self) -> str:
+        """Resumen legible del plan."""
+        mb = 1024**2
+        return (
+            f"{len(self.added)} agregados ({self.added_bytes / mb:.1f} MB), "
+            f"{len(self.changed)} modificados ({self.changed_bytes / mb:.1f} MB), "
+            f"{len(self.unchanged)} sin cambios ({self.unchanged_bytes / mb:.1f} MB), "
+            f"{len(self.missing)} tipos faltantes"
+        )
+
+    def to_dict(self) -> Dict:
+        """Representación serializable del plan."""
+        return {
+            "added": [str(path) for path in self.added],
+            "changed": [str(path) for path in self.changed],
+            "unchanged": [str(path) for path in self.unchanged],
+            "missing": self.missing,
+            "added_bytes": self.added_bytes,
+            "changed_bytes": self.changed_bytes,
+            "unchanged_bytes": self.unchanged_bytes,
+        }
+
 
 class FileOrganizer:
     """
@@ -35,6 +101,19 @@ class FileOrganizer:
         self.unzipped_path = Path(config["paths"]["unzipped"]) / periodo
         self.processed_path = Path(config["paths"]["processed"]) / periodo
         self.errors = {}
+        # Estrategia de ubicación: copy, hardlink, reflink o move
+        organize_config = config.get("organize", {})
+        self.placement = organize_config.get("placement", "copy")
+        self.copy_workers = max(1, int(organize_config.get("copy_workers", 4)))
+        # Organización incremental: omitir los destinos iguales al origen
+        self.incremental = organize_config.get("incremental", False)
+        self.hash_compare = organize_config.get("hash", False)
+        self.plan: Optional[OrganizePlan] = None
+        # Extracción directa: ZipHandler escribe cada miembro en el destino
+        # que indica route(), sin pasar por unzipped
+        self.direct = organize_config.get("direct", False)
+        quarantine = organize_config.get("quarantine")
+        self.quarantine_path = Path(quarantine) / periodo if quarantine else None
 
         # Definimos los patrones de archivos y sus destinos
         self.file_patterns = {
@@ -93,6 +172,11 @@ class FileOrganizer:
                 "destination": "operacion/diario",
                 "required": True,
             },
+            "vertimientos": {
+                "patterns": ["Vertimientos_*.xlsx"],
+                "destination": "vertimientos/diario",
+                "required": False,
+            },
             "contratos_medidas": {
                 "patterns": [
                     f"Contratos_Generadores_{self.periodo_corto}_Fisicos_Medidas.xlsx",
@@ -119,52 +203,403 @@ class FileOrganizer:
             },
         }
 
-    def _find_file(self, pattern: str, search_path: Path) -> List[Path]:
+        # Los destinos de file_patterns en config.yml prevalecen sobre los de
+        # la tabla. En los destinos diarios, {fecha} se reemplaza por la fecha
+        # (YYYYMMDD) del nombre de cada archivo
+        for file_type, pattern_config in config.get("file_patterns", {}).items():
+            destination = (pattern_config or {}).get("destination")
+            if file_type in self.file_patterns and destination:
+                self.file_patterns[file_type]["destination"] = destination.strip("/")
+
+        # Patrones precompilados una sola vez por ejecución
+        self.compiled_patterns = [
+            (file_type, position, self._compile_pattern(pattern))
+            for file_type, config in self.file_patterns.items()
+            for position, pattern in enumerate(config["patterns"])
+        ]
+        self.combined_pattern = self._compile_pattern(
+            "|".join(
+                f"(?:{pattern})"
+                for config in self.file_patterns.values()
+                for pattern in config["patterns"]
+            )
+        )
+
+    @staticmethod
+    def _compile_pattern(pattern: str) -> Pattern:
         """
-        Busca archivos que coincidan con el patrón dado.
+        Convierte un patrón con comodines en una expresión regular compilada.
 
         Args:
             pattern: Patrón de búsqueda (admite comodines *)
+
+        Returns:
+            Pattern: Expresión regular (se aplica con match, sin distinguir
+            mayúsculas)
+        """
+        return re.compile(pattern.replace("*", ".*"), re.IGNORECASE)
+
+    def _build_index(self, search_path: Path) -> List[Tuple[str, Path]]:
+        """
+        Construye en una sola pasada el índice de archivos bajo una ruta.
+
+        Recorre el árbol con scandir en el mismo orden que os.walk (archivos
+        de cada carpeta antes que sus subcarpetas).
+
+        Args:
             search_path: Ruta donde buscar
 
         Returns:
-            List[Path]: Lista de archivos encontrados
+            List[Tuple[str, Path]]: Nombre para comparar (sin la extensión .zst)
+            y ruta de cada archivo
         """
-        # Convertimos el patrón a expresión regular
-        pattern = pattern.replace("*", ".*")
-        regex = re.compile(pattern, re.IGNORECASE)
+        index = []
+        if not os.path.isdir(search_path):
+            return index
+        pending = [str(search_path)]
 
-        found_files = []
-        # Buscamos en todos los subdirectorios
-        for root, _, files in os.walk(search_path):
-            for filename in files:
-                if regex.match(filename):
-                    found_files.append(Path(root) / filename)
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    subdirs = []
+                    for entry in entries:
+                        if entry.is_dir():
+                            # Como os.walk, no se sigue enlaces simbólicos
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        else:
+                            # Los archivos comprimidos con zstd se copian tal cual
+                            index.append((plain_name(entry.name), Path(entry.path)))
+            except OSError as e:
+                logger.warning(f"No se pudo recorrer {current}: {str(e)}")
+                continue
+            pending.extend(reversed(subdirs))
 
-        return found_files
+        return index
 
-    def _copy_file(self, source: Path, destination: Path) -> bool:
+    def _match_files(
+        self, index: List[Tuple[str, Path]]
+    ) -> Dict[Tuple[str, int], List[Path]]:
         """
-        Copia un archivo asegurando que el directorio destino exista.
+        Compara todos los patrones contra el índice en una sola pasada.
+
+        Una expresión combinada descarta de una vez los archivos que no
+        coinciden con ningún patrón.
+
+        Args:
+            index: Índice de archivos (ver _build_index)
+
+        Returns:
+            Dict[Tuple[str, int], List[Path]]: Archivos encontrados por tipo de
+            archivo y posición del patrón
+        """
+        matches: Dict[Tuple[str, int], List[Path]] = {}
+        for name, path in index:
+            if not self.combined_pattern.match(name):
+                continue
+            for file_type, position, regex in self.compiled_patterns:
+                if regex.match(name):
+                    matches.setdefault((file_type, position), []).append(path)
+        return matches
+
+    def _place_file(self, source: Path, destination: Path) -> str:
+        """
+        Ubica un archivo en su destino según la estrategia configurada
+        (copia, enlace duro, reflink o movimiento), asegurando que el
+        directorio destino exista.
 
         Args:
             source: Ruta del archivo origen
             destination: Ruta del archivo destino
 
         Returns:
-            bool: True si la copia fue exitosa
+            str: Estrategia efectivamente usada
         """
-        try:
-            # Crear directorio destino si no existe
-            destination.parent.mkdir(parents=True, exist_ok=True)
-
-            # Copiar archivo manteniendo metadata
-            shutil.copy2(source, destination)
-            logger.info(f"Archivo copiado: {source.name} -> {destination}")
-            return True
-        except Exception as e:
-            logger.error(f"Error copiando {source.name}: {str(e)}")
+        # Crear directorio destino si no existe
+        destination.parent.mkdir(parents=True, exist_ok=True)
+
+        method = place_file(source, destination, self.placement)
+        logger.info(
+            f"Archivo {PLACEMENT_VERBS[method]}: {source.name} -> {destination}"
+        )
+        return method
+
+    def _destination_dir(self, destination: str, filename: str) -> Path:
+        """
+        Resuelve la carpeta de destino de un archivo.
+
+        Si el destino tiene la variable {fecha}, el archivo se ubica en la
+        partición del día indicado en su nombre; si el nombre no contiene una
+        fecha válida, se ubica en la carpeta sin partición.
+
+        Args:
+            destination: Destino configurado (puede incluir {fecha})
+            filename: Nombre del archivo
+
+        Returns:
+            Path: Carpeta de destino
+        """
+        if "{fecha}" not in destination:
+            return self.processed_path / destination
+
+        fecha = PeriodHandler.extract_date(plain_name(filename))
+        if fecha is None:
+            logger.warning(f"No se encontró la fecha en el nombre de {filename}")
+            return self.processed_path / destination.replace("{fecha}", "")
+        return self.processed_path / destination.format(
+            fecha=fecha.strftime(DATE_PARTITION_FORMAT)
+        )
+
+    @staticmethod
+    def _as_glob(pattern: str) -> str:
+        """
+        Convierte un patrón de la tabla de destinos a la sintaxis de comodines
+        de MemberFilter (fnmatch, anclada al nombre completo).
+
+        _compile_pattern aplica el patrón como prefijo, por lo que se agrega
+        un * final; los caracteres especiales de fnmatch se escapan.
+
+        Args:
+            pattern: Patrón de la tabla de destinos
+
+        Returns:
+            str: Patrón fnmatch equivalente
+        """
+        glob = re.sub(r"([?\[\]])", r"[\1]", pattern)
+        return glob if glob.endswith("*") else glob + "*"
+
+    def member_patterns(self) -> List[Tuple[str, Optional[str], str]]:
+        """
+        Entrega los patrones de la tabla de destinos para el filtro de
+        miembros de la extracción selectiva, en la sintaxis de MemberFilter.
+
+        Returns:
+            List[Tuple[str, Optional[str], str]]: Tuplas (tipo de archivo, None,
+            patrón fnmatch de nombre)
+        """
+        return [
+            (file_type, None, self._as_glob(pattern))
+            for file_type, config in self.file_patterns.items()
+            for pattern in config["patterns"]
+        ]
+
+    def route(self, member_name: str) -> Optional[str]:
+        """
+        Resuelve el destino final de un miembro de ZIP según la tabla de
+        patrones, para la extracción directa a processed.
+
+        Se usa el primer patrón que coincide, en el mismo orden que organize.
+        Los miembros que no coinciden van a la cuarentena si está configurada.
+
+        Args:
+            member_name: Nombre del miembro dentro del ZIP
+
+        Returns:
+            Optional[str]: Ruta de destino o None si el miembro se omite
+        """
+        name = os.path.basename(member_name.replace("\\", "/"))
+        match_name = plain_name(name)
+        if name and self.combined_pattern.match(match_name):
+            for file_type, _, regex in self.compiled_patterns:
+                if regex.match(match_name):
+                    destination = self.file_patterns[file_type]["destination"]
+                    return str(self._destination_dir(destination, name) / name)
+
+        if self.quarantine_path is not None:
+            return member_target_path(str(self.quarantine_path), member_name)
+        return None
+
+    def check_destinations(self) -> bool:
+        """
+        Verifica que los tipos de archivo requeridos estén en processed.
+
+        Reemplaza la ubicación de archivos cuando la extracción fue directa.
+
+        Returns:
+            bool: True si se encontraron todos los archivos requeridos
+        """
+        success = True
+        matches = self._match_files(self._build_index(self.processed_path))
+        for file_type, config in self.file_patterns.items():
+            found_any = any(
+                matches.get((file_type, position))
+                for position in range(len(config["patterns"]))
+            )
+            if not found_any and config["required"]:
+                error_msg = f"No se encontró archivo requerido: {file_type}"
+                self.errors[file_type] = error_msg
+                logger.error(error_msg)
+                success = False
+        return success
+
+    def list_day_partitions(
+        self,
+        file_type: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Path]:
+        """
+        Lista las particiones diarias de un tipo de archivo dentro de un rango.
+
+        Permite a los lectores cargar solo los días requeridos sin listar ni
+        filtrar todos los archivos del periodo.
+
+        Args:
+            file_type: Tipo de archivo con destino particionado por {fecha}
+            start: Fecha inicial (inclusive); None no acota
+            end: Fecha final (inclusive); None no acota
+
+        Returns:
+            List[Path]: Carpetas de las particiones, ordenadas por fecha
+        """
+        destination = self.file_patterns[file_type]["destination"]
+        base_path = self.processed_path / destination.split("{fecha}")[0]
+        if "{fecha}" not in destination or not base_path.is_dir():
+            return []
+
+        partitions = []
+        for entry in os.scandir(base_path):
+            try:
+                fecha = datetime.strptime(entry.name, DATE_PARTITION_FORMAT)
+            except ValueError:
+                continue
+            if (start is None or fecha >= start) and (end is None or fecha <= end):
+                partitions.append(Path(entry.path))
+        return sorted(partitions)
+
+    @staticmethod
+    def _file_hash(path: Path) -> str:
+        """
+        Calcula el hash BLAKE2b del contenido de un archivo.
+
+        Args:
+            path: Ruta al archivo
+
+        Returns:
+            str: Digest en hexadecimal
+        """
+        digest = hashlib.blake2b()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(4 * 1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _is_unchanged(self, source: Path, destination: Path) -> bool:
+        """
+        Indica si el destino ya contiene el mismo archivo que el origen.
+
+        Se comparan tamaño y fecha de modificación (la copia conserva la fecha
+        del origen); si está habilitado el hash, el contenido decide en lugar
+        de la fecha.
+
+        Args:
+            source: Archivo origen
+            destination: Archivo destino existente
+
+        Returns:
+            bool: True si no es necesario volver a ubicar el archivo
+        """
+        source_stat = source.stat()
+        destination_stat = destination.stat()
+        if source_stat.st_size != destination_stat.st_size:
             return False
+        if self.hash_compare:
+            return self._file_hash(source) == self._file_hash(destination)
+        return abs(source_stat.st_mtime - destination_stat.st_mtime) <= MTIME_TOLERANCE
+
+    def build_plan(self, tasks: Dict[Path, Path], missing: List[str]) -> OrganizePlan:
+        """
+        Construye el plan de una organización incremental.
+
+        Args:
+            tasks: Archivos a ubicar {destino: origen}
+            missing: Tipos de archivo sin archivos de origen
+
+        Returns:
+            OrganizePlan: Plan con los destinos clasificados
+        """
+        plan = OrganizePlan(missing=missing)
+        for destination, source in sorted(tasks.items()):
+            size = source.stat().st_size
+            if not destination.exists():
+                plan.added.append(destination)
+                plan.added_bytes += size
+            elif self._is_unchanged(source, destination):
+                plan.unchanged.append(destination)
+                plan.unchanged_bytes += size
+            else:
+                plan.changed.append(destination)
+                plan.changed_bytes += size
+        return plan
+
+    def _save_plan(self, plan: OrganizePlan) -> None:
+        """
+        Guarda el plan en processed/<periodo>/.organize_plan.json.
+
+        Args:
+            plan: Plan de la organización
+        """
+        try:
+            self.processed_path.mkdir(parents=True, exist_ok=True)
+            with open(self.processed_path / PLAN_NAME, "w", encoding="utf-8") as file:
+                json.dump(plan.to_dict(), file, indent=2, ensure_ascii=False)
+        except OSError as e:
+            logger.warning(f"No se pudo guardar el plan de organización: {str(e)}")
+
+    def _place_files(self, tasks: Dict[Path, Path]) -> Dict[Path, Optional[str]]:
+        """
+        Ubica un conjunto de archivos con un grupo acotado de hilos.
+
+        Los archivos se procesan del más grande al más pequeño para que las
+        copias largas empiecen primero. Al terminar se registra el
+        rendimiento agregado de las copias.
+
+        Args:
+            tasks: Archivos a ubicar {destino: origen}
+
+        Returns:
+            Dict[Path, Optional[str]]: Error de cada destino (None si fue exitoso)
+        """
+        sizes = {}
+        for destination, source in tasks.items():
+            try:
+                sizes[destination] = source.stat().st_size
+            except OSError:
+                sizes[destination] = 0
+        ordered = sorted(
+            tasks, key=lambda destination: sizes[destination], reverse=True
+        )
+
+        outcomes: Dict[Path, Optional[str]] = {}
+        copied_bytes = 0
+        start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.copy_workers) as executor:
+            futures = {
+                executor.submit(self._place_file, tasks[destination], destination): (
+                    destination
+                )
+                for destination in ordered
+            }
+            for future in as_completed(futures):
+                destination = futures[future]
+                try:
+                    if future.result() == "copy":
+                        copied_bytes += sizes[destination]
+                    outcomes[destination] = None
+                except Exception as e:
+                    outcomes[destination] = str(e)
+                    logger.error(f"Error ubicando {tasks[destination].name}: {str(e)}")
+
+        elapsed = time.perf_counter() - start_time
+        if copied_bytes and elapsed > 0:
+            logger.info(
+                f"Copiados {copied_bytes / 1024 ** 2:.1f} MB en {elapsed:.1f} s "
+                f"({copied_bytes / 1024 ** 2 / elapsed:.1f} MB/s, "
+                f"{self.copy_workers} copias simultáneas)"
+            )
+        return outcomes
 
     def organize(self) -> bool:
         """
@@ -174,24 +609,67 @@ class FileOrganizer:
             bool: True si el proceso fue exitoso
         """
         logger.info(f"Iniciando organización de archivos para periodo {self.periodo}")
+        if self.direct:
+            # Los archivos ya se extrajeron en su destino final
+            return self.check_destinations()
         success = True
 
-        # Procesar cada tipo de archivo
-        for file_type, config in self.file_patterns.items():
-            found_any = False
+        # Un único recorrido del directorio para todos los patrones
+        index = self._build_index(self.unzipped_path)
+        matches = self._match_files(index)
+        logger.debug(f"Índice de {len(index)} archivos en {self.unzipped_path}")
 
-            # Buscar archivos que coincidan con cualquiera de los patrones
-            for pattern in config["patterns"]:
-                found_files = self._find_file(pattern, self.unzipped_path)
+        # Destinos de cada tipo de archivo; un mismo destino se ubica una vez.
+        # Si varios archivos van al mismo destino, queda el último encontrado,
+        # igual que cuando se copiaban uno a uno sobrescribiendo el anterior
+        destinations: Dict[str, List[Path]] = {}
+        tasks: Dict[Path, Path] = {}
+        for file_type, config in self.file_patterns.items():
+            destinations[file_type] = []
 
-                for source_file in found_files:
+            # Archivos que coinciden con cualquiera de los patrones
+            for position in range(len(config["patterns"])):
+                for source_file in matches.get((file_type, position), []):
                     dest_path = (
-                        self.processed_path / config["destination"] / source_file.name
+                        self._destination_dir(config["destination"], source_file.name)
+                        / source_file.name
                     )
-                    if self._copy_file(source_file, dest_path):
-                        found_any = True
-                    else:
-                        success = False
+                    destinations[file_type].append(dest_path)
+                    previous = tasks.get(dest_path)
+                    if previous is not None and previous != source_file:
+                        logger.warning(
+                            f"Varios archivos con destino {dest_path}: se usa "
+                            f"{source_file} en lugar de {previous}"
+                        )
+                    tasks[dest_path] = source_file
+
+        if self.incremental:
+            missing = [
+                file_type for file_type, paths in destinations.items() if not paths
+            ]
+            self.plan = self.build_plan(tasks, missing)
+            self._save_plan(self.plan)
+            logger.info(f"Plan de organización: {self.plan.summary()}")
+
+            pending = self.plan.added + self.plan.changed
+            outcomes = self._place_files({path: tasks[path] for path in pending})
+            outcomes.update({path: None for path in self.plan.unchanged})
+        else:
+            outcomes = self._place_files(tasks)
+
+        # Procesar cada tipo de archivo
+        for file_type, config in self.file_patterns.items():
+            failed = [
+                dest_path
+                for dest_path in destinations[file_type]
+                if outcomes[dest_path] is not None
+            ]
+            if failed:
+                self.errors[file_type] = (
+                    f"Error ubicando {tasks[failed[0]].name}: {outcomes[failed[0]]}"
+                )
+                success = False
+            found_any = len(failed) < len(destinations[file_type])
 
             # Registrar error si no se encontró un archivo requerido
             if not found_any and config["required"]:
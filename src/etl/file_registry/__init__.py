@@ -1,6 +1,6 @@
 from .file_registry import FileRegistry
 from .file_definition import FileDefinition
-from .file_location import FileLocation
+from .file_location import FileLocation, DatedFile
 from .file_index import FileIndex
 from .exceptions import (
     FileRegistryError,
@@ -15,6 +15,7 @@ __all__ = [
     'FileRegistry',
     'FileDefinition',
     'FileLocation',
+    'DatedFile',
     'FileIndex',
     'FileRegistryError',
     'FileDefinitionError',
@@ -45,9 +45,14 @@ class FileDefinition:
     requires_sheets: bool = False
     encoding: str = "utf-8"
     sheets: List[SheetDefinition] = field(default_factory=list)
+    # "one": un archivo por periodo (el más reciente); "many": todos los
+    # archivos que coinciden (por ejemplo, un archivo diario)
+    cardinality: str = "one"
 
     def __post_init__(self):
         """
-        Normaliza el formato a minúsculas después de la inicialización.
+        Normaliza el formato y la cardinalidad a minúsculas después de la
+        inicialización.
         """
         self.format = self.format.lower()
+        self.cardinality = self.cardinality.lower()
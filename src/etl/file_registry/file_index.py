@@ -1,76 +1,467 @@
 """
 Módulo para el índice de archivos encontrados.
+El índice se guarda en SQLite, por lo que puede persistir entre ejecuciones:
+cada ubicación se valida con un stat del archivo y otro de su directorio en
+lugar de volver a recorrer los directorios. Admite varios periodos a la vez, con un tamaño máximo y descarte
+de las entradas menos usadas (LRU).
+
+Cada entrada guarda además una huella del contenido: una rápida (tamaño y hash
+del primer y último bloque) al registrar el archivo y el hash BLAKE2b completo,
+calculado en segundo plano o al pedirlo. Sirve como clave de caché para omitir trabajo
+cuando un archivo se vuelve a descargar idéntico aunque cambie su fecha.
 """
 
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Tuple
 from .exceptions import FileRegistryError
 
+# Tamaño de los bloques inicial y final de la huella rápida
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_index (
+    file_type TEXT,
+    periodo TEXT,
+    path TEXT,
+    size INTEGER,
+    mtime_ns INTEGER,
+    inode INTEGER,
+    dir_mtime_ns INTEGER,
+    validated INTEGER,
+    registered_at TEXT,
+    accessed_at REAL,
+    quick_fingerprint TEXT,
+    full_hash TEXT,
+    PRIMARY KEY (file_type, periodo)
+);
+"""
+
+# Columnas agregadas después de la primera versión del esquema
+ADDED_COLUMNS = {
+    'accessed_at': 'REAL DEFAULT 0',
+    'quick_fingerprint': 'TEXT',
+    'full_hash': 'TEXT',
+    'dir_mtime_ns': 'INTEGER',
+}
+
+
+def quick_fingerprint(path: Path, block_size: int = FINGERPRINT_BLOCK_SIZE) -> str:
+    """
+    Calcula la huella rápida de un archivo: tamaño y BLAKE2b de sus bloques
+    inicial y final.
+
+    Args:
+        path: Ruta al archivo
+        block_size: Tamaño de cada bloque en bytes
+
+    Returns:
+        str: Huella con formato <tamaño>-<hash>
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        digest.update(file.read(block_size))
+        if size > block_size:
+            file.seek(max(block_size, size - block_size))
+            digest.update(file.read(block_size))
+    return f"{size}-{digest.hexdigest()}"
+
+
+def full_hash(path: Path, buffer_size: int = 4 * 1024 * 1024) -> str:
+    """
+    Calcula el hash BLAKE2b de todo el contenido de un archivo.
+
+    Args:
+        path: Ruta al archivo
+        buffer_size: Tamaño del buffer de lectura en bytes
+
+    Returns:
+        str: Digest en hexadecimal
+    """
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(buffer_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 class FileIndex:
-    """Clase para mantener un índice de archivos encontrados."""
+    """
+    Clase para mantener un índice de archivos encontrados.
+
+    Cada entrada se identifica por tipo de archivo y periodo, y guarda la ruta,
+    el tamaño, la fecha de modificación y el inodo del archivo, además de la
+    fecha de modificación de su directorio. Una entrada solo se usa si el
+    archivo sigue existiendo con los mismos datos y su directorio no cambió:
+    si aparece un archivo más reciente junto a él, se vuelve a buscar.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        hash_workers: int = 0
+    ):
+        """
+        Inicializa el índice de archivos.
 
-    def __init__(self):
-        """Inicializa el índice de archivos."""
-        self.index: Dict[str, Dict] = {}
+        Args:
+            db_path: Ruta al archivo SQLite; None mantiene el índice solo en
+                memoria durante la ejecución
+            max_entries: Cantidad máxima de entradas; al superarla se descartan
+                las usadas hace más tiempo (None no limita)
+            hash_workers: Hilos para calcular en segundo plano el hash
+                completo de los archivos registrados (0 lo calcula solo al
+                pedirlo, ver get_fingerprint)
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        # Los hilos solo calculan los hashes: la conexión se usa únicamente
+        # desde el hilo que creó el índice
+        self._hash_executor = (
+            ThreadPoolExecutor(max_workers=hash_workers) if hash_workers > 0 else None
+        )
+        self._pending_hashes: Dict[Tuple[str, str], Tuple[str, int, Future]] = {}
+        # Usos de entradas aún no guardados: (tipo, periodo) -> accessed_at
+        self._pending_touches: Dict[Tuple[str, str], float] = {}
+        try:
+            if db_path:
+                directory = os.path.dirname(os.path.abspath(db_path))
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(db_path or ':memory:')
+            self.connection.executescript(SCHEMA)
+            columns = [
+                row[1] for row in
+                self.connection.execute('PRAGMA table_info(file_index)')
+            ]
+            # Índices creados con una versión anterior del esquema
+            with self.connection:
+                for column, definition in ADDED_COLUMNS.items():
+                    if column not in columns:
+                        self.connection.execute(
+                            f'ALTER TABLE file_index ADD COLUMN {column} {definition}'
+                        )
+        except (OSError, sqlite3.Error) as e:
+            raise FileRegistryError(
+                f"Error abriendo el índice de archivos {db_path}: {str(e)}"
+            )
+
+    def close(self) -> None:
+        """
+        Cierra la conexión al índice, guardando los usos de entradas
+        pendientes y los hashes completos ya calculados.
+
+        Los hashes que aún no empiezan se cancelan (se calcularán al pedirlos)
+        y solo se esperan los que están en curso.
+        """
+        if self._hash_executor is not None:
+            self._hash_executor.shutdown(wait=True, cancel_futures=True)
+            self._store_hashes()
+        with self.connection:
+            self._flush_touches()
+        self.connection.close()
 
     def register_file(
         self,
         file_type: str,
         file_path: Path,
-        validation_status: bool = False
+        validation_status: bool = False,
+        periodo: str = ''
     ) -> None:
         """
         Registra un archivo en el índice.
 
+        Calcula la huella rápida del archivo y encarga el hash completo a
+        los hilos en segundo plano.
+
         Args:
             file_type: Tipo de archivo
             file_path: Ruta al archivo
             validation_status: Estado de validación
+            periodo: Periodo del archivo (YYYYMM)
         """
-        self.index[file_type] = {
-            'path': file_path,
-            'last_modified': datetime.fromtimestamp(
-                file_path.stat().st_mtime
-            ),
-            'validated': validation_status,
-            'registered_at': datetime.now()
-        }
+        stat = file_path.stat()
+        dir_stat = file_path.parent.stat()
+        try:
+            fingerprint = quick_fingerprint(file_path)
+        except OSError:
+            fingerprint = None
+        with self.connection:
+            # Los usos pendientes se guardan antes del descarte LRU
+            self._flush_touches()
+            self.connection.execute(
+                'INSERT OR REPLACE INTO file_index (file_type, periodo, path, size, '
+                'mtime_ns, inode, dir_mtime_ns, validated, registered_at, '
+                'accessed_at, quick_fingerprint, full_hash) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)',
+                (
+                    file_type,
+                    periodo,
+                    str(file_path),
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                    stat.st_ino,
+                    dir_stat.st_mtime_ns,
+                    int(validation_status),
+                    datetime.now().isoformat(),
+                    time.time(),
+                    fingerprint
+                )
+            )
+            if self.max_entries:
+                self.connection.execute(
+                    'DELETE FROM file_index WHERE rowid NOT IN ('
+                    'SELECT rowid FROM file_index ORDER BY accessed_at DESC LIMIT ?)',
+                    (self.max_entries,)
+                )
+
+        if self._hash_executor is not None:
+            self._pending_hashes[(file_type, periodo)] = (
+                str(file_path),
+                stat.st_mtime_ns,
+                self._hash_executor.submit(full_hash, file_path)
+            )
+
+    def _store_hashes(self) -> None:
+        """
+        Guarda los hashes completos ya calculados.
+
+        Un hash solo se guarda si la entrada sigue apuntando al mismo archivo
+        (ruta y fecha de modificación) que se leyó para calcularlo.
+        """
+        done = [
+            key for key, (_, _, future) in self._pending_hashes.items()
+            if future.done()
+        ]
+        with self.connection:
+            for key in done:
+                path, mtime_ns, future = self._pending_hashes.pop(key)
+                if future.cancelled():
+                    continue
+                try:
+                    digest = future.result()
+                except OSError:
+                    continue
+                self.connection.execute(
+                    'UPDATE file_index SET full_hash = ? WHERE file_type = ? '
+                    'AND periodo = ? AND path = ? AND mtime_ns = ?',
+                    (digest, *key, path, mtime_ns)
+                )
 
-    def get_file_location(self, file_type: str) -> Optional[Path]:
+    def get_fingerprint(
+        self,
+        file_type: str,
+        periodo: str = '',
+        wait: bool = False
+    ) -> Optional[Dict]:
+        """
+        Obtiene la huella del contenido de un archivo registrado.
+
+        Args:
+            file_type: Tipo de archivo
+            periodo: Periodo del archivo (YYYYMM)
+            wait: Obtener el hash completo aunque falte: se espera si se está
+                calculando en segundo plano y, si no, se calcula en el momento
+                y se guarda
+
+        Returns:
+            Optional[Dict]: Huella rápida ('quick') y hash BLAKE2b completo
+            ('blake2b', None si aún no se calcula), o None si el archivo no
+            está registrado o cambió
+        """
+        if self.get_file_location(file_type, periodo) is None:
+            return None
+
+        pending = self._pending_hashes.get((file_type, periodo))
+        if wait and pending is not None:
+            wait_futures([pending[2]])
+        self._store_hashes()
+
+        row = self.connection.execute(
+            'SELECT quick_fingerprint, full_hash, path, mtime_ns FROM file_index '
+            'WHERE file_type = ? AND periodo = ?',
+            (file_type, periodo)
+        ).fetchone()
+        if row is None:
+            return None
+
+        quick, digest, path, mtime_ns = row
+        if wait and digest is None:
+            try:
+                digest = full_hash(Path(path))
+            except OSError:
+                return {'quick': quick, 'blake2b': None}
+            with self.connection:
+                self.connection.execute(
+                    'UPDATE file_index SET full_hash = ? WHERE file_type = ? '
+                    'AND periodo = ? AND path = ? AND mtime_ns = ?',
+                    (digest, file_type, periodo, path, mtime_ns)
+                )
+        return {'quick': quick, 'blake2b': digest}
+
+    def get_entry(self, file_type: str, periodo: str = '') -> Optional[Dict]:
+        """
+        Obtiene una entrada del índice sin validarla contra el disco.
+
+        Args:
+            file_type: Tipo de archivo
+            periodo: Periodo del archivo (YYYYMM)
+
+        Returns:
+            Optional[Dict]: Ruta, tamaño, mtime_ns, inodo y mtime_ns del
+            directorio, o None
+        """
+        row = self.connection.execute(
+            'SELECT path, size, mtime_ns, inode, dir_mtime_ns FROM file_index '
+            'WHERE file_type = ? AND periodo = ?',
+            (file_type, periodo)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('path', 'size', 'mtime_ns', 'inode', 'dir_mtime_ns'), row))
+
+    @staticmethod
+    def matches_disk(entry: Dict) -> bool:
+        """
+        Verifica que el archivo de una entrada y su directorio no hayan cambiado.
+
+        Un cambio en el directorio (archivos agregados, eliminados o
+        renombrados) puede significar que hay un archivo más reciente que el
+        registrado, por lo que la entrada deja de servir. Las entradas sin
+        fecha de directorio (índices anteriores) tampoco se usan.
+
+        No usa la conexión, por lo que puede llamarse desde varios hilos.
+
+        Args:
+            entry: Entrada del índice (ver get_entry)
+
+        Returns:
+            bool: True si el archivo existe con el mismo tamaño, fecha e inodo
+            y su directorio tiene la misma fecha de modificación
+        """
+        try:
+            stat = os.stat(entry['path'])
+            dir_stat = os.stat(os.path.dirname(entry['path']))
+        except OSError:
+            return False
+        return (
+            stat.st_size, stat.st_mtime_ns, stat.st_ino, dir_stat.st_mtime_ns
+        ) == (
+            entry['size'], entry['mtime_ns'], entry['inode'], entry['dir_mtime_ns']
+        )
+
+    def touch(self, keys: Iterable[Tuple[str, str]]) -> None:
+        """
+        Marca entradas como usadas recién (para el descarte LRU).
+
+        Args:
+            keys: Pares (tipo de archivo, periodo)
+        """
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                'UPDATE file_index SET accessed_at = ? '
+                'WHERE file_type = ? AND periodo = ?',
+                [(now, file_type, periodo) for file_type, periodo in keys]
+            )
+
+    def _flush_touches(self) -> None:
+        """
+        Guarda los usos de entradas acumulados por get_file_location.
+
+        Debe llamarse dentro de una transacción (with self.connection).
+        """
+        if not self._pending_touches:
+            return
+        self.connection.executemany(
+            'UPDATE file_index SET accessed_at = ? '
+            'WHERE file_type = ? AND periodo = ?',
+            [
+                (accessed_at, file_type, periodo)
+                for (file_type, periodo), accessed_at in self._pending_touches.items()
+            ]
+        )
+        self._pending_touches.clear()
+
+    def get_file_location(self, file_type: str, periodo: str = '') -> Optional[Path]:
         """
         Obtiene la ubicación de un archivo registrado.
 
+        La entrada se valida con stat (ver matches_disk): si el archivo ya no
+        existe, cambió su tamaño, fecha de modificación o inodo, o cambió su
+        directorio, se descarta. El uso de la entrada no se escribe en cada
+        consulta: se acumula y se guarda en una sola transacción al registrar
+        un archivo o al cerrar el índice.
+
         Args:
             file_type: Tipo de archivo
+            periodo: Periodo del archivo (YYYYMM)
 
         Returns:
             Optional[Path]: Ruta al archivo o None
         """
-        if file_type in self.index:
-            path = self.index[file_type]['path']
-            if path.exists():
-                return path
-            del self.index[file_type]
+        entry = self.get_entry(file_type, periodo)
+        if entry is None:
+            return None
+
+        if self.matches_disk(entry):
+            self._pending_touches[(file_type, periodo)] = time.time()
+            return Path(entry['path'])
+
+        self.remove(file_type, periodo)
         return None
 
-    def is_file_valid(self, file_type: str) -> bool:
+    def remove(self, file_type: str, periodo: str = '') -> None:
+        """
+        Elimina una entrada del índice.
+
+        Args:
+            file_type: Tipo de archivo
+            periodo: Periodo del archivo (YYYYMM)
+        """
+        with self.connection:
+            self.connection.execute(
+                'DELETE FROM file_index WHERE file_type = ? AND periodo = ?',
+                (file_type, periodo)
+            )
+
+    def is_file_valid(self, file_type: str, periodo: str = '') -> bool:
         """
         Verifica si un archivo está validado.
 
         Args:
             file_type: Tipo de archivo
+            periodo: Periodo del archivo (YYYYMM)
 
         Returns:
             bool: True si el archivo está validado
         """
-        if file_type in self.index:
-            return self.index[file_type]['validated']
-        return False
+        row = self.connection.execute(
+            'SELECT validated FROM file_index WHERE file_type = ? AND periodo = ?',
+            (file_type, periodo)
+        ).fetchone()
+        return bool(row and row[0])
 
-    def clear(self) -> None:
-        """Limpia el índice."""
-        self.index.clear()
+    def clear(self, periodo: Optional[str] = None) -> None:
+        """
+        Limpia el índice.
+
+        Args:
+            periodo: Periodo a limpiar; None limpia todo el índice
+        """
+        with self.connection:
+            if periodo is None:
+                self.connection.execute('DELETE FROM file_index')
+            else:
+                self.connection.execute(
+                    'DELETE FROM file_index WHERE periodo = ?', (periodo,)
+                )
 
     def get_stats(self) -> Dict:
         """
@@ -79,14 +470,14 @@ class FileIndex:
         Returns:
             Dict: Estadísticas del índice
         """
+        total, validated, last_update = self.connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(validated), 0), MAX(registered_at) '
+            'FROM file_index'
+        ).fetchone()
         return {
-            'total_files': len(self.index),
-            'validated_files': sum(
-                1 for info in self.index.values() 
-                if info['validated']
-            ),
-            'last_update': max(
-                (info['registered_at'] for info in self.index.values()),
-                default=None
+            'total_files': total,
+            'validated_files': validated,
+            'last_update': (
+                datetime.fromisoformat(last_update) if last_update else None
             )
-        }
\ No newline at end of file
+        }
@@ -2,11 +2,51 @@
 Módulo para el manejo de ubicaciones de archivos.
 """
 
+import fnmatch
 import os
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any, Optional
+from src.utils.period_handler import PeriodHandler
+from src.utils.zstd_store import ZSTD_SUFFIX, plain_name
 from .exceptions import FileLocationError
 
+
+@dataclass(frozen=True)
+class DatedFile:
+    """Archivo de un conjunto (cardinalidad many) con la fecha de su nombre."""
+
+    path: Path
+    fecha: Optional[datetime] = None
+
+
+def sort_dated_files(paths: Iterable[Path]) -> List[DatedFile]:
+    """
+    Ordena un conjunto de archivos por la fecha indicada en su nombre.
+
+    Los archivos sin fecha quedan al final, ordenados por nombre.
+
+    Args:
+        paths: Archivos del conjunto (se descartan las rutas repetidas)
+
+    Returns:
+        List[DatedFile]: Archivos con su fecha, en orden cronológico
+    """
+    files = [
+        DatedFile(path, PeriodHandler.extract_date(plain_name(path.name)))
+        for path in set(paths)
+    ]
+    return sorted(
+        files,
+        key=lambda file: (
+            file.fecha is None,
+            file.fecha or datetime.min,
+            file.path.name
+        )
+    )
+
+
 class FileLocation:
     """Clase para manejar las ubicaciones de archivos."""
 
@@ -104,6 +144,10 @@ class FileLocation:
                 matching_files.extend(
                     list(base_dir.glob(formatted_pattern))
                 )
+                # Archivos guardados comprimidos con zstd
+                matching_files.extend(
+                    list(base_dir.glob(formatted_pattern + ZSTD_SUFFIX))
+                )
             return matching_files
 
         except Exception as e:
@@ -132,6 +176,113 @@ class FileLocation:
         except Exception as e:
             raise FileLocationError(f"Error buscando último archivo: {str(e)}")
 
+    def uses_subdirectories(self) -> bool:
+        """
+        Indica si algún patrón busca en subdirectorios (y requiere glob).
+
+        Returns:
+            bool: True si algún patrón contiene separadores de ruta
+        """
+        return any('/' in pattern or '\\' in pattern for pattern in self.patterns)
+
+    @staticmethod
+    def scan_directory(directory: Path) -> List[os.DirEntry]:
+        """
+        Lista una sola vez los archivos de un directorio.
+
+        Los DirEntry guardan el resultado de stat(), por lo que el listado se
+        puede reutilizar entre patrones y ubicaciones que apuntan al mismo
+        directorio, y al elegir el archivo más reciente.
+
+        Args:
+            directory: Directorio a listar
+
+        Returns:
+            List[os.DirEntry]: Archivos del directorio (vacío si no existe)
+
+        Raises:
+            FileLocationError: Si el directorio no se puede leer
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return [entry for entry in entries if entry.is_file()]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        except OSError as e:
+            raise FileLocationError(f"Error listando {directory}: {str(e)}")
+
+    def find_latest_in(self, entries: List[os.DirEntry], **kwargs) -> Optional[Path]:
+        """
+        Encuentra el archivo más reciente que coincida dentro de un listado
+        del directorio de la ubicación (ver scan_directory).
+
+        Args:
+            entries: Archivos del directorio de la ubicación
+            **kwargs: Variables para reemplazar en los patrones
+
+        Returns:
+            Optional[Path]: Archivo más reciente o None
+
+        Raises:
+            FileLocationError: Si hay error en la búsqueda
+        """
+        try:
+            matching_entries = self._match_entries(entries, **kwargs)
+            if not matching_entries:
+                return None
+
+            latest = max(matching_entries, key=lambda entry: entry.stat().st_mtime)
+            return Path(latest.path)
+
+        except FileLocationError:
+            raise
+        except Exception as e:
+            raise FileLocationError(f"Error buscando último archivo: {str(e)}")
+
+    def find_all_in(self, entries: List[os.DirEntry], **kwargs) -> List[Path]:
+        """
+        Encuentra todos los archivos que coinciden dentro de un listado del
+        directorio de la ubicación (ver scan_directory).
+
+        Args:
+            entries: Archivos del directorio de la ubicación
+            **kwargs: Variables para reemplazar en los patrones
+
+        Returns:
+            List[Path]: Archivos encontrados
+
+        Raises:
+            FileLocationError: Si hay error en la búsqueda
+        """
+        return [Path(entry.path) for entry in self._match_entries(entries, **kwargs)]
+
+    def _match_entries(
+        self,
+        entries: List[os.DirEntry],
+        **kwargs
+    ) -> List[os.DirEntry]:
+        """
+        Filtra un listado con los patrones de la ubicación.
+
+        Args:
+            entries: Archivos del directorio de la ubicación
+            **kwargs: Variables para reemplazar en los patrones
+
+        Returns:
+            List[os.DirEntry]: Archivos que coinciden con algún patrón
+        """
+        matching_entries = []
+        for pattern in self.patterns:
+            formatted_pattern = self.format_pattern(pattern, **kwargs)
+            # Incluye los archivos guardados comprimidos con zstd
+            zstd_pattern = formatted_pattern + ZSTD_SUFFIX
+            for name_pattern in (formatted_pattern, zstd_pattern):
+                matching_entries.extend(
+                    entry for entry in entries
+                    if fnmatch.fnmatch(entry.name, name_pattern)
+                )
+        return matching_entries
+
     def __str__(self) -> str:
         """Representación en string de la ubicación."""
         return f"FileLocation(base={self.base_path}, path={self.relative_path})"
@@ -4,11 +4,16 @@ Este módulo coordina la gestión y acceso a las definiciones de archivos del si
 """
 
 import logging
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
-from .exceptions import FileRegistryError
+from typing import IO, ContextManager, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.archive_reader import ArchiveMember, ArchiveReader
+from src.utils.member_filter import MemberFilter
+from .exceptions import FileLocationError, FileRegistryError
 from .file_definition import FileDefinition, FileValidation
-from .file_location import FileLocation
+from .file_location import DatedFile, FileLocation, sort_dated_files
 from .file_index import FileIndex
 
 logger = logging.getLogger(__name__)
@@ -27,10 +32,33 @@ class FileRegistry:
         self.config = config
         self.base_path = Path(config["paths"]["processed"])
         self.definitions: Dict[str, FileDefinition] = {}
-        self.index = FileIndex()
 
         registry_config = self.config.get("file_registry", {})
         self.path_variables = registry_config.get("path_variables", {})
+        # Índice persistente: en una ejecución posterior cada ubicación se
+        # valida con stat (archivo y directorio) en lugar de volver a
+        # recorrer los directorios
+        self.index = FileIndex(
+            registry_config.get("index_path"),
+            max_entries=registry_config.get("index_max_entries"),
+            hash_workers=registry_config.get("index_hash_workers", 0),
+        )
+        self.locate_workers = max(1, int(registry_config.get("locate_workers", 8)))
+
+        # Lectura directa desde los ZIP archivados (sin extraer a disco)
+        self.archive_reader: Optional[ArchiveReader] = None
+        if registry_config.get("read_from_archive", False):
+            catalog_config = config.get("catalog", {})
+            self.archive_reader = ArchiveReader(
+                config["paths"]["archive"],
+                catalog_path=(
+                    catalog_config.get("path")
+                    if catalog_config.get("enabled", False)
+                    else None
+                ),
+            )
+        self._member_filters: Dict[str, MemberFilter] = {}
+        self._archive_members: Dict[tuple, Optional[ArchiveMember]] = {}
 
         self._load_definitions()
 
@@ -56,41 +84,277 @@ class FileRegistry:
         """
         Localiza un archivo específico.
         """
-        cached_location = self.index.get_file_location(file_key)
+        cached_location = self.index.get_file_location(file_key, periodo)
         if cached_location:
             return cached_location
 
+        found_file = self._search_locations(file_key, periodo)
+        if found_file:
+            self.index.register_file(file_key, found_file, periodo=periodo)
+        return found_file
+
+    def _locations(self, file_key: str) -> List[FileLocation]:
+        """
+        Crea las ubicaciones de la definición de un archivo.
+        """
         definition = self.definitions.get(file_key)
         if not definition:
-            return None
+            return []
+        return [
+            FileLocation(self.base_path, location_config)
+            for location_config in definition.locations
+        ]
+
+    def _search_locations(
+        self,
+        file_key: str,
+        periodo: str,
+        listings: Optional[Dict[Path, List[os.DirEntry]]] = None,
+    ) -> Optional[Path]:
+        """
+        Busca un archivo en las ubicaciones de su definición, sin usar el índice.
 
-        for location_config in definition.locations:
-            location = FileLocation(self.base_path, location_config)
+        Si se entregan los listados de los directorios (ver _scan_locations)
+        se buscan en ellos; si no, o si la ubicación busca en subdirectorios,
+        se usa glob.
+        """
+        for location in self._locations(file_key):
             try:
-                found_file = location.find_latest_file(
-                    periodo=periodo, path_variables=self.path_variables
-                )
+                entries = None
+                if listings is not None and not location.uses_subdirectories():
+                    entries = listings.get(
+                        location.get_absolute_path(
+                            periodo=periodo, path_variables=self.path_variables
+                        )
+                    )
+                if entries is not None:
+                    found_file = location.find_latest_in(
+                        entries, periodo=periodo, path_variables=self.path_variables
+                    )
+                else:
+                    found_file = location.find_latest_file(
+                        periodo=periodo, path_variables=self.path_variables
+                    )
                 if found_file:
-                    self.index.register_file(file_key, found_file)
                     return found_file
             except Exception:
                 continue
 
         return None
 
+    def locate_files(self, file_key: str, periodo: str) -> List[DatedFile]:
+        """
+        Localiza todos los archivos de una definición con cardinalidad many.
+
+        Cada directorio de ubicación se lista una sola vez; los archivos se
+        entregan ordenados por la fecha de su nombre.
+
+        Returns:
+            List[DatedFile]: Archivos encontrados con su fecha (vacía si no hay)
+        """
+        found_files: List[Path] = []
+        for location in self._locations(file_key):
+            try:
+                if location.uses_subdirectories():
+                    found_files.extend(
+                        location.find_matching_files(
+                            periodo=periodo, path_variables=self.path_variables
+                        )
+                    )
+                    continue
+                directory = location.get_absolute_path(
+                    periodo=periodo, path_variables=self.path_variables
+                )
+                found_files.extend(
+                    location.find_all_in(
+                        FileLocation.scan_directory(directory),
+                        periodo=periodo,
+                        path_variables=self.path_variables,
+                    )
+                )
+            except FileLocationError as e:
+                logger.warning(f"Error buscando archivos de {file_key}: {str(e)}")
+                continue
+
+        return sort_dated_files(found_files)
+
+    def _scan_locations(
+        self, keys: List[Tuple[str, str]], executor: Executor
+    ) -> Dict[Path, List[os.DirEntry]]:
+        """
+        Lista una sola vez cada directorio de las ubicaciones de un conjunto de
+        archivos.
+
+        Varias definiciones apuntan al mismo directorio (por ejemplo cmg y
+        factores_penalizacion en {bases}/03 Cmg); todas comparten el listado.
+
+        Args:
+            keys: Pares (tipo de archivo, periodo) a buscar
+            executor: Ejecutor donde listar los directorios en paralelo
+
+        Returns:
+            Dict[Path, List[os.DirEntry]]: Archivos de cada directorio
+        """
+        directories = set()
+        for file_key, periodo in keys:
+            for location in self._locations(file_key):
+                if location.uses_subdirectories():
+                    continue
+                try:
+                    directories.add(
+                        location.get_absolute_path(
+                            periodo=periodo, path_variables=self.path_variables
+                        )
+                    )
+                except FileLocationError:
+                    continue
+
+        def scan(directory: Path) -> Optional[List[os.DirEntry]]:
+            try:
+                return FileLocation.scan_directory(directory)
+            except FileLocationError as e:
+                logger.warning(str(e))
+                return None
+
+        directories = list(directories)
+        return {
+            directory: entries
+            for directory, entries in zip(directories, executor.map(scan, directories))
+            if entries is not None
+        }
+
+    def locate_range(
+        self, file_types: Optional[Iterable[str]], periods: Iterable[str]
+    ) -> Dict[str, Dict[str, Optional[Path]]]:
+        """
+        Localiza varios tipos de archivo en varios periodos a la vez.
+
+        Las entradas del índice se leen de una vez y se validan con stat en
+        paralelo. Para las que faltan o cambiaron, cada directorio se lista
+        una sola vez (en paralelo) y el listado se comparte entre todos los
+        patrones. El índice se actualiza al final desde el hilo principal.
+
+        Args:
+            file_types: Tipos de archivo a localizar (None localiza todos)
+            periods: Periodos a localizar (YYYYMM)
+
+        Returns:
+            Dict[str, Dict[str, Optional[Path]]]: Ubicación por periodo y tipo
+            de archivo
+        """
+        file_types = list(self.definitions if file_types is None else file_types)
+        periods = list(periods)
+        keys: List[Tuple[str, str]] = [
+            (file_key, periodo)
+            for periodo in periods
+            for file_key in file_types
+            if file_key in self.definitions
+        ]
+        entries = {key: self.index.get_entry(*key) for key in keys}
+
+        def is_current(key: Tuple[str, str]) -> bool:
+            return entries[key] is not None and FileIndex.matches_disk(entries[key])
+
+        with ThreadPoolExecutor(max_workers=self.locate_workers) as executor:
+            hits = [
+                key
+                for key, current in zip(keys, executor.map(is_current, keys))
+                if current
+            ]
+            cached = set(hits)
+            misses = [key for key in keys if key not in cached]
+            listings = self._scan_locations(misses, executor) if misses else {}
+
+        locations: Dict[str, Dict[str, Optional[Path]]] = {
+            periodo: {file_key: None for file_key in file_types} for periodo in periods
+        }
+        for file_key, periodo in hits:
+            locations[periodo][file_key] = Path(entries[(file_key, periodo)]["path"])
+        self.index.touch(hits)
+
+        for file_key, periodo in misses:
+            path = self._search_locations(file_key, periodo, listings)
+            locations[periodo][file_key] = path
+            if path is not None:
+                self.index.register_file(file_key, path, periodo=periodo)
+            elif entries[(file_key, periodo)] is not None:
+                self.index.remove(file_key, periodo)
+
+        return locations
+
+    def locate_archive_member(
+        self, file_key: str, periodo: str
+    ) -> Optional[ArchiveMember]:
+        """
+        Localiza un archivo dentro de los ZIP archivados del periodo.
+
+        Returns:
+            Optional[ArchiveMember]: Par (ZIP, miembro) o None si no se encuentra
+            o la lectura desde archivos ZIP está desactivada
+        """
+        if self.archive_reader is None or file_key not in self.definitions:
+            return None
+
+        cache_key = (file_key, periodo)
+        if cache_key not in self._archive_members:
+            if periodo not in self._member_filters:
+                self._member_filters[periodo] = MemberFilter.from_registry_config(
+                    self.config, periodo
+                )
+            member_filter = self._member_filters[periodo]
+            self._archive_members[cache_key] = self.archive_reader.find_member(
+                periodo, lambda name: member_filter.match(name) == file_key
+            )
+
+        return self._archive_members[cache_key]
+
+    def open_archive_member(self, member: ArchiveMember) -> ContextManager[IO[bytes]]:
+        """
+        Abre un miembro archivado como objeto de archivo con seek.
+        """
+        if self.archive_reader is None:
+            raise FileRegistryError("La lectura desde archivos ZIP está desactivada")
+        return self.archive_reader.open(member)
+
     def locate_all_files(self, periodo: str) -> Dict[str, Optional[Path]]:
         """
         Localiza todos los archivos configurados.
         """
-        locations: Dict[str, Optional[Path]] = {}
+        return self.locate_range(None, [periodo])[periodo]
 
-        for file_key in self.definitions:
-            locations[file_key] = self.locate_file(file_key, periodo)
+    def get_fingerprint(self, file_key: str, periodo: str) -> Optional[Dict]:
+        """
+        Obtiene la huella del contenido de un archivo localizado.
 
-        return locations
+        El hash completo se calcula la primera vez que se pide y queda
+        guardado en el índice (ver FileIndex.get_fingerprint).
+
+        Returns:
+            Optional[Dict]: Huella rápida ('quick') y hash BLAKE2b ('blake2b'),
+            o None si el archivo no está registrado o cambió
+        """
+        return self.index.get_fingerprint(file_key, periodo, wait=True)
 
-    def clear_cache(self) -> None:
+    def close(self) -> None:
+        """
+        Cierra el registro: guarda los usos y hashes pendientes del índice y
+        cierra su conexión.
+        """
+        self.index.close()
+
+    def clear_cache(self, periodo: Optional[str] = None) -> None:
         """
         Limpia el caché de archivos encontrados.
+
+        Args:
+            periodo: Periodo a limpiar (YYYYMM). None limpia el índice
+                persistente de todos los periodos, no solo el de la ejecución
         """
-        self.index.clear()
+        self.index.clear(periodo)
+        if periodo is None:
+            self._archive_members.clear()
+        else:
+            for cache_key in [
+                key for key in self._archive_members if key[1] == periodo
+            ]:
+                del self._archive_members[cache_key]
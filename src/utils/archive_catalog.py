@@ -0,0 +1,313 @@
+"""
+Catálogo persistente de los miembros de todos los ZIP del proyecto.
+Guarda en SQLite el contenido del directorio central de cada ZIP de raw/ y
+archive/, para poder ubicar archivos o comparar re-emisiones sin abrir ni
+recorrer los ZIP.
+"""
+
+import argparse
+import logging
+import os
+import sqlite3
+import zipfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .archive_store import OBJECTS_DIR, ArchiveStore
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS archives (
+    archive_path TEXT PRIMARY KEY,
+    periodo TEXT,
+    archive_name TEXT,
+    size INTEGER,
+    mtime REAL,
+    scanned_at TEXT
+);
+CREATE TABLE IF NOT EXISTS members (
+    archive_path TEXT,
+    periodo TEXT,
+    member TEXT,
+    member_name TEXT,
+    compressed_size INTEGER,
+    file_size INTEGER,
+    crc INTEGER,
+    PRIMARY KEY (archive_path, member)
+);
+CREATE INDEX IF NOT EXISTS idx_members_name ON members (member_name);
+CREATE INDEX IF NOT EXISTS idx_members_periodo ON members (periodo);
+"""
+
+
+class ArchiveCatalog:
+    """
+    Catálogo SQLite de miembros de ZIP.
+
+    Cada entrada registra periodo, ZIP, ruta del miembro, tamaños comprimido y
+    original, y CRC. El catálogo se actualiza de forma incremental: solo se
+    vuelve a leer un ZIP si cambió su tamaño o fecha de modificación, y solo
+    se lee su directorio central.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Inicializa el catálogo y crea el esquema si no existe.
+
+        Args:
+            db_path: Ruta al archivo SQLite
+        """
+        self.db_path = db_path
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Cierra la conexión al catálogo."""
+        self.connection.close()
+
+    def scan(self, base_path: str, periodo: Optional[str] = None) -> int:
+        """
+        Actualiza el catálogo con los ZIP de un directorio base (raw o archive).
+
+        Se espera la estructura `<base_path>/<periodo>/*.zip`; además se
+        catalogan los objetos del almacén referenciados por el índice de cada
+        periodo (ver ArchiveStore).
+
+        Args:
+            base_path: Directorio base a recorrer
+            periodo: Periodo a recorrer; si es None se recorren todos
+
+        Returns:
+            int: Cantidad de ZIP leídos (nuevos o modificados)
+        """
+        if not os.path.isdir(base_path):
+            return 0
+
+        periodos = [periodo] if periodo else sorted(os.listdir(base_path))
+        store = ArchiveStore(base_path)
+        scanned = 0
+
+        for current in periodos:
+            periodo_path = os.path.join(base_path, current)
+            if current == OBJECTS_DIR or not os.path.isdir(periodo_path):
+                continue
+            for name in sorted(os.listdir(periodo_path)):
+                if name.lower().endswith(".zip"):
+                    if self.add_archive(os.path.join(periodo_path, name), current):
+                        scanned += 1
+            # Las entradas más antiguas primero, para que el nombre registrado
+            # de un objeto repetido sea el de su archivado más reciente
+            for entry in reversed(store.entries(current)):
+                if os.path.exists(entry["path"]) and self.add_archive(
+                    entry["path"], current, entry["name"]
+                ):
+                    scanned += 1
+
+        self.remove_missing(base_path)
+        return scanned
+
+    def add_archive(
+        self, archive_path: str, periodo: str, archive_name: Optional[str] = None
+    ) -> bool:
+        """
+        Registra o actualiza un ZIP leyendo solo su directorio central.
+
+        Args:
+            archive_path: Ruta al archivo ZIP
+            periodo: Periodo al que pertenece el ZIP
+            archive_name: Nombre original del ZIP (por defecto, el de la ruta);
+                se usa para los objetos del almacén, nombrados por su digest
+
+        Returns:
+            bool: True si el ZIP fue leído; False si no cambió o no es válido
+        """
+        archive_path = os.path.abspath(archive_path)
+        stat = os.stat(archive_path)
+
+        row = self.connection.execute(
+            "SELECT size, mtime FROM archives WHERE archive_path = ?",
+            (archive_path,),
+        ).fetchone()
+        if row and row["size"] == stat.st_size and row["mtime"] == stat.st_mtime:
+            return False
+
+        try:
+            with zipfile.ZipFile(archive_path, "r") as zip_ref:
+                infos = [info for info in zip_ref.infolist() if not info.is_dir()]
+        except (zipfile.BadZipFile, OSError) as e:
+            logger.warning(f"No se pudo catalogar {archive_path}: {str(e)}")
+            return False
+
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM members WHERE archive_path = ?", (archive_path,)
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO archives VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    archive_path,
+                    periodo,
+                    archive_name or os.path.basename(archive_path),
+                    stat.st_size,
+                    stat.st_mtime,
+                    datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO members VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        archive_path,
+                        periodo,
+                        info.filename,
+                        info.filename.replace("\\", "/").rsplit("/", 1)[-1],
+                        info.compress_size,
+                        info.file_size,
+                        info.CRC,
+                    )
+                    for info in infos
+                ],
+            )
+
+        logger.debug(f"ZIP catalogado: {archive_path} ({len(infos)} miembros)")
+        return True
+
+    def remove_missing(self, base_path: str) -> int:
+        """
+        Elimina del catálogo los ZIP bajo un directorio que ya no existen.
+
+        Args:
+            base_path: Directorio base (raw o archive)
+
+        Returns:
+            int: Cantidad de ZIP eliminados del catálogo
+        """
+        prefix = os.path.join(os.path.abspath(base_path), "")
+        rows = self.connection.execute(
+            "SELECT archive_path FROM archives WHERE substr(archive_path, 1, ?) = ?",
+            (len(prefix), prefix),
+        ).fetchall()
+        missing = [row["archive_path"] for row in rows]
+        missing = [path for path in missing if not os.path.exists(path)]
+
+        with self.connection:
+            for path in missing:
+                self.connection.execute(
+                    "DELETE FROM members WHERE archive_path = ?", (path,)
+                )
+                self.connection.execute(
+                    "DELETE FROM archives WHERE archive_path = ?", (path,)
+                )
+        return len(missing)
+
+    def find(self, name_pattern: str, periodo: Optional[str] = None) -> List[Dict]:
+        """
+        Busca miembros por nombre de archivo (admite comodines * y ?).
+
+        Args:
+            name_pattern: Nombre o patrón del archivo, sin carpetas
+            periodo: Periodo opcional para acotar la búsqueda
+
+        Returns:
+            List[Dict]: Miembros encontrados, del ZIP más reciente al más antiguo
+        """
+        query = (
+            "SELECT m.*, a.mtime AS archive_mtime FROM members m "
+            "JOIN archives a ON a.archive_path = m.archive_path "
+            "WHERE m.member_name GLOB ?"
+        )
+        params: list = [name_pattern]
+        if periodo:
+            query += " AND m.periodo = ?"
+            params.append(periodo)
+        query += " ORDER BY a.mtime DESC"
+
+        return [dict(row) for row in self.connection.execute(query, params)]
+
+    def list_members(self, periodo: str, base_path: Optional[str] = None) -> List[Dict]:
+        """
+        Lista los miembros catalogados de un periodo.
+
+        Args:
+            periodo: Periodo en formato YYYYMM
+            base_path: Directorio base opcional (raw o archive) para acotar
+
+        Returns:
+            List[Dict]: Miembros, del ZIP más reciente al más antiguo
+        """
+        query = (
+            "SELECT m.*, a.mtime AS archive_mtime FROM members m "
+            "JOIN archives a ON a.archive_path = m.archive_path "
+            "WHERE m.periodo = ?"
+        )
+        params: list = [periodo]
+        if base_path:
+            prefix = os.path.join(os.path.abspath(base_path), "")
+            query += " AND substr(m.archive_path, 1, ?) = ?"
+            params.extend([len(prefix), prefix])
+        query += " ORDER BY a.mtime DESC"
+
+        return [dict(row) for row in self.connection.execute(query, params)]
+
+    def diff(self, archive_a: str, archive_b: str) -> Dict[str, List[str]]:
+        """
+        Compara el contenido de dos ZIP catalogados (por ejemplo, re-emisiones).
+
+        Args:
+            archive_a: Ruta del ZIP anterior
+            archive_b: Ruta del ZIP nuevo
+
+        Returns:
+            Dict[str, List[str]]: Miembros agregados, eliminados y modificados
+        """
+
+        def members_of(path: str) -> Dict[str, tuple]:
+            rows = self.connection.execute(
+                "SELECT member, file_size, crc FROM members WHERE archive_path = ?",
+                (os.path.abspath(path),),
+            )
+            return {row["member"]: (row["file_size"], row["crc"]) for row in rows}
+
+        before = members_of(archive_a)
+        after = members_of(archive_b)
+
+        return {
+            "added": sorted(set(after) - set(before)),
+            "removed": sorted(set(before) - set(after)),
+            "changed": sorted(
+                name for name in set(before) & set(after) if before[name] != after[name]
+            ),
+        }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Consulta el catálogo de ZIPs")
+    parser.add_argument("db_path", help="Ruta al catálogo SQLite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    find_parser = subparsers.add_parser("find", help="Ubicar un archivo")
+    find_parser.add_argument("pattern", help="Nombre o patrón del archivo")
+    find_parser.add_argument("--periodo", help="Periodo (YYYYMM)")
+
+    diff_parser = subparsers.add_parser("diff", help="Comparar dos ZIP")
+    diff_parser.add_argument("archive_a")
+    diff_parser.add_argument("archive_b")
+
+    args = parser.parse_args()
+    catalog = ArchiveCatalog(args.db_path)
+
+    if args.command == "find":
+        for entry in catalog.find(args.pattern, args.periodo):
+            print(f"{entry['periodo']}  {entry['archive_path']}  {entry['member']}")
+    else:
+        for change, members in catalog.diff(args.archive_a, args.archive_b).items():
+            for member in members:
+                print(f"{change:8} {member}")
+
+    catalog.close()
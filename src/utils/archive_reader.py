@@ -0,0 +1,258 @@
+"""
+Lectura de archivos directamente desde los ZIP archivados.
+Permite que los lectores de datos abran un miembro de un ZIP (incluso dentro de
+un ZIP anidado) como un objeto de archivo con seek, sin extraerlo a disco.
+"""
+
+import io
+import logging
+import os
+import zipfile
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import IO, Callable, Iterator, List, Optional, Tuple
+
+from .archive_catalog import ArchiveCatalog
+from .archive_store import ArchiveStore
+
+logger = logging.getLogger(__name__)
+
+# Formatos que requieren acceso aleatorio intensivo (Excel es un ZIP)
+RANDOM_ACCESS_FORMATS = (".xlsx", ".xlsm", ".xlsb", ".xls", ".zip")
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """
+    Referencia a un miembro dentro de un ZIP archivado.
+
+    `members` contiene la cadena de nombres desde el ZIP exterior: todos salvo
+    el último son ZIP anidados.
+    """
+
+    archive_path: str
+    members: Tuple[str, ...]
+
+    @property
+    def name(self) -> str:
+        """Nombre del archivo referenciado, sin carpetas."""
+        return self.members[-1].replace("\\", "/").rsplit("/", 1)[-1]
+
+    def __str__(self) -> str:
+        """Representación legible de la referencia."""
+        return f"{self.archive_path}!" + "!".join(self.members)
+
+
+class ArchiveReader:
+    """
+    Capa de lectura sobre los ZIP archivados de cada periodo.
+
+    Resuelve miembros a partir de un criterio de coincidencia y los abre como
+    objetos de archivo con seek, sin copias intermedias en disco.
+    """
+
+    def __init__(
+        self,
+        archive_path: str,
+        nested_depth: int = 3,
+        spool_size: int = 64 * 1024 * 1024,
+        catalog_path: Optional[str] = None,
+    ):
+        """
+        Inicializa el lector de ZIPs archivados.
+
+        Args:
+            archive_path: Ruta donde se archivan los ZIP (archive/<periodo>)
+            nested_depth: Niveles de ZIP anidados en los que se busca
+            spool_size: Tamaño máximo (bytes) de un miembro que se carga en
+                memoria; los mayores se leen desde el flujo del ZIP
+            catalog_path: Ruta opcional al catálogo SQLite de miembros; si se
+                indica, los miembros de primer nivel se buscan sin abrir los ZIP
+        """
+        self.archive_path = archive_path
+        self.nested_depth = nested_depth
+        self.spool_size = spool_size
+        self.catalog_path = catalog_path
+        self.store = ArchiveStore(archive_path)
+
+    def list_archives(self, periodo: str) -> List[str]:
+        """
+        Lista los ZIP archivados de un periodo, del más reciente al más antiguo.
+
+        Incluye los objetos del almacén referenciados por el índice del periodo
+        (cada contenido una sola vez) y los ZIP archivados con el esquema
+        anterior, directamente en archive/<periodo>.
+
+        Args:
+            periodo: Periodo en formato YYYYMM
+
+        Returns:
+            List[str]: Rutas a los ZIP archivados
+        """
+        archives = []
+        for entry in self.store.entries(periodo):
+            if entry["path"] not in archives and os.path.exists(entry["path"]):
+                archives.append(entry["path"])
+
+        periodo_path = os.path.join(self.archive_path, periodo)
+        if os.path.isdir(periodo_path):
+            legacy = [
+                os.path.join(periodo_path, name)
+                for name in os.listdir(periodo_path)
+                if name.lower().endswith(".zip")
+            ]
+            archives.extend(sorted(legacy, key=os.path.getmtime, reverse=True))
+
+        return archives
+
+    def find_member(
+        self, periodo: str, matcher: Callable[[str], bool]
+    ) -> Optional[ArchiveMember]:
+        """
+        Busca el primer miembro que cumpla el criterio en los ZIP del periodo.
+
+        Primero revisa el directorio central de cada ZIP (o el catálogo, si
+        está configurado) y solo después desciende en los ZIP anidados, que
+        requieren descomprimirse.
+
+        Args:
+            periodo: Periodo en formato YYYYMM
+            matcher: Función que recibe el nombre del miembro y retorna True
+                si corresponde al archivo buscado
+
+        Returns:
+            Optional[ArchiveMember]: Referencia al miembro o None
+        """
+        archives = self.list_archives(periodo)
+        first_depth = 0
+
+        if self.catalog_path:
+            found = self._find_in_catalog(periodo, matcher)
+            if found:
+                return found
+            first_depth = 1
+
+        for depth in range(first_depth, self.nested_depth + 1):
+            for archive in archives:
+                try:
+                    with zipfile.ZipFile(archive, "r") as zip_ref:
+                        found = self._find_in_zip(zip_ref, matcher, depth, ())
+                except (zipfile.BadZipFile, NotImplementedError, OSError) as e:
+                    logger.warning(f"No se pudo leer {archive}: {str(e)}")
+                    continue
+                if found:
+                    return ArchiveMember(archive, found)
+
+        return None
+
+    def _find_in_catalog(
+        self, periodo: str, matcher: Callable[[str], bool]
+    ) -> Optional[ArchiveMember]:
+        """
+        Busca un miembro de primer nivel en el catálogo de ZIPs.
+
+        Args:
+            periodo: Periodo en formato YYYYMM
+            matcher: Criterio de coincidencia sobre el nombre del miembro
+
+        Returns:
+            Optional[ArchiveMember]: Referencia al miembro o None
+        """
+        catalog = ArchiveCatalog(self.catalog_path)
+        try:
+            catalog.scan(self.archive_path, periodo)
+            for entry in catalog.list_members(periodo, self.archive_path):
+                if matcher(entry["member"]):
+                    return ArchiveMember(entry["archive_path"], (entry["member"],))
+        finally:
+            catalog.close()
+        return None
+
+    def _find_in_zip(
+        self,
+        zip_ref: zipfile.ZipFile,
+        matcher: Callable[[str], bool],
+        depth: int,
+        parents: Tuple[str, ...],
+    ) -> Optional[Tuple[str, ...]]:
+        """
+        Busca un miembro exactamente `depth` niveles de ZIP anidado más abajo.
+
+        Args:
+            zip_ref: ZIP abierto
+            matcher: Criterio de coincidencia sobre el nombre del miembro
+            depth: Niveles de anidamiento restantes
+            parents: Cadena de ZIP anidados recorrida hasta ahora
+
+        Returns:
+            Optional[Tuple[str, ...]]: Cadena de miembros o None
+        """
+        infos = [info for info in zip_ref.infolist() if not info.is_dir()]
+
+        if depth == 0:
+            for info in infos:
+                if matcher(info.filename):
+                    return parents + (info.filename,)
+            return None
+
+        for info in infos:
+            if not info.filename.lower().endswith(".zip"):
+                continue
+            with ExitStack() as stack:
+                nested_ref = self._open_nested(stack, zip_ref, info)
+                found = self._find_in_zip(
+                    nested_ref, matcher, depth - 1, parents + (info.filename,)
+                )
+            if found:
+                return found
+        return None
+
+    def _open_nested(
+        self, stack: ExitStack, zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo
+    ) -> zipfile.ZipFile:
+        """
+        Abre un ZIP anidado desde el flujo de su contenedor.
+
+        Args:
+            stack: Pila donde registrar los recursos abiertos
+            zip_ref: ZIP contenedor abierto
+            info: Miembro correspondiente al ZIP anidado
+
+        Returns:
+            zipfile.ZipFile: ZIP anidado abierto
+        """
+        stream = stack.enter_context(zip_ref.open(info))
+        if info.file_size <= self.spool_size:
+            stream = io.BytesIO(stream.read())
+        return stack.enter_context(zipfile.ZipFile(stream, "r"))
+
+    @contextmanager
+    def open(self, member: ArchiveMember) -> Iterator[IO[bytes]]:
+        """
+        Abre un miembro archivado como objeto de archivo con seek.
+
+        Los miembros pequeños y los formatos que requieren acceso aleatorio
+        (Excel) se cargan en memoria; los demás se leen en flujo desde el ZIP.
+
+        Args:
+            member: Referencia al miembro
+
+        Yields:
+            IO[bytes]: Objeto de archivo binario con seek
+        """
+        with ExitStack() as stack:
+            zip_ref = stack.enter_context(zipfile.ZipFile(member.archive_path, "r"))
+            for nested_name in member.members[:-1]:
+                zip_ref = self._open_nested(
+                    stack, zip_ref, zip_ref.getinfo(nested_name)
+                )
+
+            info = zip_ref.getinfo(member.members[-1])
+            stream = stack.enter_context(zip_ref.open(info))
+            if info.file_size <= self.spool_size or member.name.lower().endswith(
+                RANDOM_ACCESS_FORMATS
+            ):
+                stream = io.BytesIO(stream.read())
+
+            logger.debug(f"Leyendo desde archivo ZIP: {member}")
+            yield stream
@@ -0,0 +1,194 @@
+"""
+Almacén de ZIP archivados direccionado por contenido.
+Cada ZIP se guarda una sola vez como `archive/objects/<aa>/<sha256>.zip` y cada
+periodo mantiene un índice (`archive/<periodo>/index.json`) con las entradas que
+apuntan a esos objetos. Las re-descargas y re-emisiones idénticas no ocupan
+espacio adicional.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OBJECTS_DIR = "objects"
+INDEX_NAME = "index.json"
+
+
+def file_digest(path: str, buffer_size: int = 1024 * 1024) -> str:
+    """
+    Calcula el digest SHA-256 del contenido completo de un archivo.
+
+    Args:
+        path: Ruta al archivo
+        buffer_size: Tamaño del buffer de lectura en bytes
+
+    Returns:
+        str: Digest en hexadecimal
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(buffer_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArchiveStore:
+    """
+    Almacén de ZIP direccionado por contenido.
+
+    - Los objetos se nombran por el SHA-256 de su contenido, por lo que saber
+      si un ZIP idéntico ya fue archivado es una verificación de existencia.
+    - El índice de cada periodo registra nombre original, digest, tamaño y
+      fecha de archivado de cada ZIP procesado, incluidas las re-emisiones.
+    """
+
+    def __init__(self, archive_path: str):
+        """
+        Inicializa el almacén.
+
+        Args:
+            archive_path: Directorio base de archivo (archive/)
+        """
+        self.archive_path = archive_path
+        self.objects_path = os.path.join(archive_path, OBJECTS_DIR)
+
+    def object_path(self, digest: str) -> str:
+        """
+        Obtiene la ruta del objeto correspondiente a un digest.
+
+        Args:
+            digest: SHA-256 del contenido en hexadecimal
+
+        Returns:
+            str: Ruta del objeto (exista o no)
+        """
+        return os.path.join(self.objects_path, digest[:2], f"{digest}.zip")
+
+    def contains(self, digest: str) -> bool:
+        """
+        Indica si ya existe un objeto con el digest indicado.
+
+        Args:
+            digest: SHA-256 del contenido en hexadecimal
+
+        Returns:
+            bool: True si el contenido ya está archivado
+        """
+        return os.path.exists(self.object_path(digest))
+
+    def index_path(self, periodo: str) -> str:
+        """
+        Obtiene la ruta del índice de un periodo.
+
+        Args:
+            periodo: Periodo en formato YYYYMM
+
+        Returns:
+            str: Ruta al archivo index.json del periodo
+        """
+        return os.path.join(self.archive_path, periodo, INDEX_NAME)
+
+    def entries(self, periodo: str) -> List[Dict]:
+        """
+        Lista las entradas del índice de un periodo, de la más reciente a la
+        más antigua.
+
+        Args:
+            periodo: Periodo en formato YYYYMM
+
+        Returns:
+            List[Dict]: Entradas con name, digest, size, archived_at y path
+        """
+        index_path = self.index_path(periodo)
+        if not os.path.exists(index_path):
+            return []
+
+        try:
+            with open(index_path, "r", encoding="utf-8") as file:
+                entries = json.load(file).get("archives", [])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Índice de archivo inválido, se ignora: {str(e)}")
+            return []
+
+        for entry in entries:
+            entry["path"] = self.object_path(entry["digest"])
+        return sorted(entries, key=lambda entry: entry["archived_at"], reverse=True)
+
+    def find(self, periodo: str, digest: str) -> Optional[Dict]:
+        """
+        Busca en el índice del periodo la entrada más reciente con un digest.
+
+        Args:
+            periodo: Periodo en formato YYYYMM
+            digest: SHA-256 del contenido en hexadecimal
+
+        Returns:
+            Optional[Dict]: Entrada encontrada o None
+        """
+        for entry in self.entries(periodo):
+            if entry["digest"] == digest:
+                return entry
+        return None
+
+    def add(self, periodo: str, source_path: str) -> Dict:
+        """
+        Archiva un ZIP: lo mueve al almacén (o lo elimina si el contenido ya
+        estaba archivado) y agrega la entrada al índice del periodo.
+
+        Args:
+            periodo: Periodo en formato YYYYMM
+            source_path: Ruta del ZIP a archivar
+
+        Returns:
+            Dict: Entrada registrada, con la clave adicional `duplicate`
+        """
+        size = os.path.getsize(source_path)
+        digest = file_digest(source_path)
+        object_path = self.object_path(digest)
+        duplicate = os.path.exists(object_path)
+
+        if duplicate:
+            os.remove(source_path)
+        else:
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            temp_path = f"{object_path}.tmp"
+            shutil.move(source_path, temp_path)
+            os.replace(temp_path, object_path)
+
+        entry = {
+            "name": os.path.basename(source_path),
+            "digest": digest,
+            "size": size,
+            "archived_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._append_entry(periodo, entry)
+
+        return {**entry, "path": object_path, "duplicate": duplicate}
+
+    def _append_entry(self, periodo: str, entry: Dict) -> None:
+        """
+        Agrega una entrada al índice del periodo y lo guarda de forma atómica.
+
+        Args:
+            periodo: Periodo en formato YYYYMM
+            entry: Entrada a agregar
+        """
+        index_path = self.index_path(periodo)
+        entries = [
+            {key: value for key, value in item.items() if key != "path"}
+            for item in self.entries(periodo)
+        ]
+        entries.append(entry)
+        entries.sort(key=lambda item: item["archived_at"])
+
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        temp_path = f"{index_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"archives": entries}, file, indent=2, ensure_ascii=False)
+        os.replace(temp_path, index_path)
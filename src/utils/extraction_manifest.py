@@ -0,0 +1,206 @@
+"""
+Manifiesto de extracción de archivos ZIP.
+Registra, por periodo, la firma de cada ZIP extraído y los miembros que dejó en
+disco, de modo que una nueva ejecución pueda omitir los ZIP que no cambiaron.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import zipfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import py7zr
+
+from .integrity import member_path, verify_members
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".extraction_manifest.json"
+
+
+def archive_signature(zip_path: str, settings: Optional[Dict] = None) -> Dict:
+    """
+    Calcula la firma de un archivo ZIP.
+
+    La firma incluye tamaño, fecha de modificación y un digest SHA-256 del
+    directorio central (del archivo completo para los 7z), que cambia si cambia
+    cualquier miembro del ZIP, y la configuración de extracción que decide qué
+    miembros se escriben.
+
+    Args:
+        zip_path: Ruta al archivo ZIP
+        settings: Configuración de extracción (filtro de miembros, extracción
+            directa, ZIP anidados, compresión en reposo); un cambio obliga a
+            volver a extraer el ZIP
+
+    Returns:
+        Dict: Firma con las claves size, mtime, digest y settings
+
+    Raises:
+        zipfile.BadZipFile: Si el archivo no tiene un directorio central válido
+            ni es un 7z
+    """
+    stat = os.stat(zip_path)
+    if py7zr.is_7zfile(zip_path):
+        # Los 7z no tienen directorio central al final: se resume el archivo completo
+        start_dir = 0
+    else:
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            start_dir = zip_ref.start_dir
+
+    digest = hashlib.sha256()
+    with open(zip_path, "rb") as file:
+        file.seek(start_dir)
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    return {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "digest": digest.hexdigest(),
+        "settings": settings or {},
+    }
+
+
+class ExtractionManifest:
+    """
+    Manifiesto persistente de las extracciones de un periodo.
+
+    Se guarda como JSON en `unzipped/<periodo>/.extraction_manifest.json`.
+    Cada entrada corresponde a un ZIP e incluye su firma y los miembros
+    extraídos (ruta relativa al directorio del periodo, o absoluta si se
+    escribieron fuera de él, con el CRC-32 del ZIP y el tamaño en disco).
+    """
+
+    def __init__(self, period_path: str):
+        """
+        Inicializa el manifiesto y carga su contenido si existe.
+
+        Args:
+            period_path: Directorio unzipped del periodo
+        """
+        self.period_path = period_path
+        self.manifest_path = os.path.join(period_path, MANIFEST_NAME)
+        self.archives: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        """
+        Carga el manifiesto desde disco.
+        """
+        if not os.path.exists(self.manifest_path):
+            return
+
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as file:
+                self.archives = json.load(file).get("archives", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Manifiesto de extracción inválido, se ignora: {str(e)}")
+            self.archives = {}
+
+    def save(self) -> None:
+        """
+        Guarda el manifiesto en disco de forma atómica.
+        """
+        os.makedirs(self.period_path, exist_ok=True)
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"archives": self.archives}, file, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.manifest_path)
+
+    def record(
+        self, zip_name: str, signature: Dict, members: Dict[str, List[int]]
+    ) -> None:
+        """
+        Registra la extracción exitosa de un ZIP.
+
+        Args:
+            zip_name: Nombre del archivo ZIP
+            signature: Firma del ZIP (ver archive_signature)
+            members: Miembros extraídos {ruta relativa o absoluta: [crc, tamaño
+                en disco]}
+        """
+        self.archives[zip_name] = {
+            **signature,
+            "members": members,
+            "extracted_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def discard(self, zip_name: str) -> None:
+        """
+        Elimina la entrada de un ZIP, por ejemplo tras una extracción fallida.
+
+        Args:
+            zip_name: Nombre del archivo ZIP
+        """
+        self.archives.pop(zip_name, None)
+
+    def get_members(self, zip_name: str) -> Dict[str, List[Optional[int]]]:
+        """
+        Obtiene los miembros registrados para un ZIP.
+
+        Args:
+            zip_name: Nombre del archivo ZIP
+
+        Returns:
+            Dict[str, List[Optional[int]]]: Miembros {ruta relativa o absoluta:
+            [crc, tamaño]}; el CRC es None en las entradas que solo guardaban
+            el tamaño
+        """
+        members = self.archives.get(zip_name, {}).get("members", {})
+        return {
+            path: list(value) if isinstance(value, list) else [None, value]
+            for path, value in members.items()
+        }
+
+    def is_unchanged(
+        self, zip_name: str, signature: Optional[Dict], verify_workers: int = 0
+    ) -> bool:
+        """
+        Indica si un ZIP ya fue extraído y sus archivos siguen intactos en disco.
+
+        Un ZIP se considera sin cambios si su digest, tamaño y configuración
+        de extracción coinciden con el manifiesto y todos sus miembros existen
+        con el tamaño registrado. Con verify_workers > 0 se compara además el
+        CRC-32 de cada archivo en disco con el registrado, en paralelo.
+
+        Args:
+            zip_name: Nombre del archivo ZIP
+            signature: Firma actual del ZIP
+            verify_workers: Hilos para comparar los CRC (0 compara solo tamaños)
+
+        Returns:
+            bool: True si se puede omitir la extracción
+        """
+        entry = self.archives.get(zip_name)
+        if not entry or not signature:
+            return False
+        if (
+            entry.get("digest") != signature["digest"]
+            or entry.get("size") != signature["size"]
+            or entry.get("settings", {}) != signature.get("settings", {})
+        ):
+            return False
+
+        members = self.get_members(zip_name)
+        for key, (_, size) in members.items():
+            # Los miembros escritos fuera del periodo (extracción directa) se
+            # registran con su ruta absoluta
+            try:
+                if os.stat(member_path(self.period_path, key)).st_size != size:
+                    return False
+            except OSError:
+                return False
+
+        if verify_workers <= 0:
+            return True
+        if any(crc is None for crc, _ in members.values()):
+            # Entrada sin CRC: se vuelve a extraer para registrarlo
+            return False
+        problems = verify_members(self.period_path, members, verify_workers)
+        for problem in problems:
+            logger.info(f"{zip_name} cambió en disco: {problem}")
+        return not problems
@@ -0,0 +1,180 @@
+"""
+Métricas de rendimiento de la extracción de archivos ZIP.
+Genera registros por ZIP y por miembro (tiempo, bytes, razón de compresión,
+MB/s, uso del motor de respaldo y nivel de anidamiento) y los escribe en un
+archivo JSON Lines por ejecución.
+"""
+
+import json
+import logging
+import os
+import zipfile
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _throughput(bytes_count: int, seconds: float) -> Optional[float]:
+    """
+    Calcula el rendimiento en MB/s.
+
+    Args:
+        bytes_count: Bytes procesados
+        seconds: Tiempo transcurrido en segundos
+
+    Returns:
+        Optional[float]: MB/s o None si el tiempo es nulo
+    """
+    if seconds <= 0:
+        return None
+    return round(bytes_count / 1024**2 / seconds, 2)
+
+
+def _ratio(uncompressed: int, compressed: int) -> Optional[float]:
+    """
+    Calcula la razón de compresión (tamaño original / tamaño comprimido).
+
+    Args:
+        uncompressed: Bytes descomprimidos
+        compressed: Bytes comprimidos
+
+    Returns:
+        Optional[float]: Razón de compresión o None si no hay datos comprimidos
+    """
+    if compressed <= 0:
+        return None
+    return round(uncompressed / compressed, 2)
+
+
+def member_record(
+    zip_name: str,
+    info: zipfile.ZipInfo,
+    seconds: float,
+    written: int,
+    depth: int = 0,
+    fallback: bool = False,
+) -> Dict:
+    """
+    Construye el registro de métricas de un miembro extraído.
+
+    Args:
+        zip_name: Nombre del ZIP de primer nivel
+        info: Miembro extraído
+        seconds: Tiempo de extracción del miembro en segundos
+        written: Bytes escritos en disco
+        depth: Nivel de anidamiento (0 = miembro del ZIP de primer nivel)
+        fallback: True si se extrajo con el motor de respaldo
+
+    Returns:
+        Dict: Registro del miembro
+    """
+    return {
+        "record": "member",
+        "zip": zip_name,
+        "member": info.filename,
+        "depth": depth,
+        "fallback": fallback,
+        "seconds": round(seconds, 4),
+        "bytes_read": info.compress_size,
+        "bytes_uncompressed": info.file_size,
+        "bytes_written": written,
+        "ratio": _ratio(info.file_size, info.compress_size),
+        "mb_s": _throughput(info.file_size, seconds),
+    }
+
+
+def archive_record(result) -> Dict:
+    """
+    Construye el registro de métricas de un ZIP a partir de su resultado.
+
+    La comparación entre `cpu_seconds` y `seconds` permite distinguir una
+    extracción limitada por la descompresión (CPU) de una limitada por la
+    escritura a disco.
+
+    Args:
+        result: Resultado de la extracción (ExtractionResult)
+
+    Returns:
+        Dict: Registro del ZIP
+    """
+    members = result.member_metrics
+    bytes_read = sum(member["bytes_read"] for member in members)
+    uncompressed = sum(member["bytes_uncompressed"] for member in members)
+    written = sum(member["bytes_written"] for member in members)
+
+    return {
+        "record": "archive",
+        "zip": result.zip_name,
+        "success": result.success,
+        "unchanged": result.unchanged,
+        "depth": result.depth,
+        "fallback": result.fallback,
+        "seconds": round(result.duration, 4),
+        "cpu_seconds": round(result.cpu_seconds, 4),
+        "archive_bytes": result.archive_bytes,
+        "members": len(members),
+        "nested_archives": result.nested_archives,
+        "bytes_read": bytes_read,
+        "bytes_uncompressed": uncompressed,
+        "bytes_written": written,
+        "ratio": _ratio(uncompressed, bytes_read),
+        "mb_s": _throughput(uncompressed, result.duration),
+        "error": result.error,
+    }
+
+
+class MetricsWriter:
+    """
+    Escritor del archivo de métricas de una ejecución (JSON Lines).
+
+    Cada línea es un registro independiente ("archive" o "member"), por lo
+    que el archivo se puede leer mientras la ejecución continúa.
+    """
+
+    def __init__(self, path: str):
+        """
+        Inicializa el escritor.
+
+        Args:
+            path: Ruta del archivo de métricas
+        """
+        self.path = path
+
+    @staticmethod
+    def run_path(logs_path: str) -> str:
+        """
+        Genera la ruta del archivo de métricas para una nueva ejecución.
+
+        Args:
+            logs_path: Directorio de logs
+
+        Returns:
+            str: Ruta logs/extraction_metrics_<timestamp>.jsonl
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return os.path.join(logs_path, f"extraction_metrics_{timestamp}.jsonl")
+
+    def write(self, records: Iterable[Dict]) -> None:
+        """
+        Agrega registros al archivo de métricas.
+
+        Args:
+            records: Registros a escribir
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def write_result(self, result) -> None:
+        """
+        Escribe el registro de un ZIP seguido de los de sus miembros.
+
+        Args:
+            result: Resultado de la extracción (ExtractionResult)
+        """
+        try:
+            self.write([archive_record(result), *result.member_metrics])
+        except OSError as e:
+            logger.warning(f"No se pudieron escribir las métricas: {str(e)}")
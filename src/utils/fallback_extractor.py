@@ -0,0 +1,283 @@
+"""
+Motor de extracción de respaldo para los ZIP que zipfile no puede procesar.
+Reemplaza la llamada a 7z.exe: descomprime en el mismo proceso los miembros
+Deflate64 (con inflate64) y los archivos 7z (con py7zr), escribiendo a disco en
+flujo con buffers grandes.
+"""
+
+import logging
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from typing import IO, Callable, List, Optional, Union
+
+import inflate64
+import py7zr
+
+from .integrity import IntegrityError
+from .io_engine import member_target_path
+
+logger = logging.getLogger(__name__)
+
+# Método de compresión Deflate64 según la especificación ZIP (APPNOTE 4.4.5)
+ZIP_DEFLATE64 = 9
+
+# Cabecera local de un miembro: firma, versión, flags, método, hora, fecha,
+# CRC, tamaño comprimido, tamaño original, largo del nombre y del campo extra
+LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+
+class FallbackExtractor:
+    """
+    Extrae en proceso los archivos que zipfile no soporta.
+
+    - Miembros ZIP comprimidos con Deflate64: se leen en bruto desde la cabecera
+      local y se descomprimen con inflate64, verificando el CRC-32.
+    - Miembros ZIP con métodos soportados: se copian con zipfile, que también
+      verifica el CRC-32.
+    - Archivos 7z (por ejemplo, con extensión .zip): se extraen con py7zr,
+      que comprueba el CRC de cada miembro al descomprimirlo.
+    """
+
+    def __init__(self, buffer_size: int = 4 * 1024 * 1024):
+        """
+        Inicializa el motor de respaldo.
+
+        Args:
+            buffer_size: Tamaño del buffer de lectura/escritura en bytes
+        """
+        self.buffer_size = buffer_size
+
+    @staticmethod
+    def is_7z(source: Union[str, IO[bytes]]) -> bool:
+        """
+        Indica si un archivo se extrae como 7z.
+
+        Args:
+            source: Ruta al archivo u objeto de archivo (ZIP anidado)
+
+        Returns:
+            bool: True si es una ruta a un archivo 7z
+        """
+        return isinstance(source, str) and py7zr.is_7zfile(source)
+
+    def extract(
+        self,
+        source: Union[str, IO[bytes]],
+        extract_path: str,
+        accepts: Optional[Callable[[str], bool]] = None,
+        on_member: Optional[Callable[[zipfile.ZipInfo, float, str], None]] = None,
+        target_path: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> List[zipfile.ZipInfo]:
+        """
+        Extrae un archivo ZIP o 7z.
+
+        Args:
+            source: Ruta al archivo o objeto de archivo con seek (ZIP anidado)
+            extract_path: Ruta donde extraer los archivos
+            accepts: Función opcional que indica si un miembro debe extraerse
+            on_member: Función opcional invocada tras extraer cada miembro ZIP,
+                con el miembro, los segundos empleados y la ruta escrita
+            target_path: Función opcional que calcula la ruta de cada miembro
+                (None si se omite); por defecto, dentro de extract_path
+
+        Returns:
+            List[zipfile.ZipInfo]: Miembros extraídos (para archivos 7z, con el
+            nombre, tamaño y CRC de su listado)
+
+        Raises:
+            zipfile.BadZipFile: Si el archivo no es un ZIP ni un 7z válido
+            NotImplementedError: Si un miembro usa un método no soportado
+            py7zr.exceptions.CrcError: Si un miembro 7z no coincide con su CRC
+        """
+        if self.is_7z(source):
+            return self._extract_7z(source, extract_path, accepts, target_path)
+
+        extracted = []
+        with zipfile.ZipFile(source, "r") as zip_ref:
+            raw_source = open(source, "rb") if isinstance(source, str) else source
+            try:
+                for info in zip_ref.infolist():
+                    if info.is_dir():
+                        continue
+                    if accepts is not None and not accepts(info.filename):
+                        continue
+
+                    if target_path is not None:
+                        target = target_path(info.filename)
+                        if target is None:
+                            continue
+                    else:
+                        target = member_target_path(extract_path, info.filename)
+                        if target is None:
+                            logger.warning(
+                                f"Miembro con ruta inválida: {info.filename}"
+                            )
+                            continue
+
+                    start_time = time.perf_counter()
+                    self.extract_member(zip_ref, raw_source, info, target)
+                    extracted.append(info)
+                    if on_member is not None:
+                        on_member(info, time.perf_counter() - start_time, target)
+            finally:
+                if raw_source is not source:
+                    raw_source.close()
+
+        return extracted
+
+    def extract_member(
+        self,
+        zip_ref: zipfile.ZipFile,
+        raw_source: IO[bytes],
+        info: zipfile.ZipInfo,
+        target: str,
+    ) -> None:
+        """
+        Extrae un miembro de un ZIP en la ruta indicada.
+
+        Args:
+            zip_ref: ZIP abierto (para los métodos soportados por zipfile)
+            raw_source: Objeto de archivo con los bytes del ZIP (para Deflate64)
+            info: Miembro a extraer
+            target: Ruta de destino
+
+        Raises:
+            IntegrityError: Si los datos del miembro no coinciden con su CRC-32
+        """
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        if info.compress_type != ZIP_DEFLATE64:
+            with zip_ref.open(info) as src, open(target, "wb") as dst:
+                try:
+                    shutil.copyfileobj(src, dst, self.buffer_size)
+                except zipfile.BadZipFile as e:
+                    # zipfile compara el CRC-32 al terminar de leer el miembro
+                    raise IntegrityError(f"{info.filename}: {str(e)}") from e
+            return
+
+        if info.flag_bits & 0x1:
+            raise NotImplementedError(
+                f"Miembro Deflate64 cifrado no soportado: {info.filename}"
+            )
+
+        # Saltar la cabecera local para llegar a los datos comprimidos
+        raw_source.seek(info.header_offset)
+        header = raw_source.read(LOCAL_HEADER.size)
+        if len(header) != LOCAL_HEADER.size:
+            raise zipfile.BadZipFile(f"Cabecera local truncada: {info.filename}")
+        fields = LOCAL_HEADER.unpack(header)
+        if fields[0] != LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"Cabecera local inválida: {info.filename}")
+        raw_source.seek(info.header_offset + LOCAL_HEADER.size + fields[9] + fields[10])
+
+        inflater = inflate64.Inflater()
+        remaining = info.compress_size
+        crc = 0
+
+        with open(target, "wb") as dst:
+            while remaining > 0:
+                chunk = raw_source.read(min(self.buffer_size, remaining))
+                if not chunk:
+                    raise zipfile.BadZipFile(f"Datos truncados: {info.filename}")
+                remaining -= len(chunk)
+                data = inflater.inflate(chunk)
+                crc = zlib.crc32(data, crc)
+                dst.write(data)
+
+        # inflate64 no comprueba el CRC, por lo que se compara aquí
+        if crc != info.CRC:
+            os.remove(target)
+            raise IntegrityError(f"CRC incorrecto en {info.filename}")
+
+    def _extract_7z(
+        self,
+        archive_path: str,
+        extract_path: str,
+        accepts: Optional[Callable[[str], bool]] = None,
+        target_path: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> List[zipfile.ZipInfo]:
+        """
+        Extrae un archivo 7z con py7zr.
+
+        py7zr compara el CRC de cada miembro al descomprimirlo y lanza CrcError
+        si no coincide, por lo que una extracción completa queda verificada.
+        py7zr solo extrae en un directorio, por lo que con target_path los
+        miembros se extraen en una carpeta temporal dentro de extract_path y se
+        mueven después a su destino.
+
+        Args:
+            archive_path: Ruta al archivo 7z
+            extract_path: Ruta donde extraer los archivos
+            accepts: Función opcional que indica si un miembro debe extraerse
+            target_path: Función opcional que calcula la ruta de cada miembro
+                (None si se omite)
+
+        Returns:
+            List[zipfile.ZipInfo]: Miembros extraídos, con el nombre, tamaño y
+            CRC del listado del 7z
+        """
+        os.makedirs(extract_path, exist_ok=True)
+        with py7zr.SevenZipFile(archive_path, "r") as archive:
+            members = [
+                entry
+                for entry in archive.list()
+                if not entry.is_directory
+                and (accepts is None or accepts(entry.filename))
+            ]
+            if target_path is not None:
+                targets = {
+                    entry.filename: target_path(entry.filename) for entry in members
+                }
+                members = [entry for entry in members if targets[entry.filename]]
+            archive.reset()
+
+            if target_path is None:
+                if accepts is None:
+                    archive.extractall(path=extract_path)
+                else:
+                    archive.extract(
+                        path=extract_path,
+                        targets=[entry.filename for entry in members],
+                    )
+                return [self._zip_info(entry) for entry in members]
+
+            if not members:
+                return []
+            staging = tempfile.mkdtemp(prefix=".7z-", dir=extract_path)
+            try:
+                archive.extract(
+                    path=staging, targets=[entry.filename for entry in members]
+                )
+                for entry in members:
+                    target = targets[entry.filename]
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.move(
+                        os.path.join(staging, *entry.filename.split("/")), target
+                    )
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+
+        return [self._zip_info(entry) for entry in members]
+
+    @staticmethod
+    def _zip_info(entry: "py7zr.FileInfo") -> zipfile.ZipInfo:
+        """
+        Representa un miembro 7z como ZipInfo, para registrarlo igual que los
+        miembros ZIP.
+
+        Args:
+            entry: Miembro del listado del 7z
+
+        Returns:
+            zipfile.ZipInfo: Miembro con nombre, tamaño y CRC
+        """
+        info = zipfile.ZipInfo(entry.filename)
+        info.file_size = entry.uncompressed
+        info.CRC = entry.crc32 if entry.crc32 is not None else 0
+        return info
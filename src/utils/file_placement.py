@@ -0,0 +1,191 @@
+"""
+Estrategias para ubicar archivos en su destino final.
+Permite reemplazar la copia completa de los archivos por enlaces duros, clones
+reflink (FICLONE, en XFS/btrfs) o movimientos, que son operaciones de metadatos.
+"""
+
+import errno
+import logging
+import os
+import shutil
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PLACEMENT_STRATEGIES = ("copy", "hardlink", "reflink", "move")
+
+# ioctl FICLONE de Linux: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Errores que indican que la estrategia no es posible entre estas rutas y que
+# corresponde copiar el archivo
+FALLBACK_ERRNOS = {
+    errno.EXDEV,  # Origen y destino en distintos dispositivos
+    errno.EPERM,  # Sistema de archivos sin enlaces duros
+    errno.EMLINK,  # Límite de enlaces alcanzado
+    errno.EOPNOTSUPP,  # Sistema de archivos sin reflink
+    errno.ENOTTY,
+    errno.EINVAL,
+}
+
+
+def _remove_existing(destination: Path) -> None:
+    """
+    Elimina el archivo de destino si existe, para poder enlazarlo.
+
+    Args:
+        destination: Ruta de destino
+    """
+    if destination.exists() or destination.is_symlink():
+        destination.unlink()
+
+
+def reflink_file(source: Path, destination: Path) -> None:
+    """
+    Clona un archivo con FICLONE (comparte los bloques hasta que se modifiquen).
+
+    Args:
+        source: Archivo origen
+        destination: Archivo destino
+
+    Raises:
+        OSError: Si el sistema de archivos no soporta reflink
+    """
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink no disponible en esta plataforma")
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            destination.unlink()
+            raise
+    shutil.copystat(source, destination)
+
+
+def _copy_in_kernel(source_fd: int, destination_fd: int, size: int) -> bool:
+    """
+    Copia el contenido entre dos descriptores sin pasar por buffers de Python.
+
+    Usa copy_file_range (que además permite copias en el servidor o clones en
+    algunos sistemas de archivos) y, si no está disponible, sendfile.
+
+    Args:
+        source_fd: Descriptor del archivo origen
+        destination_fd: Descriptor del archivo destino
+        size: Tamaño del archivo origen en bytes
+
+    Returns:
+        bool: True si se copió; False si ninguna llamada está disponible
+
+    Raises:
+        OSError: Si la copia terminó antes de `size` bytes (el origen se
+            acortó durante la copia)
+    """
+    for method in ("copy_file_range", "sendfile"):
+        function = getattr(os, method, None)
+        if function is None:
+            continue
+
+        offset = 0
+        try:
+            while offset < size:
+                if method == "copy_file_range":
+                    copied = function(source_fd, destination_fd, size - offset)
+                else:
+                    copied = function(destination_fd, source_fd, offset, size - offset)
+                if copied == 0:
+                    break
+                offset += copied
+        except OSError as e:
+            if offset or e.errno not in FALLBACK_ERRNOS | {errno.ENOSYS}:
+                raise
+            # La llamada no se soporta entre estos archivos: probar la siguiente
+            continue
+
+        if offset == size:
+            return True
+        if offset:
+            raise OSError(
+                errno.EIO, f"Copia incompleta: {offset} de {size} bytes copiados"
+            )
+        # Algunos sistemas de archivos (procfs, FUSE) responden 0 bytes sin
+        # error: probar la siguiente llamada
+
+    return False
+
+
+def copy_file(source: Path, destination: Path) -> None:
+    """
+    Copia un archivo con sus metadatos usando copia en el kernel.
+
+    Args:
+        source: Archivo origen
+        destination: Archivo destino
+    """
+    size = os.path.getsize(source)
+    # El destino puede ser un enlace duro al origen de una ejecución anterior
+    _remove_existing(destination)
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        if not _copy_in_kernel(src.fileno(), dst.fileno(), size):
+            shutil.copyfileobj(src, dst, 4 * 1024 * 1024)
+    shutil.copystat(source, destination)
+
+
+def place_file(source: Path, destination: Path, strategy: str = "copy") -> str:
+    """
+    Ubica un archivo en su destino según la estrategia indicada.
+
+    - copy: copia completa con metadatos (ver copy_file)
+    - hardlink: enlace duro; origen y destino comparten el mismo inodo
+    - reflink: clon copy-on-write con FICLONE
+    - move: mueve el archivo (el origen deja de existir)
+
+    Si la estrategia no es posible (por ejemplo, distinto dispositivo o un
+    sistema de archivos sin soporte) se copia el archivo.
+
+    Args:
+        source: Archivo origen
+        destination: Archivo destino (su directorio debe existir)
+        strategy: Estrategia de ubicación
+
+    Returns:
+        str: Estrategia efectivamente usada
+
+    Raises:
+        ValueError: Si la estrategia no es válida
+    """
+    if strategy not in PLACEMENT_STRATEGIES:
+        raise ValueError(
+            f"Estrategia de ubicación inválida: {strategy} "
+            f"(opciones: {', '.join(PLACEMENT_STRATEGIES)})"
+        )
+
+    if strategy != "copy":
+        try:
+            if strategy == "hardlink":
+                if destination.exists() and os.path.samefile(source, destination):
+                    return strategy
+                _remove_existing(destination)
+                os.link(source, destination)
+            elif strategy == "reflink":
+                _remove_existing(destination)
+                reflink_file(source, destination)
+            else:
+                os.replace(source, destination)
+            return strategy
+        except OSError as e:
+            if e.errno not in FALLBACK_ERRNOS:
+                raise
+            logger.debug(
+                f"No se pudo usar {strategy} para {source.name}, se copia: {str(e)}"
+            )
+
+    copy_file(source, destination)
+    return "copy"
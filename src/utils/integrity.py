@@ -0,0 +1,115 @@
+"""
+Verificación de integridad de los archivos extraídos.
+Compara el CRC-32 de cada archivo en disco con el registrado en el directorio
+central del ZIP, repartiendo la lectura entre varios hilos.
+"""
+
+import logging
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .zstd_store import open_file
+
+logger = logging.getLogger(__name__)
+
+
+class IntegrityError(Exception):
+    """
+    Los datos de un miembro no coinciden con su CRC-32.
+
+    A diferencia de zipfile.BadZipFile, que indica un formato que zipfile no
+    sabe leer, no se reintenta con el motor de respaldo: el ZIP está dañado.
+    """
+
+    pass
+
+
+def file_crc32(path: str, buffer_size: int = 4 * 1024 * 1024) -> int:
+    """
+    Calcula el CRC-32 del contenido de un archivo.
+
+    Los archivos zstd se descomprimen al leerlos, por lo que el CRC
+    corresponde al contenido original del miembro.
+
+    Args:
+        path: Ruta al archivo
+        buffer_size: Tamaño del buffer de lectura en bytes
+
+    Returns:
+        int: CRC-32 del contenido
+    """
+    crc = 0
+    with open_file(path) as file:
+        for chunk in iter(lambda: file.read(buffer_size), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def member_path(root: str, key: str) -> str:
+    """
+    Calcula la ruta de un archivo extraído a partir de su clave registrada.
+
+    Args:
+        root: Directorio base de la extracción
+        key: Ruta relativa al directorio base (separador "/") o absoluta
+
+    Returns:
+        str: Ruta del archivo
+    """
+    if os.path.isabs(key):
+        return key
+    return os.path.join(root, *key.split("/"))
+
+
+def verify_member(root: str, key: str, crc: int, size: int) -> Optional[str]:
+    """
+    Verifica un archivo extraído contra el CRC y tamaño del ZIP.
+
+    Args:
+        root: Directorio base de la extracción
+        key: Ruta relativa (separador "/") o absoluta del archivo
+        crc: CRC-32 registrado en el ZIP
+        size: Tamaño registrado del archivo en disco
+
+    Returns:
+        Optional[str]: Descripción del problema o None si el archivo es correcto
+    """
+    try:
+        path = member_path(root, key)
+        if os.path.getsize(path) != size:
+            return f"{key}: tamaño distinto al del ZIP"
+        if file_crc32(path) != crc:
+            return f"{key}: CRC distinto al del ZIP"
+    except Exception as e:
+        # Archivo ausente, ilegible o con datos zstd corruptos
+        return f"{key}: {str(e)}"
+    return None
+
+
+def verify_members(
+    root: str, members: Dict[str, List[int]], workers: int = 4
+) -> List[str]:
+    """
+    Verifica en paralelo los archivos extraídos de un ZIP.
+
+    zlib libera el GIL al calcular el CRC de bloques grandes, por lo que los
+    hilos aprovechan varios núcleos. Los archivos más grandes se verifican
+    primero para equilibrar la carga.
+
+    Args:
+        root: Directorio base de la extracción
+        members: Miembros extraídos {ruta: [crc, tamaño en disco]}
+        workers: Cantidad de hilos de verificación
+
+    Returns:
+        List[str]: Problemas encontrados (vacía si todo coincide)
+    """
+    ordered = sorted(members.items(), key=lambda item: item[1][1], reverse=True)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        problems = executor.map(
+            lambda item: verify_member(root, item[0], *item[1]), ordered
+        )
+        return [problem for problem in problems if problem]
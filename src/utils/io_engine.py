@@ -0,0 +1,257 @@
+"""
+Motor de escritura a disco para la extracción de archivos.
+Centraliza la verificación de espacio libre, la ruta de destino de cada miembro,
+la preasignación de los archivos de salida, el tamaño de los buffers de copia y
+la política de fsync.
+"""
+
+import errno
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import IO, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("none", "file", "archive")
+
+# Sufijo de los archivos en escritura; se renombran al terminar
+PARTIAL_SUFFIX = ".part"
+
+# Caracteres no válidos en nombres de archivo de Windows (igual que zipfile)
+WINDOWS_ILLEGAL_CHARS = str.maketrans(':<>|"?*', "_______")
+
+
+@dataclass
+class IOPolicy:
+    """
+    Parámetros de escritura de los archivos extraídos.
+
+    - buffer_size: tamaño del buffer de copia en bytes
+    - preallocate: reservar el tamaño final de cada archivo antes de escribirlo
+      (posix_fallocate), lo que reduce la fragmentación de los CSV grandes
+    - preallocate_min_size: tamaño mínimo para preasignar
+    - fsync: "none" (lo decide el sistema operativo), "file" (cada archivo) o
+      "archive" (una vez al terminar cada ZIP)
+    - min_free_space: bytes que deben quedar libres tras la extracción
+    """
+
+    buffer_size: int = 4 * 1024 * 1024
+    preallocate: bool = True
+    preallocate_min_size: int = 1024 * 1024
+    fsync: str = "none"
+    min_free_space: int = 512 * 1024 * 1024
+
+    def __post_init__(self):
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(
+                f"Política de fsync inválida: {self.fsync} "
+                f"(opciones: {', '.join(FSYNC_POLICIES)})"
+            )
+
+
+def free_space(path: str) -> int:
+    """
+    Obtiene el espacio libre del sistema de archivos que contiene una ruta.
+
+    Si la ruta aún no existe se consulta su directorio existente más cercano.
+
+    Args:
+        path: Ruta de destino
+
+    Returns:
+        int: Bytes libres
+    """
+    return shutil.disk_usage(existing_ancestor(path)).free
+
+
+def existing_ancestor(path: str) -> str:
+    """
+    Obtiene la ruta existente más cercana (la propia ruta o un ancestro).
+
+    Args:
+        path: Ruta que puede no existir todavía
+
+    Returns:
+        str: Ruta absoluta existente
+    """
+    path = os.path.abspath(path)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def volume_id(path: str) -> int:
+    """
+    Identifica el sistema de archivos que recibirá una ruta.
+
+    Args:
+        path: Ruta de destino (puede no existir todavía)
+
+    Returns:
+        int: Dispositivo (st_dev) de la ruta existente más cercana
+    """
+    return os.stat(existing_ancestor(path)).st_dev
+
+
+def check_free_space(path: str, required: int, reserve: int = 0) -> None:
+    """
+    Verifica que haya espacio para escribir `required` bytes en una ruta.
+
+    Args:
+        path: Ruta de destino
+        required: Bytes que se van a escribir
+        reserve: Bytes que deben quedar libres después de escribir
+
+    Raises:
+        OSError: Con errno ENOSPC si el espacio no alcanza
+    """
+    available = free_space(path)
+    if required + reserve > available:
+        raise OSError(
+            errno.ENOSPC,
+            f"Espacio insuficiente en {path}: se requieren "
+            f"{required / 1024 ** 2:.1f} MB (+{reserve / 1024 ** 2:.1f} MB de "
+            f"reserva) y hay {available / 1024 ** 2:.1f} MB libres",
+        )
+
+
+def preallocate(file: IO[bytes], size: int) -> bool:
+    """
+    Reserva en disco el tamaño final de un archivo recién creado.
+
+    Args:
+        file: Archivo abierto para escritura
+        size: Tamaño final en bytes
+
+    Returns:
+        bool: True si se preasignó; False si el sistema no lo soporta
+    """
+    if not hasattr(os, "posix_fallocate") or size <= 0:
+        return False
+    try:
+        os.posix_fallocate(file.fileno(), 0, size)
+        return True
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            raise
+        # Sistemas de archivos sin soporte (EOPNOTSUPP, EINVAL, ...)
+        logger.debug(f"No se pudo preasignar {getattr(file, 'name', '')}: {str(e)}")
+        return False
+
+
+def _sanitize_windows_name(name: str) -> str:
+    """
+    Adapta un componente de ruta a las reglas de nombres de Windows.
+
+    Equivale a zipfile.ZipFile._sanitize_windows_name: reemplaza los
+    caracteres no válidos por "_" y quita los puntos finales, que Windows
+    descarta (un ":" crearía además un flujo alternativo NTFS).
+
+    Args:
+        name: Componente de la ruta
+
+    Returns:
+        str: Componente adaptado (vacío si solo tenía puntos)
+    """
+    return name.translate(WINDOWS_ILLEGAL_CHARS).rstrip(".")
+
+
+def member_target_path(extract_path: str, member_name: str) -> Optional[str]:
+    """
+    Calcula la ruta de destino de un miembro dentro del directorio de extracción.
+
+    En Windows los nombres se adaptan igual que lo hace zipfile al extraer.
+
+    Args:
+        extract_path: Ruta donde se extraen los archivos
+        member_name: Nombre del miembro dentro del ZIP
+
+    Returns:
+        Optional[str]: Ruta de destino o None si el miembro escapa del directorio
+    """
+    parts = [
+        part
+        for part in member_name.replace("\\", "/").split("/")
+        if part not in ("", ".")
+    ]
+    if not parts or ".." in parts or os.path.splitdrive(parts[0])[0]:
+        return None
+    if os.path.sep == "\\":
+        parts = [_sanitize_windows_name(part) for part in parts]
+        parts = [part for part in parts if part]
+        if not parts:
+            return None
+    return os.path.join(extract_path, *parts)
+
+
+@contextmanager
+def partial_file(target: str) -> Iterator[str]:
+    """
+    Entrega una ruta temporal junto a `target` donde escribir un archivo.
+
+    Al salir sin errores el archivo temporal reemplaza a `target` con
+    os.replace, por lo que un lector nunca ve un archivo a medio escribir
+    (los archivos preasignados ya tienen su tamaño final desde el inicio).
+    Si la escritura falla, el temporal se elimina.
+
+    Args:
+        target: Ruta final del archivo
+
+    Yields:
+        str: Ruta temporal (target + ".part")
+    """
+    temporary = target + PARTIAL_SUFFIX
+    try:
+        yield temporary
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+    os.replace(temporary, target)
+
+
+def write_stream(source: IO[bytes], target: str, size: int, policy: IOPolicy) -> str:
+    """
+    Copia un flujo a un archivo según la política de escritura.
+
+    El archivo se escribe con un nombre temporal y se renombra al terminar
+    (ver partial_file).
+
+    Args:
+        source: Flujo con los datos
+        target: Ruta del archivo de destino
+        size: Tamaño esperado en bytes (para la preasignación)
+        policy: Política de escritura
+
+    Returns:
+        str: Ruta del archivo escrito
+    """
+    with partial_file(target) as temporary:
+        with open(temporary, "wb") as destination:
+            if policy.preallocate and size >= policy.preallocate_min_size:
+                preallocate(destination, size)
+            shutil.copyfileobj(source, destination, policy.buffer_size)
+            # Si el contenido resultó menor que lo preasignado, se recorta
+            destination.truncate()
+            if policy.fsync == "file":
+                destination.flush()
+                os.fsync(destination.fileno())
+    return target
+
+
+def sync_filesystem() -> None:
+    """
+    Fuerza la escritura a disco de los datos pendientes (política "archive").
+
+    En sistemas sin os.sync (Windows) no hace nada.
+    """
+    if hasattr(os, "sync"):
+        os.sync()
@@ -0,0 +1,157 @@
+"""
+Filtro de miembros de ZIP construido a partir de las definiciones del registro.
+Permite extraer solo los archivos que el proceso necesita en lugar de
+descomprimir el contenido completo de cada ZIP.
+"""
+
+import fnmatch
+import hashlib
+import json
+import logging
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MemberFilter:
+    """
+    Filtro que decide qué miembros de un ZIP deben extraerse.
+
+    Compila los patrones de `file_registry.files` (incluyendo `path_variables`
+    y el formato del periodo) a expresiones regulares. Los ZIP anidados siempre
+    se aceptan, ya que los archivos requeridos pueden estar dentro de ellos.
+    """
+
+    def __init__(
+        self,
+        patterns: List[Tuple[str, Optional[str], str]],
+        match_paths: bool = False,
+    ):
+        """
+        Inicializa el filtro.
+
+        Args:
+            patterns: Tuplas (tipo de archivo, directorio esperado, patrón de nombre)
+            match_paths: Si es True exige además que el miembro esté bajo el
+                directorio esperado; si es False basta con el nombre del archivo
+        """
+        self.match_paths = match_paths
+        self.rules: List[Tuple[str, Optional[Pattern], Pattern]] = []
+
+        for file_type, directory, pattern in patterns:
+            dir_regex = None
+            if directory:
+                dir_regex = re.compile(
+                    r"(^|.*/)" + re.escape(directory.strip("/")) + r"$",
+                    re.IGNORECASE,
+                )
+            name_regex = re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+            self.rules.append((file_type, dir_regex, name_regex))
+
+    @classmethod
+    def from_registry_config(
+        cls,
+        config: Dict,
+        periodo: str,
+        match_paths: bool = False,
+        extra_patterns: Optional[List[Tuple[str, Optional[str], str]]] = None,
+    ) -> "MemberFilter":
+        """
+        Construye el filtro desde la sección `file_registry` de la configuración.
+
+        Los patrones se formatean con el periodo completo (YYYYMM) y con el
+        formato corto (YYMM) usado en los nombres de los archivos del Coordinador.
+
+        Args:
+            config: Configuración del sistema
+            periodo: Periodo en formato YYYYMM
+            match_paths: Exigir que el miembro esté bajo el directorio esperado
+            extra_patterns: Patrones adicionales (tipo, directorio, patrón
+                fnmatch), por ejemplo los de la tabla de destinos del
+                organizador, cuyos archivos también deben extraerse
+
+        Returns:
+            MemberFilter: Filtro compilado
+        """
+        registry_config = config.get("file_registry", {})
+        path_variables = registry_config.get("path_variables", {})
+        files_config = registry_config.get("files", {})
+
+        patterns: List[Tuple[str, Optional[str], str]] = []
+        for periodo_value in dict.fromkeys([periodo, periodo[2:]]):
+            variables = {
+                name: value.format(periodo=periodo_value)
+                for name, value in path_variables.items()
+                if isinstance(value, str)
+            }
+            for file_type, file_config in files_config.items():
+                for location in file_config.get("locations", []):
+                    directory = location.get("path", "").format(
+                        periodo=periodo_value, **variables
+                    )
+                    for pattern in location.get("patterns", []):
+                        patterns.append(
+                            (
+                                file_type,
+                                directory or None,
+                                pattern.format(periodo=periodo_value),
+                            )
+                        )
+
+        patterns.extend(extra_patterns or [])
+
+        logger.debug(f"Filtro de miembros compilado con {len(patterns)} patrones")
+        return cls(patterns, match_paths=match_paths)
+
+    def signature(self) -> str:
+        """
+        Calcula una firma de la configuración del filtro.
+
+        Permite que el manifiesto de extracción detecte un cambio de filtro y
+        vuelva a extraer los ZIP cuyos miembros ahora se necesitan.
+
+        Returns:
+            str: Digest SHA-256 de las reglas y de match_paths
+        """
+        rules = [
+            [file_type, dir_regex.pattern if dir_regex else None, name_regex.pattern]
+            for file_type, dir_regex, name_regex in self.rules
+        ]
+        payload = json.dumps([self.match_paths, rules], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def match(self, member_name: str) -> Optional[str]:
+        """
+        Obtiene el tipo de archivo al que corresponde un miembro.
+
+        Args:
+            member_name: Nombre del miembro dentro del ZIP
+
+        Returns:
+            Optional[str]: Tipo de archivo o None si no coincide con ningún patrón
+        """
+        normalized = member_name.replace("\\", "/")
+        directory, _, filename = normalized.rpartition("/")
+
+        for file_type, dir_regex, name_regex in self.rules:
+            if not name_regex.match(filename):
+                continue
+            if self.match_paths and dir_regex and not dir_regex.match(directory):
+                continue
+            return file_type
+        return None
+
+    def accepts(self, member_name: str) -> bool:
+        """
+        Indica si un miembro debe extraerse.
+
+        Args:
+            member_name: Nombre del miembro dentro del ZIP
+
+        Returns:
+            bool: True si el miembro es un ZIP anidado o coincide con un patrón
+        """
+        if member_name.lower().endswith(".zip"):
+            return True
+        return self.match(member_name) is not None
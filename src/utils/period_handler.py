@@ -42,6 +42,27 @@ class PeriodHandler:
         except ValueError:
             return False
 
+    @staticmethod
+    def extract_date(filename: str) -> Optional[datetime]:
+        """
+        Obtiene la fecha contenida en el nombre de un archivo diario.
+
+        Reconoce fechas YYYYMMDD, YYYY-MM-DD y YYYY_MM_DD no rodeadas de otros
+        dígitos (ej: 'Detalle Sobrecostos 20240701.xlsx', 'CMg_Real_20240701.csv').
+
+        Args:
+            filename (str): Nombre del archivo
+
+        Returns:
+            Optional[datetime]: Fecha encontrada o None si no hay una fecha válida
+        """
+        for match in re.finditer(r'(?<!\d)(\d{4})[-_]?(\d{2})[-_]?(\d{2})(?!\d)', filename):
+            try:
+                return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+            except ValueError:
+                continue
+        return None
+
     @staticmethod
     def list_available_periods(raw_path: str) -> list:
         """
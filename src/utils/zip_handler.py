@@ -2,21 +2,253 @@
 Manejador para la extracción y archivado de archivos ZIP.
 Este módulo se encarga de extraer los archivos ZIP originales a una carpeta temporal
 'unzipped' y archivar los ZIP originales. Los archivos extraídos serán posteriormente
-organizados por el FileOrganizer.
+organizados por el FileOrganizer, salvo en la extracción directa, donde cada
+miembro se escribe en el destino que indica la tabla de patrones del organizador.
 """
 
+import io
 import os
 import logging
+import time
 import zipfile
-from typing import List, Optional
-import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
 from datetime import datetime
-import subprocess
+
+from .archive_catalog import ArchiveCatalog
+from .archive_store import ArchiveStore
+from .extraction_metrics import MetricsWriter, member_record
+from .extraction_manifest import ExtractionManifest, archive_signature
+from .fallback_extractor import FallbackExtractor
+from .integrity import IntegrityError, verify_members
+from .io_engine import (
+    IOPolicy,
+    check_free_space,
+    member_target_path,
+    sync_filesystem,
+    volume_id,
+    write_stream,
+)
+from .member_filter import MemberFilter
+from .zstd_store import ZSTD_SUFFIX, ZstdStore
 
 logger = logging.getLogger(__name__)
 
-# Ruta al ejecutable de 7-Zip
-SEVEN_ZIP_PATH = r"C:\Program Files\7-Zip\7z.exe"
+
+@dataclass
+class ExtractionResult:
+    """
+    Resultado de la extracción de un archivo ZIP.
+    Permite que cada proceso de extracción reporte su propio resultado.
+    """
+
+    zip_name: str
+    success: bool
+    duration: float = 0.0
+    error: Optional[str] = None
+    members_extracted: int = 0
+    members_skipped: int = 0
+    bytes_skipped: int = 0
+    nested_archives: int = 0
+    unchanged: bool = False
+    extract_root: str = ""
+    signature: Optional[Dict] = None
+    members: Dict[str, List[int]] = field(default_factory=dict)
+    depth: int = 0
+    fallback: bool = False
+    archive_bytes: int = 0
+    cpu_seconds: float = 0.0
+    member_metrics: List[Dict] = field(default_factory=list)
+
+
+def split_members_by_size(
+    members: List[zipfile.ZipInfo], parts: int
+) -> List[List[str]]:
+    """
+    Reparte los miembros de un ZIP en grupos de tamaño descomprimido similar.
+
+    Usa la heurística de asignar el miembro más grande pendiente al grupo
+    con menor carga acumulada.
+
+    Args:
+        members: Miembros del ZIP (ZipInfo)
+        parts: Cantidad de grupos a generar
+
+    Returns:
+        List[List[str]]: Nombres de miembros por grupo (sin grupos vacíos)
+    """
+    groups: List[List[str]] = [[] for _ in range(max(1, parts))]
+    loads = [0] * len(groups)
+
+    for info in sorted(members, key=lambda i: i.file_size, reverse=True):
+        target = loads.index(min(loads))
+        groups[target].append(info.filename)
+        loads[target] += info.file_size
+
+    return [group for group in groups if group]
+
+
+def resolve_target(
+    extract_path: str,
+    member_name: str,
+    router: Optional[Callable[[str], Optional[str]]] = None,
+) -> Optional[str]:
+    """
+    Calcula la ruta donde se escribe un miembro de un ZIP.
+
+    Con un enrutador (extracción directa) los archivos van al destino que este
+    indica; los ZIP anidados quedan en extract_path para poder abrirlos.
+
+    Args:
+        extract_path: Ruta donde extraer los archivos
+        member_name: Nombre del miembro dentro del ZIP
+        router: Función opcional que entrega el destino final de un miembro
+            (None si el miembro se omite)
+
+    Returns:
+        Optional[str]: Ruta de destino o None si el miembro no se escribe
+    """
+    if router is not None and not member_name.lower().endswith(".zip"):
+        return router(member_name)
+    return member_target_path(extract_path, member_name)
+
+
+def write_member(
+    zip_ref: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    extract_path: str,
+    zstd_store: Optional[ZstdStore] = None,
+    io_policy: Optional[IOPolicy] = None,
+    router: Optional[Callable[[str], Optional[str]]] = None,
+) -> Optional[str]:
+    """
+    Escribe un miembro de un ZIP en disco.
+
+    Todas las rutas de extracción pasan por esta función: el archivo se
+    preasigna y se copia según la política de escritura, o bien, si hay una
+    política de compresión en reposo y el miembro la cumple, se guarda como
+    archivo zstd buscable.
+
+    Args:
+        zip_ref: ZIP abierto
+        info: Miembro a escribir
+        extract_path: Ruta donde extraer los archivos
+        zstd_store: Política opcional de compresión en reposo
+        io_policy: Política de escritura (buffers, preasignación y fsync)
+        router: Función opcional que entrega el destino final del miembro
+
+    Returns:
+        Optional[str]: Ruta del archivo escrito o None si la ruta es inválida
+        o el miembro no tiene destino
+
+    Raises:
+        IntegrityError: Si los datos del miembro no coinciden con su CRC-32
+    """
+    target = resolve_target(extract_path, info.filename, router)
+    if target is None:
+        if router is None:
+            logger.warning(f"Miembro con ruta inválida: {info.filename}")
+        else:
+            logger.debug(f"Miembro sin destino, se omite: {info.filename}")
+        return None
+    if info.is_dir():
+        os.makedirs(target, exist_ok=True)
+        return target
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with zip_ref.open(info) as source:
+        try:
+            if zstd_store is not None and zstd_store.should_compress(info):
+                return zstd_store.write(source, target)
+            return write_stream(source, target, info.file_size, io_policy or IOPolicy())
+        except zipfile.BadZipFile as e:
+            # zipfile compara el CRC-32 al terminar de leer el miembro; el
+            # error no se reintenta con el motor de respaldo
+            raise IntegrityError(f"{info.filename}: {str(e)}") from e
+
+
+def timed_write_member(
+    zip_ref: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    extract_path: str,
+    zip_name: str,
+    depth: int = 0,
+    zstd_store: Optional[ZstdStore] = None,
+    io_policy: Optional[IOPolicy] = None,
+    router: Optional[Callable[[str], Optional[str]]] = None,
+) -> Optional[Dict]:
+    """
+    Escribe un miembro de un ZIP en disco y mide la escritura.
+
+    Args:
+        zip_ref: ZIP abierto
+        info: Miembro a escribir
+        extract_path: Ruta donde extraer los archivos
+        zip_name: Nombre del ZIP de primer nivel (para las métricas)
+        depth: Nivel de anidamiento del miembro
+        zstd_store: Política opcional de compresión en reposo
+        io_policy: Política de escritura
+        router: Función opcional que entrega el destino final del miembro
+
+    Returns:
+        Optional[Dict]: Registro de métricas del miembro (None si no se
+        escribió un archivo)
+    """
+    start_time = time.perf_counter()
+    target = write_member(zip_ref, info, extract_path, zstd_store, io_policy, router)
+    if target is None or info.is_dir():
+        return None
+    return member_record(
+        zip_name,
+        info,
+        time.perf_counter() - start_time,
+        os.path.getsize(target),
+        depth,
+    )
+
+
+def _extract_members(
+    zip_path: str,
+    members: List[str],
+    extract_path: str,
+    zstd_store: Optional[ZstdStore] = None,
+    io_policy: Optional[IOPolicy] = None,
+    router: Optional[Callable[[str], Optional[str]]] = None,
+) -> List[Dict]:
+    """
+    Extrae un grupo de miembros de un ZIP usando un handle propio.
+
+    Se define a nivel de módulo para poder ejecutarse en otro proceso.
+
+    Args:
+        zip_path: Ruta al archivo ZIP
+        members: Nombres de los miembros a extraer
+        extract_path: Ruta donde extraer los archivos
+        zstd_store: Política opcional de compresión en reposo
+        io_policy: Política de escritura
+        router: Función opcional que entrega el destino final de cada miembro
+
+    Returns:
+        List[Dict]: Registros de métricas de los miembros extraídos
+    """
+    records = []
+    zip_name = os.path.basename(zip_path)
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        for member in members:
+            record = timed_write_member(
+                zip_ref,
+                zip_ref.getinfo(member),
+                extract_path,
+                zip_name,
+                0,
+                zstd_store,
+                io_policy,
+                router,
+            )
+            if record is not None:
+                records.append(record)
+    return records
 
 
 class ZipHandler:
@@ -29,7 +261,25 @@ class ZipHandler:
     3. Extraer cualquier ZIP anidado dentro de los archivos extraídos
     """
 
-    def __init__(self, raw_path: str, unzipped_path: str, archive_path: str):
+    def __init__(
+        self,
+        raw_path: str,
+        unzipped_path: str,
+        archive_path: str,
+        max_workers: int = 1,
+        member_workers: int = 1,
+        member_filter: Optional[MemberFilter] = None,
+        nested_depth: int = 0,
+        nested_spool_size: int = 64 * 1024 * 1024,
+        use_manifest: bool = False,
+        fallback_buffer_size: int = 4 * 1024 * 1024,
+        catalog_path: Optional[str] = None,
+        zstd_store: Optional[ZstdStore] = None,
+        io_policy: Optional[IOPolicy] = None,
+        verify_workers: int = 0,
+        metrics_path: Optional[str] = None,
+        router: Optional[Callable[[str], Optional[str]]] = None,
+    ):
         """
         Inicializa el manejador de ZIPs.
 
@@ -37,10 +287,53 @@ class ZipHandler:
             raw_path: Ruta donde se encuentran los ZIP originales
             unzipped_path: Ruta donde se extraerán temporalmente todos los archivos
             archive_path: Ruta donde se archivarán los ZIP originales
+            max_workers: Cantidad de procesos para extraer ZIPs en paralelo
+                (1 extrae los archivos uno a uno)
+            member_workers: Cantidad de procesos para extraer en paralelo los
+                miembros de un mismo ZIP (1 usa un único handle)
+            member_filter: Filtro opcional de miembros; si se indica, solo se
+                extraen los miembros que acepta (ver MemberFilter)
+            nested_depth: Niveles de ZIP anidados que se abren directamente desde
+                el ZIP contenedor sin escribirlos a disco (0 lo desactiva)
+            nested_spool_size: Tamaño máximo (bytes) de un ZIP anidado que se
+                carga en memoria; los mayores se leen desde el flujo del contenedor
+            use_manifest: Registrar cada extracción en el manifiesto del periodo
+                y omitir los ZIP que no cambiaron desde la última ejecución
+            fallback_buffer_size: Tamaño del buffer (bytes) del motor de respaldo
+                para miembros que zipfile no soporta (Deflate64, 7z)
+            catalog_path: Ruta opcional al catálogo SQLite de miembros de ZIP
+            zstd_store: Política opcional de compresión en reposo; los miembros
+                de texto grandes se guardan como archivos zstd buscables
+            io_policy: Política de escritura (buffers, preasignación, fsync y
+                espacio libre mínimo); por defecto IOPolicy()
+            verify_workers: Hilos para verificar el CRC de los archivos extraídos
+                antes de archivar cada ZIP (0 desactiva la verificación)
+            metrics_path: Ruta opcional del archivo de métricas de la ejecución
+                (JSON Lines, ver MetricsWriter)
+            router: Función opcional que entrega el destino final de cada
+                miembro (extracción directa, ver FileOrganizer.route); los
+                miembros sin destino se omiten y los ZIP anidados se siguen
+                extrayendo en unzipped. Debe poder enviarse a otros procesos
         """
         self.raw_path = raw_path
         self.unzipped_path = unzipped_path  # Cambiado de processed_path a unzipped_path
         self.archive_path = archive_path
+        self.archive_store = ArchiveStore(archive_path)
+        self.max_workers = max(1, int(max_workers))
+        self.member_workers = max(1, int(member_workers))
+        self.member_filter = member_filter
+        self.nested_depth = max(0, int(nested_depth))
+        self.nested_spool_size = nested_spool_size
+        self.use_manifest = use_manifest
+        self.fallback = FallbackExtractor(buffer_size=fallback_buffer_size)
+        # Se guarda la ruta y no la conexión para poder enviar el manejador
+        # a los procesos de extracción
+        self.catalog_path = catalog_path
+        self.zstd_store = zstd_store
+        self.io_policy = io_policy or IOPolicy()
+        self.verify_workers = max(0, int(verify_workers))
+        self.metrics_path = metrics_path
+        self.router = router
 
     def _is_sscc_balance_file(self, filename: str) -> bool:
         """
@@ -69,43 +362,164 @@ class ZipHandler:
         """
         return os.path.abspath(path)
 
-    def extract_with_7zip(self, zip_path: str, extract_path: str) -> bool:
+    def extract_with_fallback(
+        self,
+        zip_path: str,
+        extract_path: str,
+        result: Optional[ExtractionResult] = None,
+    ) -> bool:
         """
-        Intenta extraer un archivo usando 7-Zip cuando zipfile falla.
+        Extrae un archivo con el motor de respaldo cuando zipfile falla.
+
+        El motor corre en el mismo proceso (inflate64 para Deflate64 y py7zr
+        para archivos 7z), por lo que no depende de 7z.exe.
 
         Args:
             zip_path: Ruta al archivo ZIP a extraer
             extract_path: Ruta donde extraer los archivos
+            result: Resultado opcional donde registrar los miembros extraídos
 
         Returns:
             bool: True si la extracción fue exitosa
         """
         try:
-            # Aseguramos que las rutas sean absolutas
             zip_path = self.normalize_path(zip_path)
             extract_path = self.normalize_path(extract_path)
 
-            # Construimos el comando con las rutas entre comillas para manejar espacios
-            cmd = f'"{SEVEN_ZIP_PATH}" x -y "-o{extract_path}" "{zip_path}"'
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                shell=True,  # Necesario para manejar rutas con espacios
+            extracted = self.fallback.extract(
+                zip_path,
+                extract_path,
+                self._accepts_member,
+                self._fallback_recorder(result, result.depth if result else 0),
+                self._target_resolver(extract_path),
             )
+            logger.info(f"Archivo extraído con el motor de respaldo: {zip_path}")
 
-            if result.returncode == 0:
-                logger.info(f"Archivo extraído con 7z: {zip_path}")
-                return True
-            else:
-                logger.error(f"Error en 7z: {result.stderr}")
-                return False
+            if result is not None:
+                result.fallback = True
+                self._record_fallback(result, extracted, extract_path)
+            return True
 
         except Exception as e:
-            logger.error(f"Error usando 7z en {zip_path}: {str(e)}")
+            logger.error(f"Error en el motor de respaldo con {zip_path}: {str(e)}")
             return False
 
+    def _write_member(
+        self,
+        zip_ref: zipfile.ZipFile,
+        info: zipfile.ZipInfo,
+        extract_path: str,
+        result: ExtractionResult,
+        depth: int = 0,
+    ) -> None:
+        """
+        Escribe un miembro y registra sus métricas en el resultado.
+
+        Args:
+            zip_ref: ZIP abierto
+            info: Miembro a escribir
+            extract_path: Ruta donde extraer los archivos
+            result: Resultado donde registrar las métricas
+            depth: Nivel de anidamiento del miembro
+        """
+        record = timed_write_member(
+            zip_ref,
+            info,
+            extract_path,
+            result.zip_name,
+            depth,
+            self.zstd_store,
+            self.io_policy,
+            self.router,
+        )
+        if record is not None:
+            result.member_metrics.append(record)
+
+    def _target_resolver(
+        self, extract_path: str
+    ) -> Optional[Callable[[str], Optional[str]]]:
+        """
+        Crea la función que calcula la ruta de los miembros extraídos por el
+        motor de respaldo cuando la extracción es directa.
+
+        Args:
+            extract_path: Ruta donde extraer los archivos
+
+        Returns:
+            Optional[Callable]: Función para FallbackExtractor.extract (None
+            sin enrutador)
+        """
+        if self.router is None:
+            return None
+        return lambda member_name: resolve_target(
+            extract_path, member_name, self.router
+        )
+
+    def _fallback_recorder(
+        self, result: Optional[ExtractionResult], depth: int = 0
+    ) -> Optional[Callable[[zipfile.ZipInfo, float, str], None]]:
+        """
+        Crea la función que registra las métricas de los miembros extraídos
+        por el motor de respaldo.
+
+        Args:
+            result: Resultado donde registrar las métricas (None no registra)
+            depth: Nivel de anidamiento de los miembros
+
+        Returns:
+            Optional[Callable]: Función para FallbackExtractor.extract
+        """
+        if result is None:
+            return None
+
+        def record(info: zipfile.ZipInfo, seconds: float, target: str) -> None:
+            result.member_metrics.append(
+                member_record(
+                    result.zip_name,
+                    info,
+                    seconds,
+                    os.path.getsize(target),
+                    depth,
+                    fallback=True,
+                )
+            )
+
+        return record
+
+    def _accepts_member(self, member_name: str) -> bool:
+        """
+        Indica si un miembro debe extraerse según el filtro configurado.
+
+        Args:
+            member_name: Nombre del miembro dentro del ZIP
+
+        Returns:
+            bool: True si no hay filtro o el filtro acepta el miembro
+        """
+        return self.member_filter is None or self.member_filter.accepts(member_name)
+
+    def _record_fallback(
+        self,
+        result: ExtractionResult,
+        extracted: List[zipfile.ZipInfo],
+        extract_path: str,
+    ) -> None:
+        """
+        Registra en el resultado los miembros extraídos por el motor de respaldo.
+
+        Si el motor no extrajo miembros, el ZIP queda fuera del manifiesto.
+
+        Args:
+            result: Resultado de la extracción
+            extracted: Miembros extraídos por el motor de respaldo
+            extract_path: Ruta donde se extrajeron los miembros
+        """
+        if not extracted:
+            result.signature = None
+            return
+        result.members_extracted += len(extracted)
+        self._record_members(result, extracted, extract_path)
+
     def extract_zip(
         self, periodo: str, zip_name: str, specific_files: Optional[List[str]] = None
     ) -> bool:
@@ -117,11 +531,232 @@ class ZipHandler:
             zip_name: Nombre del archivo ZIP a extraer
             specific_files: Lista opcional de archivos específicos a extraer
 
+        Returns:
+            bool: True si la extracción fue exitosa
+        """
+        return self.extract_zip_result(periodo, zip_name, specific_files).success
+
+    def extract_zip_result(
+        self, periodo: str, zip_name: str, specific_files: Optional[List[str]] = None
+    ) -> ExtractionResult:
+        """
+        Extrae un archivo ZIP y retorna el detalle del resultado.
+
+        Es el punto de entrada usado por los procesos de extracción en paralelo,
+        ya que el resultado puede enviarse de vuelta al proceso principal.
+
+        Args:
+            periodo: Periodo que se está procesando (YYYYMM)
+            zip_name: Nombre del archivo ZIP a extraer
+            specific_files: Lista opcional de archivos específicos a extraer
+
+        Returns:
+            ExtractionResult: Resultado de la extracción
+        """
+        start_time = datetime.now()
+        start_cpu = time.process_time()
+        result = ExtractionResult(zip_name=zip_name, success=False)
+        try:
+            result.archive_bytes = os.path.getsize(
+                os.path.join(self.raw_path, periodo, zip_name)
+            )
+        except OSError:
+            pass
+
+        if (
+            self.use_manifest
+            and not specific_files
+            and self._is_unchanged(periodo, zip_name, result)
+        ):
+            logger.info(f"ZIP sin cambios desde la última extracción: {zip_name}")
+            result.success = True
+            return result
+
+        try:
+            result.success = self._extract_zip(
+                periodo, zip_name, specific_files, result
+            )
+            if result.success and self.verify_workers > 0:
+                result.success = self._verify_result(result)
+        except Exception as e:
+            result.success = False
+            result.error = str(e)
+
+        result.duration = (datetime.now() - start_time).total_seconds()
+        result.cpu_seconds = time.process_time() - start_cpu
+        return result
+
+    def _is_unchanged(
+        self, periodo: str, zip_name: str, result: ExtractionResult
+    ) -> bool:
+        """
+        Verifica en el manifiesto si un ZIP ya fue extraído y sigue intacto.
+
+        Calcula la firma del ZIP y la guarda en el resultado para registrarla
+        en el manifiesto una vez terminada la extracción.
+
+        Args:
+            periodo: Periodo que se está procesando (YYYYMM)
+            zip_name: Nombre del archivo ZIP
+            result: Resultado donde guardar la firma y los miembros
+
+        Returns:
+            bool: True si se puede omitir la extracción
+        """
+        zip_path = os.path.join(self.raw_path, periodo, zip_name)
+        try:
+            result.signature = archive_signature(zip_path, self._extraction_settings())
+        except Exception as e:
+            logger.debug(f"No se pudo calcular la firma de {zip_name}: {str(e)}")
+            return False
+
+        manifest = ExtractionManifest(os.path.join(self.unzipped_path, periodo))
+        if not manifest.is_unchanged(zip_name, result.signature, self.verify_workers):
+            return False
+
+        result.unchanged = True
+        return True
+
+    def _extraction_settings(self) -> Dict:
+        """
+        Configuración que decide qué miembros se escriben, dónde y cómo, para
+        la firma del manifiesto.
+
+        Returns:
+            Dict: Firma del filtro de miembros (None sin filtro), si la
+            extracción es directa, los niveles de ZIP anidados que se abren
+            desde el contenedor y la política de compresión en reposo (None
+            sin compresión)
+        """
+        return {
+            "filter": (
+                self.member_filter.signature()
+                if self.member_filter is not None
+                else None
+            ),
+            "direct": self.router is not None,
+            "nested_depth": self.nested_depth,
+            "compress_at_rest": (
+                self.zstd_store.signature() if self.zstd_store is not None else None
+            ),
+        }
+
+    def _verify_result(self, result: ExtractionResult) -> bool:
+        """
+        Verifica los archivos extraídos de un ZIP contra los CRC del ZIP.
+
+        Relee en paralelo los archivos ya escritos, por lo que detecta también
+        los errores entre la descompresión y el disco. Incluye los miembros de
+        los ZIP anidados abiertos desde el contenedor y los del motor de
+        respaldo. Un ZIP con diferencias se marca como fallido y no se archiva.
+
+        Args:
+            result: Resultado de la extracción con los miembros registrados
+
+        Returns:
+            bool: True si todos los archivos coinciden
+        """
+        if not result.members:
+            logger.debug(f"Sin miembros registrados para verificar: {result.zip_name}")
+            return True
+
+        problems = verify_members(
+            result.extract_root, result.members, self.verify_workers
+        )
+        if problems:
+            for problem in problems:
+                logger.error(f"Verificación de {result.zip_name}: {problem}")
+            result.error = f"{len(problems)} archivos extraídos no coinciden con el ZIP"
+            return False
+
+        logger.info(
+            f"{result.zip_name}: {len(result.members)} archivos verificados (CRC-32)"
+        )
+        return True
+
+    def _record_members(
+        self,
+        result: ExtractionResult,
+        infos: List[zipfile.ZipInfo],
+        extract_path: str,
+    ) -> None:
+        """
+        Registra los miembros extraídos en el resultado, con el CRC del ZIP y
+        el tamaño del archivo en disco, para el manifiesto y la verificación
+        de integridad.
+
+        Args:
+            result: Resultado de la extracción
+            infos: Miembros extraídos
+            extract_path: Ruta donde se extrajeron los miembros
+        """
+        for info in infos:
+            if info.is_dir():
+                continue
+            target = resolve_target(extract_path, info.filename, self.router)
+            if target is None:
+                continue
+
+            # Los miembros recomprimidos se registran con su ruta y tamaño en disco
+            size = info.file_size
+            if self.zstd_store is not None and os.path.exists(target + ZSTD_SUFFIX):
+                target += ZSTD_SUFFIX
+                size = os.path.getsize(target)
+
+            result.members[self._member_key(target, result.extract_root)] = [
+                info.CRC,
+                size,
+            ]
+
+    @staticmethod
+    def _member_key(target: str, extract_root: str) -> str:
+        """
+        Calcula la clave con que se registra un archivo extraído.
+
+        Los archivos dentro del directorio del periodo se registran con su ruta
+        relativa (separador "/"); los que quedan fuera, como los que la
+        extracción directa escribe en processed, con su ruta absoluta.
+
+        Args:
+            target: Ruta del archivo escrito
+            extract_root: Directorio base de la extracción
+
+        Returns:
+            str: Ruta relativa o absoluta del archivo
+        """
+        target = os.path.abspath(target)
+        try:
+            inside = os.path.commonpath([target, extract_root]) == extract_root
+        except ValueError:
+            # Rutas en distintas unidades (Windows)
+            inside = False
+        if not inside:
+            return target
+        return os.path.relpath(target, extract_root).replace(os.sep, "/")
+
+    def _extract_zip(
+        self,
+        periodo: str,
+        zip_name: str,
+        specific_files: Optional[List[str]] = None,
+        result: Optional[ExtractionResult] = None,
+    ) -> bool:
+        """
+        Implementación de la extracción de un archivo ZIP.
+
+        Args:
+            periodo: Periodo que se está procesando (YYYYMM)
+            zip_name: Nombre del archivo ZIP a extraer
+            specific_files: Lista opcional de archivos específicos a extraer
+            result: Resultado donde registrar los contadores de la extracción
+
         Returns:
             bool: True si la extracción fue exitosa
         """
         zip_path = os.path.join(self.raw_path, periodo, zip_name)
         extract_base_path = os.path.join(self.unzipped_path, periodo)
+        if result is None:
+            result = ExtractionResult(zip_name=zip_name, success=False)
 
         try:
             # Crear directorio base
@@ -142,6 +777,7 @@ class ZipHandler:
             # Normalizar rutas para manejar espacios y caracteres especiales
             zip_path = self.normalize_path(zip_path)
             extract_path = self.normalize_path(extract_path)
+            result.extract_root = self.normalize_path(extract_base_path)
 
             # Primer intento: usar zipfile
             try:
@@ -152,73 +788,396 @@ class ZipHandler:
                         f"Contenido del ZIP {zip_name}: {len(file_list)} archivos"
                     )
 
+                    # Verificar el espacio libre antes de escribir
+                    if not self._check_space(
+                        zip_ref, extract_path, specific_files, result
+                    ):
+                        return False
+
                     if specific_files:
                         # Extraer solo archivos específicos
                         for file in specific_files:
                             if file in file_list:
-                                zip_ref.extract(file, extract_path)
+                                self._write_member(
+                                    zip_ref, zip_ref.getinfo(file), extract_path, result
+                                )
+                                result.members_extracted += 1
+                                self._record_members(
+                                    result, [zip_ref.getinfo(file)], extract_path
+                                )
                                 logger.debug(f"Extraído archivo específico: {file}")
+                    elif (
+                        self.member_filter is not None
+                        or self.nested_depth > 0
+                        or self.zstd_store is not None
+                    ):
+                        # Extraer los miembros aceptados por el filtro, abriendo
+                        # los ZIP anidados directamente desde el contenedor
+                        self._extract_stream(
+                            zip_ref, extract_path, self.nested_depth, result, zip_path
+                        )
+                        self._log_stream_report(zip_name, result)
+                    elif self.member_workers > 1 and len(file_list) > 1:
+                        # Extraer todos los archivos repartidos entre procesos
+                        self._extract_members_parallel(
+                            zip_ref, zip_path, extract_path, zip_ref.infolist(), result
+                        )
+                        result.members_extracted = len(file_list)
+                        self._record_members(result, zip_ref.infolist(), extract_path)
                     else:
                         # Extraer todos los archivos
-                        zip_ref.extractall(extract_path)
+                        for info in zip_ref.infolist():
+                            self._write_member(zip_ref, info, extract_path, result)
+                        result.members_extracted = len(file_list)
+                        self._record_members(result, zip_ref.infolist(), extract_path)
+
+                    if self.io_policy.fsync == "archive":
+                        sync_filesystem()
 
                     logger.info(f"Archivo ZIP extraído exitosamente: {zip_name}")
                     return True
 
             except (zipfile.BadZipFile, NotImplementedError) as e:
                 logger.warning(
-                    f"No se pudo extraer {zip_name} con zipfile, intentando con 7z: {str(e)}"
+                    f"No se pudo extraer {zip_name} con zipfile, "
+                    f"intentando con el motor de respaldo: {str(e)}"
                 )
-                # Segundo intento: usar 7-Zip como respaldo
-                return self.extract_with_7zip(zip_path, extract_path)
+                # Segundo intento: motor de respaldo en proceso
+                result.members = {}
+                result.members_extracted = 0
+                result.member_metrics = []
+                return self.extract_with_fallback(zip_path, extract_path, result)
 
         except Exception as e:
             logger.error(f"Error extrayendo {zip_path}: {str(e)}")
+            result.error = str(e)
+            return False
+
+    def _check_space(
+        self,
+        zip_ref: zipfile.ZipFile,
+        extract_path: str,
+        specific_files: Optional[List[str]],
+        result: ExtractionResult,
+    ) -> bool:
+        """
+        Verifica que haya espacio libre para extraer un ZIP.
+
+        Suma los tamaños descomprimidos del directorio central de los miembros
+        que se van a escribir, por cada volumen que los recibe (con extracción
+        directa, el de processed). Los ZIP anidados se cuentan por su propio
+        tamaño, por lo que la suma es una cota inferior cuando se abren desde
+        el contenedor.
+
+        Args:
+            zip_ref: ZIP abierto
+            extract_path: Ruta donde se extraerán los archivos
+            specific_files: Lista opcional de archivos específicos a extraer
+            result: Resultado donde registrar el error
+
+        Returns:
+            bool: True si el espacio alcanza
+        """
+        if specific_files:
+            infos = [
+                info for info in zip_ref.infolist() if info.filename in specific_files
+            ]
+        else:
+            infos = [
+                info
+                for info in zip_ref.infolist()
+                if not info.is_dir() and self._accepts_member(info.filename)
+            ]
+
+        try:
+            # Volumen -> [directorio de destino, bytes a escribir]
+            required: Dict[int, List] = {}
+            for info in infos:
+                target = resolve_target(extract_path, info.filename, self.router)
+                if target is None:
+                    continue
+                directory = os.path.dirname(target)
+                entry = required.setdefault(volume_id(directory), [directory, 0])
+                entry[1] += info.file_size
+
+            for directory, size in required.values():
+                check_free_space(directory, size, self.io_policy.min_free_space)
+            return True
+        except OSError as e:
+            result.error = e.strerror
+            logger.error(e.strerror)
             return False
 
-    def extract_all_nested_zips(self, base_path: str) -> bool:
+    def _extract_stream(
+        self,
+        zip_ref: zipfile.ZipFile,
+        extract_path: str,
+        depth: int,
+        result: ExtractionResult,
+        zip_path: Optional[str] = None,
+    ) -> None:
+        """
+        Extrae los miembros de un ZIP aplicando el filtro y descendiendo en ZIPs anidados.
+
+        Los ZIP anidados se abren directamente desde el flujo del miembro y se
+        extraen en la carpeta donde habrían quedado, sin escribir el ZIP
+        intermedio a disco. Solo los archivos finales llegan al disco.
+
+        Args:
+            zip_ref: ZIP abierto
+            extract_path: Ruta donde extraer los archivos
+            depth: Niveles de ZIP anidados que aún se pueden abrir
+            result: Resultado donde registrar los contadores
+            zip_path: Ruta del ZIP en disco; permite repartir miembros entre
+                procesos (no disponible para ZIPs anidados)
+        """
+        files = []
+        nested = []
+        for info in zip_ref.infolist():
+            if info.is_dir():
+                continue
+            if self.member_filter is not None and not self.member_filter.accepts(
+                info.filename
+            ):
+                result.members_skipped += 1
+                result.bytes_skipped += info.file_size
+                logger.debug(f"Miembro omitido por el filtro: {info.filename}")
+            elif depth > 0 and info.filename.lower().endswith(".zip"):
+                nested.append(info)
+            else:
+                files.append(info)
+
+        level = self.nested_depth - depth
+        if zip_path and self.member_workers > 1 and len(files) > 1:
+            self._extract_members_parallel(
+                zip_ref, zip_path, extract_path, files, result
+            )
+        else:
+            for info in files:
+                self._write_member(zip_ref, info, extract_path, result, level)
+        result.members_extracted += len(files)
+        self._record_members(result, files, extract_path)
+
+        for info in nested:
+            target = member_target_path(extract_path, info.filename)
+            if target is None:
+                logger.warning(f"ZIP anidado con ruta inválida: {info.filename}")
+                continue
+            self._extract_nested_stream(
+                zip_ref, info, os.path.dirname(target), depth - 1, result
+            )
+
+    def _extract_nested_stream(
+        self,
+        zip_ref: zipfile.ZipFile,
+        info: zipfile.ZipInfo,
+        extract_path: str,
+        depth: int,
+        result: ExtractionResult,
+    ) -> None:
+        """
+        Abre un ZIP anidado desde el flujo del contenedor y extrae su contenido.
+
+        Los ZIP anidados pequeños se cargan en memoria para permitir acceso
+        aleatorio barato; los grandes se leen desde el flujo del contenedor,
+        que admite seek. Si zipfile no soporta algún miembro del ZIP anidado,
+        se extrae con el motor de respaldo, también desde el flujo.
+
+        Args:
+            zip_ref: ZIP contenedor abierto
+            info: Miembro del contenedor que corresponde al ZIP anidado
+            extract_path: Carpeta donde extraer el contenido del ZIP anidado
+            depth: Niveles de ZIP anidados que aún se pueden abrir
+            result: Resultado donde registrar los contadores
+        """
+        os.makedirs(extract_path, exist_ok=True)
+
+        try:
+            with zip_ref.open(info) as member_stream:
+                if info.file_size <= self.nested_spool_size:
+                    source = io.BytesIO(member_stream.read())
+                else:
+                    source = member_stream
+
+                with zipfile.ZipFile(source, "r") as nested_ref:
+                    self._extract_stream(nested_ref, extract_path, depth, result)
+
+            result.nested_archives += 1
+            logger.debug(f"ZIP anidado extraído desde el contenedor: {info.filename}")
+
+        except (zipfile.BadZipFile, NotImplementedError) as e:
+            logger.warning(
+                f"No se pudo leer {info.filename} con zipfile, "
+                f"se usará el motor de respaldo: {str(e)}"
+            )
+            with zip_ref.open(info) as member_stream:
+                if info.file_size <= self.nested_spool_size:
+                    source = io.BytesIO(member_stream.read())
+                else:
+                    source = member_stream
+                extracted = self.fallback.extract(
+                    source,
+                    extract_path,
+                    self._accepts_member,
+                    self._fallback_recorder(result, self.nested_depth - depth),
+                    self._target_resolver(extract_path),
+                )
+            result.fallback = True
+            self._record_fallback(result, extracted, extract_path)
+            result.nested_archives += 1
+
+    def _log_stream_report(self, zip_name: str, result: ExtractionResult) -> None:
+        """
+        Registra en el log el resumen de una extracción por flujo.
+
+        Args:
+            zip_name: Nombre del ZIP extraído
+            result: Resultado con los contadores de la extracción
+        """
+        message = f"{zip_name}: {result.members_extracted} miembros extraídos"
+        if self.member_filter is not None:
+            message += (
+                f", {result.members_skipped} omitidos "
+                f"({result.bytes_skipped / 1024 ** 2:.1f} MB no escritos)"
+            )
+        if result.nested_archives:
+            message += (
+                f", {result.nested_archives} ZIPs anidados sin escritura intermedia"
+            )
+        logger.info(message)
+
+    def _extract_members_parallel(
+        self,
+        zip_ref: zipfile.ZipFile,
+        zip_path: str,
+        extract_path: str,
+        infos: List[zipfile.ZipInfo],
+        result: ExtractionResult,
+    ) -> None:
+        """
+        Extrae los miembros de un ZIP repartiéndolos entre varios procesos.
+
+        Cada proceso abre su propio handle del ZIP y recibe un grupo de miembros
+        balanceado por tamaño descomprimido.
+
+        Args:
+            zip_ref: ZIP abierto, usado para leer el directorio central
+            zip_path: Ruta al archivo ZIP
+            extract_path: Ruta donde extraer los archivos
+            infos: Miembros a extraer
+            result: Resultado donde registrar las métricas de los miembros
+        """
+        groups = split_members_by_size(
+            [info for info in infos if not info.is_dir()], self.member_workers
+        )
+
+        # Los directorios se crean antes para evitar carreras entre procesos
+        for info in infos:
+            target = resolve_target(extract_path, info.filename, self.router)
+            if target is None:
+                continue
+            directory = target if info.is_dir() else os.path.dirname(target)
+            os.makedirs(directory, exist_ok=True)
+
+        logger.debug(
+            f"Extrayendo {os.path.basename(zip_path)} con {len(groups)} procesos"
+        )
+
+        with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+            futures = [
+                executor.submit(
+                    _extract_members,
+                    zip_path,
+                    group,
+                    extract_path,
+                    self.zstd_store,
+                    self.io_policy,
+                    self.router,
+                )
+                for group in groups
+            ]
+            for future in futures:
+                result.member_metrics.extend(future.result())
+
+    def extract_all_nested_zips(
+        self, base_path: str, processed_files: Optional[Set[str]] = None
+    ) -> bool:
         """
         Extrae todos los archivos ZIP encontrados dentro del directorio base.
 
+        Recorre el directorio en pasadas sucesivas hasta que no aparezcan ZIPs
+        nuevos, de modo que también se extraen los ZIP que surgen al extraer otros.
+
         Args:
             base_path: Ruta base donde buscar ZIPs anidados
+            processed_files: Conjunto opcional de ZIPs ya extraídos; permite
+                llamar al método varias veces sin repetir extracciones
 
         Returns:
             bool: True si todas las extracciones fueron exitosas
         """
         try:
             overall_success = True
-            processed_files = set()  # Evita procesar el mismo archivo múltiples veces
+            if processed_files is None:
+                # Evita procesar el mismo archivo múltiples veces
+                processed_files = set()
 
-            for root, _, files in os.walk(base_path):
-                for file in files:
-                    if not file.lower().endswith(".zip"):
-                        continue
-
-                    zip_path = os.path.join(root, file)
-                    if zip_path in processed_files:
-                        continue
+            depth = 0
+            while True:
+                pending = [
+                    os.path.join(root, file)
+                    for root, _, files in os.walk(base_path)
+                    for file in files
+                    if file.lower().endswith(".zip")
+                    and os.path.join(root, file) not in processed_files
+                ]
+                if not pending:
+                    break
+                # Cada pasada extrae un nivel más de anidamiento
+                depth += 1
 
+                for zip_path in pending:
+                    # Se marca antes de extraer para no reintentar ZIPs fallidos
+                    processed_files.add(zip_path)
                     extract_path = os.path.dirname(os.path.abspath(zip_path))
+                    result = ExtractionResult(
+                        zip_name=os.path.relpath(zip_path, base_path),
+                        success=False,
+                        depth=depth,
+                        archive_bytes=os.path.getsize(zip_path),
+                    )
+                    start_time = time.perf_counter()
+                    start_cpu = time.process_time()
 
                     try:
                         # Primer intento con zipfile
                         try:
                             with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                                zip_ref.extractall(extract_path)
+                                for info in zip_ref.infolist():
+                                    if self._accepts_member(info.filename):
+                                        self._write_member(
+                                            zip_ref, info, extract_path, result, depth
+                                        )
+                            result.success = True
                             logger.info(f"ZIP anidado extraído: {zip_path}")
-                            processed_files.add(zip_path)
                         except (zipfile.BadZipFile, NotImplementedError):
-                            # Segundo intento con 7z
-                            if self.extract_with_7zip(zip_path, extract_path):
-                                processed_files.add(zip_path)
-                            else:
+                            # Segundo intento con el motor de respaldo
+                            result.member_metrics = []
+                            result.success = self.extract_with_fallback(
+                                zip_path, extract_path, result
+                            )
+                            if not result.success:
                                 overall_success = False
 
                     except Exception as e:
                         logger.error(f"Error procesando ZIP {zip_path}: {str(e)}")
+                        result.error = str(e)
                         overall_success = False
 
+                    result.duration = time.perf_counter() - start_time
+                    result.cpu_seconds = time.process_time() - start_cpu
+                    self.record_metrics(result)
+
             return overall_success
 
         except Exception as e:
@@ -227,34 +1186,65 @@ class ZipHandler:
 
     def archive_zip(self, periodo: str, zip_name: str) -> bool:
         """
-        Mueve un archivo ZIP procesado al directorio de archivo.
+        Archiva un archivo ZIP procesado en el almacén direccionado por contenido.
+
+        El ZIP se guarda una sola vez por contenido (ver ArchiveStore); si ya
+        había una copia idéntica archivada, solo se registra la entrada en el
+        índice del periodo y se elimina el ZIP de raw.
 
         Args:
             periodo: Periodo del archivo (YYYYMM)
             zip_name: Nombre del archivo ZIP a archivar
 
         Returns:
-            bool: True si el archivo fue movido exitosamente
+            bool: True si el archivo fue archivado exitosamente
         """
         source_path = os.path.join(self.raw_path, periodo, zip_name)
-        archive_dir = os.path.join(self.archive_path, periodo)
 
         try:
-            os.makedirs(archive_dir, exist_ok=True)
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            base_name, ext = os.path.splitext(zip_name)
-            archive_name = f"{base_name}_{timestamp}{ext}"
-            archive_path = os.path.join(archive_dir, archive_name)
-
-            shutil.move(source_path, archive_path)
-            logger.info(f"ZIP archivado: {archive_path}")
+            entry = self.archive_store.add(periodo, source_path)
+            if entry["duplicate"]:
+                logger.info(
+                    f"ZIP idéntico ya archivado, no se guarda otra copia: "
+                    f"{zip_name} ({entry['digest'][:12]})"
+                )
+            else:
+                logger.info(f"ZIP archivado: {zip_name} -> {entry['path']}")
             return True
 
         except Exception as e:
             logger.error(f"Error archivando {source_path}: {str(e)}")
             return False
 
+    def update_catalog(self, periodo: Optional[str] = None) -> int:
+        """
+        Actualiza el catálogo de miembros con los ZIP de raw y archive.
+
+        Solo se leen los directorios centrales de los ZIP nuevos o modificados.
+
+        Args:
+            periodo: Periodo a catalogar; si es None se catalogan todos
+
+        Returns:
+            int: Cantidad de ZIP leídos
+        """
+        if not self.catalog_path:
+            return 0
+
+        try:
+            catalog = ArchiveCatalog(self.catalog_path)
+            try:
+                scanned = catalog.scan(self.raw_path, periodo)
+                scanned += catalog.scan(self.archive_path, periodo)
+            finally:
+                catalog.close()
+            logger.info(f"Catálogo de ZIPs actualizado: {scanned} ZIPs leídos")
+            return scanned
+
+        except Exception as e:
+            logger.error(f"Error actualizando el catálogo de ZIPs: {str(e)}")
+            return 0
+
     def list_zip_files(self, periodo: str) -> List[str]:
         """
         Lista todos los archivos ZIP en el directorio del periodo.
@@ -271,6 +1261,98 @@ class ZipHandler:
             return []
         return [f for f in os.listdir(periodo_path) if f.endswith(".zip")]
 
+    def extract_zips(
+        self,
+        periodo: str,
+        zip_files: List[str],
+        specific_files: Optional[List[str]] = None,
+    ) -> List[ExtractionResult]:
+        """
+        Extrae un conjunto de ZIPs del periodo.
+
+        Con max_workers > 1 cada ZIP se extrae en su propio proceso, de modo que
+        el tiempo total se acerca al del ZIP más grande en lugar de la suma de todos.
+
+        Args:
+            periodo: Periodo a procesar (YYYYMM)
+            zip_files: Nombres de los archivos ZIP a extraer
+            specific_files: Lista opcional de archivos específicos a extraer
+
+        Returns:
+            List[ExtractionResult]: Resultado de cada ZIP, en el orden de zip_files
+        """
+        manifest = None
+        if self.use_manifest and not specific_files:
+            manifest = ExtractionManifest(os.path.join(self.unzipped_path, periodo))
+
+        workers = min(self.max_workers, len(zip_files))
+        if workers <= 1:
+            results = []
+            for zip_file in zip_files:
+                result = self.extract_zip_result(periodo, zip_file, specific_files)
+                self.update_manifest(manifest, result)
+                results.append(result)
+            return results
+
+        logger.info(f"Extrayendo {len(zip_files)} ZIPs con {workers} procesos")
+        results: Dict[str, ExtractionResult] = {}
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    self.extract_zip_result, periodo, zip_file, specific_files
+                ): zip_file
+                for zip_file in zip_files
+            }
+            for future in as_completed(futures):
+                zip_file = futures[future]
+                try:
+                    results[zip_file] = future.result()
+                except Exception as e:
+                    # El proceso de extracción terminó de forma anómala
+                    results[zip_file] = ExtractionResult(
+                        zip_name=zip_file, success=False, error=str(e)
+                    )
+                self.update_manifest(manifest, results[zip_file])
+
+        return [results[zip_file] for zip_file in zip_files]
+
+    def update_manifest(
+        self, manifest: Optional[ExtractionManifest], result: ExtractionResult
+    ) -> None:
+        """
+        Actualiza el manifiesto del periodo con el resultado de una extracción.
+
+        Se guarda después de cada ZIP para que una ejecución interrumpida pueda
+        retomarse omitiendo los ZIP que ya quedaron extraídos.
+
+        Args:
+            manifest: Manifiesto del periodo (None si no se usa)
+            result: Resultado de la extracción
+        """
+        if manifest is None or result.unchanged:
+            return
+
+        if result.success and result.signature:
+            manifest.record(result.zip_name, result.signature, result.members)
+        else:
+            manifest.discard(result.zip_name)
+
+        try:
+            manifest.save()
+        except OSError as e:
+            logger.warning(f"No se pudo guardar el manifiesto de extracción: {str(e)}")
+
+    def record_metrics(self, result: ExtractionResult) -> None:
+        """
+        Escribe las métricas de una extracción en el archivo de la ejecución.
+
+        Args:
+            result: Resultado de la extracción
+        """
+        if self.metrics_path:
+            MetricsWriter(self.metrics_path).write_result(result)
+
     def process_period_zips(
         self, periodo: str, specific_files: Optional[List[str]] = None
     ) -> bool:
@@ -279,8 +1361,8 @@ class ZipHandler:
 
         Este método:
         1. Lista todos los ZIP del periodo
-        2. Extrae cada ZIP al directorio unzipped
-        3. Archiva los ZIP originales
+        2. Extrae cada ZIP al directorio unzipped (en paralelo si max_workers > 1)
+        3. Archiva los ZIP originales que se extrajeron correctamente
 
         Args:
             periodo: Periodo a procesar (YYYYMM)
@@ -295,15 +1377,32 @@ class ZipHandler:
             return False
 
         overall_success = True
+        total_skipped = 0
+        total_bytes_skipped = 0
 
-        for zip_file in zip_files:
-            success = self.extract_zip(periodo, zip_file, specific_files)
-            if success:
-                if not self.archive_zip(periodo, zip_file):
+        for result in self.extract_zips(periodo, zip_files, specific_files):
+            self.record_metrics(result)
+            total_skipped += result.members_skipped
+            total_bytes_skipped += result.bytes_skipped
+            if result.success:
+                logger.info(
+                    f"ZIP {result.zip_name} extraído en {result.duration:.1f} s"
+                )
+                if not self.archive_zip(periodo, result.zip_name):
                     overall_success = False
             else:
+                if result.error:
+                    logger.error(f"Error extrayendo {result.zip_name}: {result.error}")
                 overall_success = False
 
+        if self.member_filter is not None:
+            logger.info(
+                f"Extracción selectiva: {total_skipped} miembros omitidos, "
+                f"{total_bytes_skipped / 1024 ** 2:.1f} MB no escritos"
+            )
+
+        self.update_catalog(periodo)
+
         if not overall_success:
             logger.warning("Algunos archivos no se pudieron procesar correctamente")
 
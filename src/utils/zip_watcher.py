@@ -0,0 +1,398 @@
+"""
+Vigilancia del directorio raw/<periodo> para extraer los ZIP a medida que llegan.
+Permite que la descarga, la extracción y la organización de archivos se
+superpongan en lugar de ejecutarse una después de la otra.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import time
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from .extraction_manifest import ExtractionManifest
+from .zip_handler import ExtractionResult, ZipHandler
+
+logger = logging.getLogger(__name__)
+
+# Eventos de inotify (ver inotify(7))
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+# Cabecera de un evento: wd, mask, cookie y largo del nombre
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatch:
+    """
+    Vigilancia de un directorio con inotify (solo Linux), usando ctypes.
+
+    Entrega los nombres de los archivos creados, modificados, cerrados tras
+    escritura o movidos al directorio.
+    """
+
+    def __init__(self, path: str):
+        """
+        Registra la vigilancia del directorio.
+
+        Args:
+            path: Directorio a vigilar
+
+        Raises:
+            OSError: Si inotify no está disponible o falla el registro
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+
+        watch = libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if watch < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch: {path}")
+
+    def read(self, timeout: float) -> Set[str]:
+        """
+        Espera eventos y retorna los nombres de archivo afectados.
+
+        Args:
+            timeout: Tiempo máximo de espera en segundos
+
+        Returns:
+            Set[str]: Nombres de archivo con eventos (vacío si no hubo)
+        """
+        names: Set[str] = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return names
+
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if name:
+                    names.add(os.fsdecode(name))
+
+        return names
+
+    def close(self) -> None:
+        """Libera el descriptor de inotify."""
+        os.close(self.fd)
+
+
+def create_inotify(path: str) -> Optional[InotifyWatch]:
+    """
+    Crea una vigilancia inotify si el sistema la soporta.
+
+    Args:
+        path: Directorio a vigilar
+
+    Returns:
+        Optional[InotifyWatch]: Vigilancia creada o None (se usará sondeo)
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return InotifyWatch(path)
+    except (OSError, AttributeError) as e:
+        logger.warning(f"inotify no disponible, se usará sondeo: {str(e)}")
+        return None
+
+
+class ZipWatcher:
+    """
+    Vigila raw/<periodo> y extrae cada ZIP en cuanto termina de descargarse.
+
+    Un ZIP se considera completo cuando su tamaño y fecha de modificación no
+    cambian durante `stable_seconds` y su directorio central es válido. La
+    extracción corre en procesos aparte mientras se sigue vigilando; cada ZIP
+    extraído correctamente se archiva. Cuando no quedan ZIP pendientes se
+    extraen los ZIP anidados y se invoca `on_idle` (por ejemplo, para
+    organizar los archivos ya extraídos) en un hilo aparte. Mientras on_idle
+    corre no hay extracciones en curso y los ZIP nuevos esperan a que termine,
+    para que nunca lea archivos a medio escribir.
+    """
+
+    def __init__(
+        self,
+        zip_handler: ZipHandler,
+        periodo: str,
+        stable_seconds: float = 10.0,
+        poll_interval: float = 2.0,
+        idle_timeout: Optional[float] = None,
+        on_idle: Optional[Callable[[], None]] = None,
+    ):
+        """
+        Inicializa la vigilancia.
+
+        Args:
+            zip_handler: Manejador usado para extraer y archivar los ZIP
+            periodo: Periodo a vigilar (YYYYMM)
+            stable_seconds: Segundos sin cambios para considerar completo un ZIP
+            poll_interval: Intervalo (segundos) entre revisiones del directorio
+            idle_timeout: Segundos sin ZIP nuevos tras los cuales se termina la
+                vigilancia (None vigila hasta que se interrumpa)
+            on_idle: Función opcional que se invoca en un hilo aparte cuando
+                no quedan ZIP pendientes y hubo extracciones desde la última
+                invocación; mientras corre no se inician extracciones (no se
+                invoca al terminar la vigilancia)
+        """
+        self.zip_handler = zip_handler
+        self.periodo = periodo
+        self.stable_seconds = stable_seconds
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.on_idle = on_idle
+        self.watch_path = os.path.join(zip_handler.raw_path, periodo)
+
+        # ZIP en espera de estabilizarse: nombre -> ((tamaño, mtime), desde)
+        self.candidates: Dict[str, Tuple[Tuple[int, float], float]] = {}
+        # ZIP enviados a extraer: nombre -> (tamaño, mtime) al enviarlos
+        self.submitted: Dict[str, Tuple[int, float]] = {}
+        self.nested_processed: Set[str] = set()
+        self.success = True
+        self._pending_idle = False
+        self._idle_executor: Optional[ThreadPoolExecutor] = None
+        self._idle_future: Optional[Future] = None
+
+    def is_complete(self, zip_path: str) -> bool:
+        """
+        Indica si un ZIP tiene un directorio central válido.
+
+        Args:
+            zip_path: Ruta al archivo ZIP
+
+        Returns:
+            bool: True si el ZIP se puede abrir
+        """
+        try:
+            with zipfile.ZipFile(zip_path, "r"):
+                return True
+        except (zipfile.BadZipFile, OSError):
+            return False
+
+    def run(self) -> bool:
+        """
+        Vigila el directorio hasta el tiempo de inactividad o una interrupción.
+
+        Returns:
+            bool: True si todos los ZIP detectados se extrajeron y archivaron
+        """
+        os.makedirs(self.watch_path, exist_ok=True)
+        inotify = create_inotify(self.watch_path)
+        logger.info(
+            f"Vigilando {self.watch_path} "
+            f"({'inotify' if inotify else 'sondeo'}, "
+            f"estable tras {self.stable_seconds:.0f} s)"
+        )
+
+        manifest = None
+        if self.zip_handler.use_manifest:
+            manifest = ExtractionManifest(
+                os.path.join(self.zip_handler.unzipped_path, self.periodo)
+            )
+
+        futures: Dict[Future, str] = {}
+        last_activity = time.monotonic()
+        self._idle_executor = ThreadPoolExecutor(max_workers=1)
+
+        with ProcessPoolExecutor(max_workers=self.zip_handler.max_workers) as executor:
+            try:
+                names = set(self.zip_handler.list_zip_files(self.periodo))
+                while True:
+                    if inotify is not None:
+                        names |= inotify.read(self.poll_interval)
+                    else:
+                        time.sleep(self.poll_interval)
+                        names |= set(self.zip_handler.list_zip_files(self.periodo))
+
+                    if self.is_idle_running():
+                        # Los ZIP nuevos se extraen cuando termina on_idle
+                        continue
+
+                    names |= set(self.candidates)
+                    for name in sorted(names):
+                        if name.endswith(".zip") and self._is_ready(name):
+                            logger.info(f"ZIP completo, iniciando extracción: {name}")
+                            future = executor.submit(
+                                self.zip_handler.extract_zip_result, self.periodo, name
+                            )
+                            futures[future] = name
+                            last_activity = time.monotonic()
+                    names = set()
+
+                    if self._collect(futures, manifest, wait=False):
+                        last_activity = time.monotonic()
+
+                    if not futures and not self.candidates:
+                        self._finish_batch()
+                        idle = time.monotonic() - last_activity
+                        if self.idle_timeout is not None and idle >= self.idle_timeout:
+                            logger.info(
+                                f"Sin ZIP nuevos en {idle:.0f} s, fin de la vigilancia"
+                            )
+                            break
+
+            except KeyboardInterrupt:
+                logger.info("Vigilancia interrumpida, esperando extracciones en curso")
+            finally:
+                if inotify is not None:
+                    inotify.close()
+
+            self._collect(futures, manifest, wait=True)
+
+        # Se espera la invocación de on_idle en curso antes de completar el lote
+        self._idle_executor.shutdown(wait=True)
+        self._idle_executor = None
+
+        # Al terminar solo se completa el lote
+        self._finish_batch(notify=False)
+        return self.success
+
+    def _is_ready(self, name: str) -> bool:
+        """
+        Actualiza el estado de un ZIP e indica si ya se puede extraer.
+
+        Args:
+            name: Nombre del archivo ZIP
+
+        Returns:
+            bool: True si el ZIP está completo y aún no se envió a extraer
+        """
+        zip_path = os.path.join(self.watch_path, name)
+        try:
+            stat = os.stat(zip_path)
+        except FileNotFoundError:
+            self.candidates.pop(name, None)
+            return False
+
+        key = (stat.st_size, stat.st_mtime)
+        if self.submitted.get(name) == key:
+            return False
+
+        now = time.monotonic()
+        previous = self.candidates.get(name)
+        if previous is None or previous[0] != key:
+            self.candidates[name] = (key, now)
+            return False
+        if now - previous[1] < self.stable_seconds:
+            return False
+
+        if not self.is_complete(zip_path):
+            # El tamaño no cambió pero el ZIP aún no es válido: se sigue esperando
+            logger.debug(f"ZIP sin directorio central válido todavía: {name}")
+            self.candidates[name] = (key, now)
+            return False
+
+        del self.candidates[name]
+        self.submitted[name] = key
+        return True
+
+    def _collect(
+        self,
+        futures: Dict[Future, str],
+        manifest: Optional[ExtractionManifest],
+        wait: bool,
+    ) -> bool:
+        """
+        Procesa las extracciones terminadas: manifiesto y archivado.
+
+        Args:
+            futures: Extracciones en curso (se eliminan las terminadas)
+            manifest: Manifiesto del periodo (None si no se usa)
+            wait: Esperar a que terminen todas las extracciones
+
+        Returns:
+            bool: True si terminó alguna extracción
+        """
+        done = [future for future in futures if wait or future.done()]
+        for future in done:
+            name = futures.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                result = ExtractionResult(zip_name=name, success=False, error=str(e))
+            self.zip_handler.update_manifest(manifest, result)
+            self.zip_handler.record_metrics(result)
+
+            if result.success:
+                logger.info(f"ZIP {name} extraído en {result.duration:.1f} s")
+                if self.zip_handler.archive_zip(self.periodo, name):
+                    # Una re-emisión con el mismo nombre se volverá a extraer
+                    self.submitted.pop(name, None)
+                else:
+                    self.success = False
+                self._pending_idle = True
+            else:
+                if result.error:
+                    logger.error(f"Error extrayendo {name}: {result.error}")
+                self.success = False
+
+        return bool(done)
+
+    def _finish_batch(self, notify: bool = True) -> None:
+        """
+        Completa un lote de extracciones cuando no quedan ZIP pendientes.
+
+        Extrae los ZIP anidados nuevos, actualiza el catálogo e inicia on_idle
+        en el hilo de notificación. Solo se llama sin extracciones en curso y
+        sin una invocación de on_idle en curso.
+
+        Args:
+            notify: Invocar on_idle al completar el lote
+        """
+        if not self._pending_idle:
+            return
+        self._pending_idle = False
+
+        unzipped_path = os.path.join(self.zip_handler.unzipped_path, self.periodo)
+        if not self.zip_handler.extract_all_nested_zips(
+            unzipped_path, self.nested_processed
+        ):
+            self.success = False
+        self.zip_handler.update_catalog(self.periodo)
+
+        if notify and self.on_idle is not None:
+            self._idle_future = self._idle_executor.submit(self._run_idle)
+
+    def is_idle_running(self) -> bool:
+        """
+        Indica si on_idle se está ejecutando.
+
+        Returns:
+            bool: True si hay una invocación de on_idle en curso
+        """
+        return self._idle_future is not None and not self._idle_future.done()
+
+    def _run_idle(self) -> None:
+        """Invoca on_idle registrando los errores en lugar de propagarlos."""
+        try:
+            self.on_idle()
+        except Exception as e:
+            logger.error(f"Error en la notificación de lote completo: {str(e)}")
@@ -0,0 +1,177 @@
+"""
+Almacenamiento comprimido con zstd para los archivos extraídos.
+Los archivos de texto grandes (CSV de 15 minutos) se guardan en formato zstd
+con tramas buscables (seekable), y los lectores los abren de forma transparente.
+"""
+
+import logging
+import os
+import shutil
+import zipfile
+from pathlib import Path
+from typing import IO, Dict, Iterable, Optional, Union
+
+import pyzstd
+
+from .io_engine import partial_file
+
+logger = logging.getLogger(__name__)
+
+ZSTD_SUFFIX = ".zst"
+
+
+def is_compressed(path: Union[str, Path]) -> bool:
+    """
+    Indica si una ruta corresponde a un archivo comprimido con zstd.
+
+    Args:
+        path: Ruta al archivo
+
+    Returns:
+        bool: True si el archivo tiene extensión .zst
+    """
+    return str(path).lower().endswith(ZSTD_SUFFIX)
+
+
+def plain_name(name: str) -> str:
+    """
+    Obtiene el nombre original de un archivo, sin la extensión .zst.
+
+    Args:
+        name: Nombre o ruta del archivo
+
+    Returns:
+        str: Nombre sin la extensión de compresión
+    """
+    return name[: -len(ZSTD_SUFFIX)] if is_compressed(name) else name
+
+
+def open_file(path: Union[str, Path]) -> IO[bytes]:
+    """
+    Abre un archivo en modo binario, descomprimiéndolo si es zstd.
+
+    El objeto retornado admite seek en ambos casos.
+
+    Args:
+        path: Ruta al archivo (comprimido o no)
+
+    Returns:
+        IO[bytes]: Objeto de archivo binario
+    """
+    if is_compressed(path):
+        return pyzstd.SeekableZstdFile(path, "r")
+    return open(path, "rb")
+
+
+def resolve_path(path: Union[str, Path]) -> Optional[Path]:
+    """
+    Resuelve la ruta de un archivo que puede estar comprimido en disco.
+
+    Args:
+        path: Ruta al archivo sin comprimir
+
+    Returns:
+        Optional[Path]: Ruta existente (original o .zst) o None
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+    compressed = path.with_name(path.name + ZSTD_SUFFIX)
+    if compressed.exists():
+        return compressed
+    return None
+
+
+class ZstdStore:
+    """
+    Política de compresión en reposo para los miembros extraídos.
+
+    Define qué miembros se recomprimen (por extensión y tamaño) y los escribe
+    como archivos zstd con tramas buscables.
+    """
+
+    def __init__(
+        self,
+        level: int = 3,
+        min_size: int = 64 * 1024 * 1024,
+        extensions: Iterable[str] = (".csv", ".tsv"),
+        frame_size: int = 64 * 1024 * 1024,
+        buffer_size: int = 4 * 1024 * 1024,
+    ):
+        """
+        Inicializa la política de compresión.
+
+        Args:
+            level: Nivel de compresión zstd
+            min_size: Tamaño mínimo (bytes descomprimidos) para recomprimir
+            extensions: Extensiones de los archivos de texto a recomprimir
+            frame_size: Tamaño de cada trama; tramas menores aceleran el seek
+            buffer_size: Tamaño del buffer de copia en bytes
+        """
+        self.level = level
+        self.min_size = min_size
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.frame_size = frame_size
+        self.buffer_size = buffer_size
+
+    def signature(self) -> Dict:
+        """
+        Describe qué miembros se guardan comprimidos y cómo.
+
+        Permite que el manifiesto de extracción detecte un cambio de política
+        y vuelva a extraer los ZIP cuyos archivos quedarían distintos.
+
+        Returns:
+            Dict: Nivel, tamaño mínimo y extensiones (listas, como en JSON)
+        """
+        return {
+            "level": self.level,
+            "min_size": self.min_size,
+            "extensions": list(self.extensions),
+        }
+
+    def should_compress(self, info: zipfile.ZipInfo) -> bool:
+        """
+        Indica si un miembro debe guardarse comprimido.
+
+        Args:
+            info: Miembro del ZIP
+
+        Returns:
+            bool: True si cumple la extensión y el tamaño mínimo
+        """
+        return (
+            info.filename.lower().endswith(self.extensions)
+            and info.file_size >= self.min_size
+        )
+
+    def write(self, source: IO[bytes], target: str) -> str:
+        """
+        Escribe un flujo como archivo zstd buscable.
+
+        Args:
+            source: Flujo con los datos sin comprimir
+            target: Ruta del archivo original (se le agrega .zst)
+
+        Returns:
+            str: Ruta del archivo comprimido
+        """
+        compressed_path = target + ZSTD_SUFFIX
+        os.makedirs(os.path.dirname(compressed_path), exist_ok=True)
+
+        # Se escribe con un nombre temporal para no exponer un archivo a medias
+        with partial_file(compressed_path) as temporary:
+            with pyzstd.SeekableZstdFile(
+                temporary,
+                "w",
+                level_or_option=self.level,
+                max_frame_content_size=self.frame_size,
+            ) as destination:
+                shutil.copyfileobj(source, destination, self.buffer_size)
+
+        # Si quedó una copia sin comprimir de una ejecución anterior, se elimina
+        if os.path.exists(target):
+            os.remove(target)
+
+        logger.debug(f"Archivo guardado comprimido: {compressed_path}")
+        return compressed_path
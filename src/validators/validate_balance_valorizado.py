@@ -1,9 +1,11 @@
 import os
+import shutil
 import logging
 import pandas as pd
 import mysql.connector
 from pathlib import Path
 from src.utils.config_loader import ConfigLoader
+from src.utils.zstd_store import is_compressed, open_file, resolve_path
 from src.utils.homologation_dictionaries import (
     barras_dict,
     empresas_dict,
@@ -69,13 +71,24 @@ class ValidateBalanceValorizado:
             / f"Balance_Valorizado_{period[-4:]}_Data_VALORIZADO_15min.csv"
         )
 
-        if not file_path.exists():
+        resolved_path = resolve_path(file_path)
+        if resolved_path is None:
             logger.error(f"El archivo {file_path} no existe.")
             return
 
-        mysql_file_path = str(file_path).replace("\\", "/")
-
+        temp_file = None
         try:
+            if is_compressed(resolved_path):
+                # LOAD DATA necesita el CSV sin comprimir: se descomprime a un temporal
+                logger.info(f"Descomprimiendo {resolved_path.name} para la carga...")
+                temp_file = file_path.with_name(file_path.name + ".tmp")
+                with open_file(resolved_path) as source:
+                    with open(temp_file, "wb") as target:
+                        shutil.copyfileobj(source, target, 4 * 1024 * 1024)
+                file_path = temp_file
+
+            mysql_file_path = str(file_path).replace("\\", "/")
+
             cursor_main = self.connection_main.cursor()
 
             # Crear tabla temporal si no existe
@@ -106,6 +119,11 @@ class ValidateBalanceValorizado:
 
         except mysql.connector.Error as e:
             logger.error(f"Error durante la carga a la tabla temporal: {str(e)}")
+        except OSError as e:
+            logger.error(f"Error al descomprimir {resolved_path}: {str(e)}")
+        finally:
+            if temp_file is not None and temp_file.exists():
+                temp_file.unlink()
 
     def validate_and_correct(self, period: str):
         """
@@ -0,0 +1,43 @@
+"""
+Configuración común de las pruebas.
+"""
+
+import os
+import sys
+import zipfile
+from typing import Dict
+
+import pytest
+
+# Permite importar el paquete src al ejecutar pytest desde cualquier carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def write_zip(path: str, members: Dict[str, bytes]) -> str:
+    """
+    Crea un ZIP con los miembros indicados.
+
+    Args:
+        path: Ruta del ZIP a crear
+        members: Contenido de cada miembro {nombre: bytes}
+
+    Returns:
+        str: Ruta del ZIP creado
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+        for name, data in members.items():
+            zip_ref.writestr(name, data)
+    return path
+
+
+@pytest.fixture
+def data_dirs(tmp_path):
+    """Directorios raw, unzipped, archive y processed de una prueba."""
+    dirs = {
+        name: str(tmp_path / name)
+        for name in ("raw", "unzipped", "archive", "processed")
+    }
+    for path in dirs.values():
+        os.makedirs(path)
+    return dirs
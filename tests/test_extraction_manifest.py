@@ -0,0 +1,94 @@
+"""
+Pruebas del manifiesto de extracción (ExtractionManifest).
+"""
+
+import os
+
+from conftest import write_zip
+from src.utils.extraction_manifest import ExtractionManifest, archive_signature
+from src.utils.io_engine import IOPolicy
+from src.utils.zip_handler import ZipHandler
+from src.utils.zstd_store import ZstdStore
+
+PERIODO = "202407"
+CONTENT = b"fecha;monto\n" + b"2024-07-01;100\n" * 200
+
+
+def make_handler(data_dirs, **kwargs) -> ZipHandler:
+    return ZipHandler(
+        data_dirs["raw"],
+        data_dirs["unzipped"],
+        data_dirs["archive"],
+        use_manifest=True,
+        io_policy=IOPolicy(min_free_space=0),
+        **kwargs,
+    )
+
+
+def extract(handler: ZipHandler):
+    return handler.extract_zips(PERIODO, ["ventas.zip"])[0]
+
+
+def extracted_path(data_dirs) -> str:
+    return os.path.join(data_dirs["unzipped"], PERIODO, "a", "v.csv")
+
+
+def test_manifest_records_crc_and_skips_unchanged_zip(data_dirs):
+    write_zip(
+        os.path.join(data_dirs["raw"], PERIODO, "ventas.zip"), {"a/v.csv": CONTENT}
+    )
+    handler = make_handler(data_dirs, verify_workers=2)
+
+    assert not extract(handler).unchanged
+    manifest = ExtractionManifest(os.path.join(data_dirs["unzipped"], PERIODO))
+    crc, size = manifest.get_members("ventas.zip")["a/v.csv"]
+    assert size == len(CONTENT) and crc != 0
+
+    assert extract(handler).unchanged
+
+
+def test_same_size_change_on_disk_is_detected_with_crc(data_dirs):
+    write_zip(
+        os.path.join(data_dirs["raw"], PERIODO, "ventas.zip"), {"a/v.csv": CONTENT}
+    )
+    extract(make_handler(data_dirs, verify_workers=2))
+
+    with open(extracted_path(data_dirs), "r+b") as file:
+        file.write(b"FECHA")
+
+    # Sin verificación solo se comparan tamaños
+    assert extract(make_handler(data_dirs)).unchanged
+    result = extract(make_handler(data_dirs, verify_workers=2))
+    assert not result.unchanged and result.success
+    with open(extracted_path(data_dirs), "rb") as file:
+        assert file.read() == CONTENT
+
+
+def test_extraction_settings_change_forces_extraction(data_dirs):
+    write_zip(
+        os.path.join(data_dirs["raw"], PERIODO, "ventas.zip"), {"a/v.csv": CONTENT}
+    )
+    extract(make_handler(data_dirs))
+
+    assert not extract(make_handler(data_dirs, nested_depth=2)).unchanged
+    assert extract(make_handler(data_dirs, nested_depth=2)).unchanged
+    store = ZstdStore(min_size=0)
+    assert not extract(
+        make_handler(data_dirs, nested_depth=2, zstd_store=store)
+    ).unchanged
+    assert os.path.exists(extracted_path(data_dirs) + ".zst")
+
+
+def test_legacy_size_only_entries_are_reextracted_when_verifying(data_dirs):
+    zip_path = write_zip(
+        os.path.join(data_dirs["raw"], PERIODO, "ventas.zip"), {"a/v.csv": CONTENT}
+    )
+    handler = make_handler(data_dirs, verify_workers=2)
+    extract(handler)
+    period_path = os.path.join(data_dirs["unzipped"], PERIODO)
+    manifest = ExtractionManifest(period_path)
+    signature = archive_signature(zip_path, handler._extraction_settings())
+    manifest.record("ventas.zip", signature, {"a/v.csv": len(CONTENT)})
+
+    assert manifest.is_unchanged("ventas.zip", signature)
+    assert not manifest.is_unchanged("ventas.zip", signature, verify_workers=2)
@@ -0,0 +1,103 @@
+"""
+Pruebas del motor de respaldo (FallbackExtractor) con archivos 7z.
+"""
+
+import os
+import zlib
+from typing import Dict, Optional
+
+import py7zr
+
+from src.utils.extraction_manifest import ExtractionManifest
+from src.utils.io_engine import IOPolicy
+from src.utils.zip_handler import ZipHandler
+
+PERIODO = "202407"
+CONTENT = b"fecha;monto\n" + b"2024-07-01;100\n" * 200
+
+
+def write_7z(path: str, extra: Optional[Dict[str, bytes]] = None) -> str:
+    """Crea un 7z sin compresión (con extensión .zip) con datos/ventas.csv."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with py7zr.SevenZipFile(path, "w", filters=[{"id": py7zr.FILTER_COPY}]) as archive:
+        archive.writestr(CONTENT, "datos/ventas.csv")
+        for name, data in (extra or {}).items():
+            archive.writestr(data, name)
+    return path
+
+
+def make_handler(data_dirs) -> ZipHandler:
+    return ZipHandler(
+        data_dirs["raw"],
+        data_dirs["unzipped"],
+        data_dirs["archive"],
+        use_manifest=True,
+        io_policy=IOPolicy(min_free_space=0),
+        verify_workers=2,
+    )
+
+
+def test_7z_extraction_counts_as_verified(data_dirs):
+    write_7z(os.path.join(data_dirs["raw"], PERIODO, "ventas.zip"))
+
+    result = make_handler(data_dirs).extract_zip_result(PERIODO, "ventas.zip")
+
+    assert result.success and result.fallback
+    assert result.members == {"datos/ventas.csv": [zlib.crc32(CONTENT), len(CONTENT)]}
+    target = os.path.join(data_dirs["unzipped"], PERIODO, "datos", "ventas.csv")
+    with open(target, "rb") as file:
+        assert file.read() == CONTENT
+
+
+def test_7z_with_bad_crc_fails(data_dirs):
+    path = write_7z(os.path.join(data_dirs["raw"], PERIODO, "ventas.zip"))
+    with open(path, "r+b") as file:
+        data = file.read()
+        # Sin compresión, el contenido del miembro está tal cual en el archivo
+        file.seek(data.index(b"2024-07-01;100"))
+        file.write(b"2099")
+
+    result = make_handler(data_dirs).extract_zip_result(PERIODO, "ventas.zip")
+
+    assert not result.success
+    manifest = ExtractionManifest(os.path.join(data_dirs["unzipped"], PERIODO))
+    assert "ventas.zip" not in manifest.archives
+
+
+def test_7z_extraction_is_recorded_in_manifest(data_dirs):
+    write_7z(os.path.join(data_dirs["raw"], PERIODO, "ventas.zip"))
+    handler = make_handler(data_dirs)
+
+    first = handler.extract_zips(PERIODO, ["ventas.zip"])[0]
+    second = handler.extract_zips(PERIODO, ["ventas.zip"])[0]
+
+    assert first.success and not first.unchanged
+    assert second.success and second.unchanged
+
+
+def test_7z_members_follow_the_router(data_dirs):
+    write_7z(
+        os.path.join(data_dirs["raw"], PERIODO, "ventas.zip"),
+        {"leeme.txt": b"sin destino"},
+    )
+    destination = os.path.join(data_dirs["processed"], "ventas", "ventas.csv")
+
+    def router(member_name: str) -> Optional[str]:
+        return destination if member_name.endswith(".csv") else None
+
+    handler = ZipHandler(
+        data_dirs["raw"],
+        data_dirs["unzipped"],
+        data_dirs["archive"],
+        io_policy=IOPolicy(min_free_space=0),
+        verify_workers=2,
+        router=router,
+    )
+    result = handler.extract_zip_result(PERIODO, "ventas.zip")
+
+    assert result.success
+    assert result.members == {destination: [zlib.crc32(CONTENT), len(CONTENT)]}
+    with open(destination, "rb") as file:
+        assert file.read() == CONTENT
+    # Nada queda en unzipped: ni los miembros ni la carpeta temporal
+    assert os.listdir(os.path.join(data_dirs["unzipped"], PERIODO)) == []
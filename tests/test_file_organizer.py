@@ -0,0 +1,137 @@
+"""
+Pruebas del organizador de archivos (FileOrganizer).
+"""
+
+import logging
+import os
+from datetime import datetime
+
+from src.etl.file_organizer import FileOrganizer
+
+PERIODO = "202407"
+
+
+def make_organizer(tmp_path, file_patterns=None, **organize) -> FileOrganizer:
+    config = {
+        "paths": {
+            "unzipped": str(tmp_path / "unzipped"),
+            "processed": str(tmp_path / "processed"),
+        },
+        "organize": organize,
+        "file_patterns": file_patterns or {},
+    }
+    return FileOrganizer(config, PERIODO)
+
+
+def write_file(path, data: bytes = b"datos") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def test_last_source_wins_on_destination_conflict(tmp_path, caplog):
+    organizer = make_organizer(tmp_path)
+    unzipped = tmp_path / "unzipped" / PERIODO
+    write_file(unzipped / "Balance_2407_BD01.xlsm", b"primero")
+    write_file(unzipped / "z" / "Balance_2407_BD01.xlsm", b"segundo")
+
+    with caplog.at_level(logging.WARNING):
+        organizer.organize()
+
+    destination = (
+        tmp_path / "processed" / PERIODO / "balance" / "Balance_2407_BD01.xlsm"
+    )
+    assert destination.read_bytes() == b"segundo"
+    assert "Varios archivos con destino" in caplog.text
+    assert os.path.exists(unzipped / "Balance_2407_BD01.xlsm")
+
+
+def test_daily_partitions_follow_config_destinations(tmp_path):
+    file_patterns = {
+        "cmg_diario": {"destination": "cmg/diario/{fecha}/"},
+        "sobrecostos": {"destination": "sobrecostos/por_dia/{fecha}/"},
+    }
+    organizer = make_organizer(tmp_path, file_patterns)
+    processed = tmp_path / "processed" / PERIODO
+
+    assert organizer.route("CMg_Real_20240702.csv") == str(
+        processed / "cmg" / "diario" / "20240702" / "CMg_Real_20240702.csv"
+    )
+    assert organizer.route("x/Detalle Sobrecostos 20240701.xlsx") == str(
+        processed
+        / "sobrecostos"
+        / "por_dia"
+        / "20240701"
+        / "Detalle Sobrecostos 20240701.xlsx"
+    )
+    # Sin {fecha} en la configuración, el destino no se particiona
+    assert organizer.route("Programa_Operacion_20240701.xlsx") == str(
+        processed / "operacion" / "diario" / "Programa_Operacion_20240701.xlsx"
+    )
+
+
+def test_list_day_partitions_filters_by_range(tmp_path):
+    organizer = make_organizer(
+        tmp_path, {"cmg_diario": {"destination": "cmg/diario/{fecha}/"}}
+    )
+    unzipped = tmp_path / "unzipped" / PERIODO
+    for day in ("01", "02", "03"):
+        write_file(unzipped / f"CMg_Real_202407{day}.csv")
+    organizer.organize()
+
+    partitions = organizer.list_day_partitions(
+        "cmg_diario", datetime(2024, 7, 2), datetime(2024, 7, 3)
+    )
+
+    assert [path.name for path in partitions] == ["20240702", "20240703"]
+
+
+def test_incremental_organize_places_only_added_and_changed_files(tmp_path):
+    unzipped = tmp_path / "unzipped" / PERIODO
+    write_file(unzipped / "Balance_2407_BD01.xlsm", b"balance")
+    write_file(unzipped / "cmg2407_def_15minutal.csv", b"cmg")
+    make_organizer(tmp_path, incremental=True).organize()
+
+    # Cambia el contenido (y el tamaño) de un archivo y se agrega otro
+    write_file(unzipped / "cmg2407_def_15minutal.csv", b"cmg corregido")
+    write_file(unzipped / "Precio_estabilizado_2407.xlsb", b"precio")
+    organizer = make_organizer(tmp_path, incremental=True)
+    organizer.organize()
+
+    processed = tmp_path / "processed" / PERIODO
+    plan = organizer.plan
+    assert plan.unchanged == [processed / "balance" / "Balance_2407_BD01.xlsm"]
+    assert plan.changed == [processed / "cmg" / "cmg2407_def_15minutal.csv"]
+    assert plan.added == [
+        processed / "precio_estabilizado" / "Precio_estabilizado_2407.xlsb"
+    ]
+    assert "balance" not in plan.missing and "sscc" in plan.missing
+    assert (processed / "cmg" / "cmg2407_def_15minutal.csv").read_bytes() == (
+        b"cmg corregido"
+    )
+    assert (processed / ".organize_plan.json").exists()
+
+
+def test_incremental_organize_detects_same_size_change_with_hash(tmp_path):
+    unzipped = tmp_path / "unzipped" / PERIODO
+    source = unzipped / "Balance_2407_BD01.xlsm"
+    write_file(source, b"version 1")
+    make_organizer(tmp_path, incremental=True, hash=True).organize()
+
+    # Mismo tamaño y misma fecha de modificación, distinto contenido
+    stat = source.stat()
+    write_file(source, b"version 2")
+    os.utime(source, (stat.st_atime, stat.st_mtime))
+
+    assert (
+        make_organizer(tmp_path, incremental=True)
+        .build_plan(
+            {tmp_path / "processed" / PERIODO / "balance" / source.name: source}, []
+        )
+        .unchanged
+    )
+    organizer = make_organizer(tmp_path, incremental=True, hash=True)
+    organizer.organize()
+
+    destination = tmp_path / "processed" / PERIODO / "balance" / source.name
+    assert organizer.plan.changed == [destination]
+    assert destination.read_bytes() == b"version 2"
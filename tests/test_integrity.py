@@ -0,0 +1,92 @@
+"""
+Pruebas de la verificación de integridad de los archivos extraídos.
+"""
+
+import os
+import zipfile
+import zlib
+
+from conftest import write_zip
+from src.utils.integrity import verify_members
+from src.utils.io_engine import IOPolicy
+from src.utils.zip_handler import ZipHandler
+
+PERIODO = "202407"
+CONTENT = b"fecha;monto\n" + b"2024-07-01;100\n" * 200
+
+
+def make_handler(data_dirs, **kwargs) -> ZipHandler:
+    return ZipHandler(
+        data_dirs["raw"],
+        data_dirs["unzipped"],
+        data_dirs["archive"],
+        io_policy=IOPolicy(min_free_space=0),
+        verify_workers=2,
+        **kwargs,
+    )
+
+
+def write_corrupt_zip(path: str) -> str:
+    """Crea un ZIP sin compresión y altera los datos de su miembro."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as zip_ref:
+        zip_ref.writestr("ventas.csv", CONTENT)
+    with open(path, "r+b") as file:
+        data = file.read()
+        file.seek(data.index(b"2024-07-01;100"))
+        file.write(b"2099")
+    return path
+
+
+def test_verified_extraction_records_crc_and_size(data_dirs):
+    write_zip(
+        os.path.join(data_dirs["raw"], PERIODO, "ventas.zip"), {"a/v.csv": CONTENT}
+    )
+
+    result = make_handler(data_dirs).extract_zip_result(PERIODO, "ventas.zip")
+
+    assert result.success
+    assert result.members == {"a/v.csv": [zlib.crc32(CONTENT), len(CONTENT)]}
+
+
+def test_crc_mismatch_fails_without_fallback(data_dirs):
+    write_corrupt_zip(os.path.join(data_dirs["raw"], PERIODO, "ventas.zip"))
+
+    result = make_handler(data_dirs).extract_zip_result(PERIODO, "ventas.zip")
+
+    assert not result.success
+    assert not result.fallback
+    assert "CRC" in result.error
+    assert os.listdir(os.path.join(data_dirs["unzipped"], PERIODO)) == []
+
+
+def test_crc_mismatch_fails_in_parallel_member_extraction(data_dirs):
+    path = write_corrupt_zip(os.path.join(data_dirs["raw"], PERIODO, "ventas.zip"))
+    with zipfile.ZipFile(path, "a", zipfile.ZIP_STORED) as zip_ref:
+        zip_ref.writestr("otro.csv", b"1;2\n")
+
+    handler = make_handler(data_dirs, member_workers=2)
+    result = handler.extract_zip_result(PERIODO, "ventas.zip")
+
+    assert not result.success
+    assert not result.fallback
+
+
+def test_verify_members_reports_files_changed_on_disk(tmp_path):
+    (tmp_path / "a.csv").write_bytes(CONTENT)
+    (tmp_path / "b.csv").write_bytes(CONTENT[:-1] + b"X")
+    absolute = tmp_path / "c.csv"
+    absolute.write_bytes(CONTENT)
+    members = {
+        "a.csv": [zlib.crc32(CONTENT), len(CONTENT)],
+        "b.csv": [zlib.crc32(CONTENT), len(CONTENT)],
+        str(absolute): [zlib.crc32(CONTENT), len(CONTENT)],
+        "falta.csv": [0, 0],
+    }
+
+    problems = verify_members(str(tmp_path), members, workers=2)
+
+    assert sorted(problem.split(":")[0] for problem in problems) == [
+        "b.csv",
+        "falta.csv",
+    ]
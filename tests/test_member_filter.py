@@ -0,0 +1,55 @@
+"""
+Pruebas del filtro de miembros de la extracción selectiva (MemberFilter).
+"""
+
+from src.etl.file_organizer import FileOrganizer
+from src.utils.member_filter import MemberFilter
+
+PERIODO = "202407"
+
+
+def make_organizer(tmp_path) -> FileOrganizer:
+    config = {
+        "paths": {
+            "unzipped": str(tmp_path / "unzipped"),
+            "processed": str(tmp_path / "processed"),
+        }
+    }
+    return FileOrganizer(config, PERIODO)
+
+
+def test_filter_accepts_the_same_members_as_the_organizer(tmp_path):
+    organizer = make_organizer(tmp_path)
+    member_filter = MemberFilter.from_registry_config(
+        {}, PERIODO, extra_patterns=organizer.member_patterns()
+    )
+    names = [
+        "Balance_2407_BD01.xlsm",
+        "datos/balance_202407_bd01.XLSM",
+        "Balance_2407_BD01.xlsm.bak",
+        "Detalle Sobrecostos 20240701.xlsx",
+        "Detalles Diarios/Detalle Sobrecostos 20240702.xlsx",
+        "CMg_Real_20240701.csv",
+        "CMg_Real_20240701.csv.old",
+        "x_CMg_Real_20240701.csv",
+        "Programa_Operacion_20240701.xlsx",
+        "Vertimientos_20240701.xlsx",
+        "cmg2407_def_15minutal.csv",
+        "Contratos_Generadores_2407_Financieros.xlsb",
+        "Balance_2406_BD01.xlsm",
+        "leeme.txt",
+    ]
+
+    for name in names:
+        assert member_filter.accepts(name) == (organizer.route(name) is not None), name
+
+
+def test_organizer_patterns_are_escaped_for_fnmatch():
+    assert FileOrganizer._as_glob("Reporte[1]?.csv") == "Reporte[[]1[]][?].csv*"
+    assert FileOrganizer._as_glob("CMg_Real_*") == "CMg_Real_*"
+
+    member_filter = MemberFilter(
+        [("reporte", None, FileOrganizer._as_glob("Reporte[1]?.csv"))]
+    )
+    assert member_filter.accepts("Reporte[1]?.csv")
+    assert not member_filter.accepts("Reporte1a.csv")
@@ -0,0 +1,80 @@
+"""
+Pruebas de la vigilancia de ZIP (ZipWatcher).
+"""
+
+import os
+import time
+
+from conftest import write_zip
+from src.utils.io_engine import IOPolicy, write_stream
+from src.utils.zip_handler import ZipHandler
+from src.utils.zip_watcher import ZipWatcher
+
+PERIODO = "202407"
+
+
+def test_on_idle_runs_without_extractions_in_flight(data_dirs):
+    raw = os.path.join(data_dirs["raw"], PERIODO)
+    write_zip(os.path.join(raw, "primero.zip"), {"a/uno.csv": b"1" * 1000})
+    handler = ZipHandler(data_dirs["raw"], data_dirs["unzipped"], data_dirs["archive"])
+    late_target = os.path.join(data_dirs["unzipped"], PERIODO, "b", "dos.csv")
+    calls = []
+
+    def on_idle():
+        start = time.monotonic()
+        if not calls:
+            # Llega un ZIP nuevo mientras se organiza: debe esperar
+            write_zip(os.path.join(raw, "segundo.zip"), {"b/dos.csv": b"2" * 1000})
+            time.sleep(1.0)
+            assert not os.path.exists(late_target)
+        calls.append((start, time.monotonic()))
+
+    watcher = ZipWatcher(
+        handler,
+        PERIODO,
+        stable_seconds=0.2,
+        poll_interval=0.1,
+        idle_timeout=1.0,
+        on_idle=on_idle,
+    )
+    assert watcher.run()
+
+    assert os.path.exists(late_target)
+    assert len(calls) == 2
+    # Las invocaciones no se superponen
+    assert calls[0][1] <= calls[1][0]
+
+
+def test_write_stream_replaces_target_only_when_complete(tmp_path):
+    target = str(tmp_path / "datos.csv")
+    seen = []
+
+    class Source:
+        def __init__(self):
+            self.chunks = [b"a" * 10, b"b" * 10]
+
+        def read(self, size=-1):
+            # Durante la escritura el destino aún no existe
+            seen.append(os.path.exists(target))
+            return self.chunks.pop(0) if self.chunks else b""
+
+    write_stream(Source(), target, 20, IOPolicy(preallocate_min_size=0))
+
+    assert not any(seen)
+    with open(target, "rb") as file:
+        assert file.read() == b"a" * 10 + b"b" * 10
+    assert os.listdir(tmp_path) == ["datos.csv"]
+
+
+def test_write_stream_removes_partial_file_on_error(tmp_path):
+    target = str(tmp_path / "datos.csv")
+
+    class Broken:
+        def read(self, size=-1):
+            raise OSError("lectura interrumpida")
+
+    try:
+        write_stream(Broken(), target, 20, IOPolicy())
+    except OSError:
+        pass
+    assert os.listdir(tmp_path) == []